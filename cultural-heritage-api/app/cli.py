@@ -0,0 +1,228 @@
+"""
+Maintenance commands for the Cultural Heritage API.
+
+Run from the cultural-heritage-api directory:
+    python -m app.cli <command> [options]
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import update, func
+
+from app.database import engine, Base, SessionLocal, add_missing_columns, move_heritage_content
+from app.models.heritage import backfill_search_columns
+from app import models
+from app.core.compression import content_codec
+from app.core.analytics_export import ANALYTICS_EXPORT_DIR, ANALYTICS_KEEP, export_snapshot, require_pyarrow
+from app.core.related import (
+    Corpus, RELATED_TOP_K, complete_run, completed_version, merge_related, require_numpy, write_related
+)
+
+
+def backfill_search(args: argparse.Namespace):
+    """
+    Populate the normalized search columns of existing heritage entries.
+
+    Rows are processed in primary-key order in batches, each in its own
+    transaction, so the command can be interrupted and re-run safely.
+    Startup already fills rows that were never normalized; this also
+    re-normalizes the rest, e.g. after changing SEARCH_STRIP_DIACRITICS.
+    """
+    updated = backfill_search_columns(
+        batch_size=args.batch_size,
+        missing_only=args.missing_only,
+        progress=lambda updated, last_id: print(f"Normalized {updated} entries (up to id {last_id})")
+    )
+    print(f"Done: {updated} entries updated")
+
+
+def compress_content(args: argparse.Namespace):
+    """
+    Rewrite stored heritage content and its search form with the configured compression.
+
+    Optionally trains a new dictionary from a sample of existing content
+    first. Rows are re-encoded in primary-key batches through a bulk update,
+    which bypasses the version hooks: the content itself does not change,
+    so sync clients have nothing to re-download. With CONTENT_COMPRESSION=none
+    this decompresses everything.
+    """
+    db = SessionLocal()
+    last_id = 0
+    rewritten = 0
+
+    try:
+        content_codec.load_dictionaries(db)
+
+        if args.train and content_codec.enabled:
+            samples = [
+                row[0] for row in db.query(models.HeritageContent.content).order_by(
+                    func.random()
+                ).limit(args.sample_size)
+            ]
+            dictionary = models.CompressionDictionary(
+                algorithm=content_codec.algorithm,
+                data=content_codec.train_dictionary(samples)
+            )
+            db.add(dictionary)
+            db.commit()
+            content_codec.set_dictionary(dictionary.id, dictionary.data, active=True)
+            print(f"Trained {content_codec.algorithm} dictionary {dictionary.id} "
+                  f"({len(dictionary.data)} bytes from {len(samples)} entries)")
+
+        while True:
+            rows = db.query(
+                models.HeritageContent.heritage_id,
+                models.HeritageContent.content,
+                models.HeritageContent.content_normalized
+            ).filter(
+                models.HeritageContent.heritage_id > last_id
+            ).order_by(models.HeritageContent.heritage_id).limit(args.batch_size).all()
+            if not rows:
+                break
+
+            # Reading decompresses and writing re-compresses with the active settings
+            db.execute(update(models.HeritageContent), [
+                {"heritage_id": heritage_id, "content": content, "content_normalized": normalized}
+                for heritage_id, content, normalized in rows
+            ])
+            db.commit()
+
+            last_id = rows[-1][0]
+            rewritten += len(rows)
+            print(f"Rewrote {rewritten} entries (up to id {last_id})")
+    finally:
+        db.close()
+
+    print(f"Done: {rewritten} entries rewritten with compression '{content_codec.algorithm}'")
+
+
+def refresh_related(args: argparse.Namespace):
+    """
+    Precompute the most similar entries of each heritage entry.
+
+    By default only entries written since the last run are recomputed, and
+    their new scores are merged into the lists of the entries they resemble;
+    --full recomputes every list, which also picks up changes in term
+    statistics and drops neighbours that stopped being similar. Lists are
+    written in blocks, each in its own transaction, so the endpoint keeps
+    serving the previous lists meanwhile; an interrupted run is picked up
+    by the next one.
+    """
+    try:
+        require_numpy()
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    db = SessionLocal()
+    computed = 0
+
+    try:
+        since = -1 if args.full else completed_version(db)
+        corpus = Corpus.load(db)
+        targets = corpus.changed_since(since)
+        print(f"Vectorized {len(corpus)} entries; {len(targets)} to compute")
+
+        changed = {}
+        for start in range(0, len(targets), args.block_size):
+            block = targets[start:start + args.block_size]
+            lists = dict(zip(block, corpus.top_related(block, k=args.top_k)))
+            write_related(db, corpus, lists)
+            if since >= 0:
+                changed.update(lists)
+
+            computed += len(block)
+            print(f"Computed {computed} of {len(targets)} entries")
+
+        merged = merge_related(db, corpus, changed, k=args.top_k)
+        positions = list(merged)
+        for start in range(0, len(positions), args.block_size):
+            block = positions[start:start + args.block_size]
+            write_related(db, corpus, {position: merged[position] for position in block})
+        if merged:
+            print(f"Updated {len(merged)} lists of entries similar to them")
+
+        complete_run(db, corpus)
+    finally:
+        db.close()
+
+    print(f"Done: related entries computed for {computed} entries")
+
+
+def export_analytics(args: argparse.Namespace):
+    """
+    Write a columnar (Parquet) snapshot of entries, contents, categories and users.
+
+    Tables are streamed from the database in primary-key batches, so the
+    export neither holds a long read transaction nor loads the corpus into
+    memory.
+    """
+    try:
+        require_pyarrow()
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    snapshot = export_snapshot(args.directory, keep=args.keep)
+    for table in snapshot.tables:
+        print(f"{table.name}: {table.rows} rows, {table.bytes} bytes")
+    print(f"Done: snapshot {snapshot.snapshot} written to {args.directory}")
+
+
+def main(argv=None):
+    """Parse command line arguments and run the selected command."""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subparsers.add_parser(
+        "backfill-search", help="Populate normalized search columns for existing entries"
+    )
+    backfill.add_argument("--batch-size", type=int, default=1000)
+    backfill.add_argument(
+        "--missing-only", action="store_true", help="Only fill rows that were never normalized"
+    )
+    backfill.set_defaults(handler=backfill_search)
+
+    compress = subparsers.add_parser(
+        "compress-content", help="Re-encode stored content with the configured compression"
+    )
+    compress.add_argument("--batch-size", type=int, default=500)
+    compress.add_argument(
+        "--train", action="store_true", help="Train a new dictionary from existing content first"
+    )
+    compress.add_argument(
+        "--sample-size", type=int, default=1000, help="Entries sampled for dictionary training"
+    )
+    compress.set_defaults(handler=compress_content)
+
+    related = subparsers.add_parser(
+        "related", help="Precompute related entries (needs numpy and scipy)"
+    )
+    related.add_argument("--full", action="store_true", help="Recompute every entry, not only changed ones")
+    related.add_argument("--top-k", type=int, default=RELATED_TOP_K, help="Related entries kept per entry")
+    related.add_argument(
+        "--block-size", type=int, default=256, help="Entries per similarity product and transaction"
+    )
+    related.set_defaults(handler=refresh_related)
+
+    export = subparsers.add_parser(
+        "export-analytics", help="Write a Parquet snapshot for analytics (needs pyarrow)"
+    )
+    export.add_argument("--directory", default=ANALYTICS_EXPORT_DIR, help="Directory holding the snapshots")
+    export.add_argument("--keep", type=int, default=ANALYTICS_KEEP, help="Number of snapshots to keep")
+    export.set_defaults(handler=export_analytics)
+
+    args = parser.parse_args(argv)
+
+    # Make sure the schema is current before touching any rows
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns()
+    move_heritage_content()
+    backfill_search_columns()
+
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
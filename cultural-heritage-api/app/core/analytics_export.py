@@ -0,0 +1,255 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, select
+
+from app import models
+from app.database import engine
+from app.schemas import AnalyticsSnapshot, AnalyticsTable
+
+try:
+    import pyarrow
+    import pyarrow.parquet as parquet
+except ImportError:  # Optional dependency; only exports need it
+    pyarrow = None
+    parquet = None
+
+logger = logging.getLogger(__name__)
+
+# Analytics export configuration
+# These can be set as environment variables in production
+ANALYTICS_EXPORT_DIR = os.getenv("ANALYTICS_EXPORT_DIR", "./analytics")
+ANALYTICS_BATCH_ROWS = int(os.getenv("ANALYTICS_BATCH_ROWS", "10000"))
+# Content rows can be large, so they are read in smaller batches
+ANALYTICS_CONTENT_BATCH_ROWS = int(os.getenv("ANALYTICS_CONTENT_BATCH_ROWS", "1000"))
+ANALYTICS_COMPRESSION = os.getenv("ANALYTICS_COMPRESSION", "zstd")
+ANALYTICS_KEEP = int(os.getenv("ANALYTICS_KEEP", "3"))
+
+# Tables anyone may download; users is admin only
+PUBLIC_TABLES = ("heritage_entries", "heritage_contents", "categories")
+TABLES = PUBLIC_TABLES + ("users",)
+
+_LATEST_FILE = "LATEST"
+_MANIFEST_FILE = "manifest.json"
+
+# Only one export at a time per process
+export_lock = threading.Lock()
+
+
+def require_pyarrow():
+    """Raise if the optional pyarrow dependency is missing."""
+    if pyarrow is None:
+        raise RuntimeError("Analytics exports need pyarrow: pip install pyarrow")
+
+
+def _tables():
+    """Source statement, Arrow schema and batch size of each exported table."""
+    timestamp = pyarrow.timestamp("us", tz="UTC")
+    # Low-cardinality strings are dictionary-encoded
+    names = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+
+    return {
+        "heritage_entries": (
+            select(
+                models.HeritageEntry.id,
+                models.HeritageEntry.title,
+                models.HeritageEntry.category_id,
+                models.Category.name.label("category_name"),
+                models.HeritageEntry.created_by,
+                models.User.username.label("creator_username"),
+                models.HeritageEntry.created_at,
+                models.HeritageEntry.updated_at,
+                models.HeritageEntry.version,
+                models.HeritageEntry.latitude,
+                models.HeritageEntry.longitude,
+                models.HeritageEntry.start_year,
+                models.HeritageEntry.end_year,
+                models.HeritageEntry.view_count
+            ).join(
+                models.Category, models.HeritageEntry.category_id == models.Category.id
+            ).join(
+                models.User, models.HeritageEntry.created_by == models.User.id
+            ),
+            models.HeritageEntry.id,
+            pyarrow.schema([
+                ("id", pyarrow.int64()),
+                ("title", pyarrow.string()),
+                ("category_id", pyarrow.int64()),
+                ("category_name", names),
+                ("created_by", pyarrow.int64()),
+                ("creator_username", names),
+                ("created_at", timestamp),
+                ("updated_at", timestamp),
+                ("version", pyarrow.int64()),
+                ("latitude", pyarrow.float64()),
+                ("longitude", pyarrow.float64()),
+                ("start_year", pyarrow.int32()),
+                ("end_year", pyarrow.int32()),
+                ("view_count", pyarrow.int64()),
+            ]),
+            ANALYTICS_BATCH_ROWS
+        ),
+        # Content is a separate file, as in the database, so the narrow
+        # entries file can be downloaded and scanned without it
+        "heritage_contents": (
+            select(models.HeritageContent.heritage_id, models.HeritageContent.content),
+            models.HeritageContent.heritage_id,
+            pyarrow.schema([("heritage_id", pyarrow.int64()), ("content", pyarrow.string())]),
+            ANALYTICS_CONTENT_BATCH_ROWS
+        ),
+        "categories": (
+            select(
+                models.Category.id,
+                models.Category.name,
+                models.Category.description,
+                models.Category.updated_at,
+                models.Category.version
+            ),
+            models.Category.id,
+            pyarrow.schema([
+                ("id", pyarrow.int64()),
+                ("name", pyarrow.string()),
+                ("description", pyarrow.string()),
+                ("updated_at", timestamp),
+                ("version", pyarrow.int64()),
+            ]),
+            ANALYTICS_BATCH_ROWS
+        ),
+        # Never the password hash or email address
+        "users": (
+            select(models.User.id, models.User.username, models.User.role, models.User.created_at),
+            models.User.id,
+            pyarrow.schema([
+                ("id", pyarrow.int64()),
+                ("username", pyarrow.string()),
+                ("role", names),
+                ("created_at", timestamp),
+            ]),
+            ANALYTICS_BATCH_ROWS
+        ),
+    }
+
+
+def _row_batches(statement: Select, key, batch_rows: int) -> Iterator[Sequence]:
+    """
+    Read a table in primary-key order, one short transaction per batch.
+
+    Keyset pagination keeps each read cheap and never holds a read
+    transaction across the export, so writers are not blocked meanwhile.
+    """
+    last_key = None
+    while True:
+        batch = statement if last_key is None else statement.where(key > last_key)
+        with engine.connect() as connection:
+            rows = connection.execute(batch.order_by(key).limit(batch_rows)).all()
+        if not rows:
+            return
+        yield rows
+        last_key = rows[-1][0]
+
+
+def _write_table(path: str, statement: Select, key, schema, batch_rows: int) -> int:
+    """Stream one table into a Parquet file, one row group per batch."""
+    rows_written = 0
+    with parquet.ParquetWriter(
+        path,
+        schema,
+        compression=ANALYTICS_COMPRESSION,
+        use_dictionary=[field.name for field in schema if pyarrow.types.is_dictionary(field.type)]
+    ) as writer:
+        for rows in _row_batches(statement, key, batch_rows):
+            columns = list(zip(*rows))
+            writer.write_batch(pyarrow.record_batch(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows_written += len(rows)
+    return rows_written
+
+
+def export_snapshot(directory: str = ANALYTICS_EXPORT_DIR, keep: int = ANALYTICS_KEEP) -> AnalyticsSnapshot:
+    """
+    Write a columnar snapshot of entries, contents, categories and users.
+
+    Each table becomes a compressed Parquet file in a new snapshot
+    directory, written in streaming batches so memory use does not grow
+    with the corpus. The LATEST marker only moves to the snapshot once all
+    files are complete; older snapshots beyond `keep` are removed.
+
+    Args:
+        directory: Directory holding the snapshots
+        keep: Number of snapshots to keep
+
+    Returns:
+        AnalyticsSnapshot: Manifest of the new snapshot
+    """
+    require_pyarrow()
+
+    created_at = datetime.now(timezone.utc)
+    name = created_at.strftime("%Y%m%dT%H%M%S%fZ")
+    target = os.path.join(directory, name)
+    partial = os.path.join(directory, f".{name}.partial")
+    os.makedirs(partial)
+
+    try:
+        tables = []
+        for table, (statement, key, schema, batch_rows) in _tables().items():
+            path = os.path.join(partial, f"{table}.parquet")
+            rows = _write_table(path, statement, key, schema, batch_rows)
+            tables.append(AnalyticsTable(name=table, rows=rows, bytes=os.path.getsize(path)))
+            logger.info("Exported %d rows of %s", rows, table)
+
+        snapshot = AnalyticsSnapshot(snapshot=name, created_at=created_at, tables=tables)
+        with open(os.path.join(partial, _MANIFEST_FILE), "w") as manifest:
+            manifest.write(snapshot.model_dump_json())
+        os.rename(partial, target)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+
+    marker = os.path.join(directory, f".{_LATEST_FILE}.tmp")
+    with open(marker, "w") as latest:
+        latest.write(name)
+    os.replace(marker, os.path.join(directory, _LATEST_FILE))
+
+    for old in _snapshot_names(directory)[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+    return snapshot
+
+
+def _snapshot_names(directory: str) -> List[str]:
+    """Complete snapshot directories, oldest first."""
+    return sorted(
+        entry for entry in os.listdir(directory)
+        if not entry.startswith(".") and os.path.isdir(os.path.join(directory, entry))
+    )
+
+
+def latest_snapshot(directory: str = ANALYTICS_EXPORT_DIR) -> Optional[AnalyticsSnapshot]:
+    """
+    Get the manifest of the newest complete snapshot.
+
+    Args:
+        directory: Directory holding the snapshots
+
+    Returns:
+        The manifest, or None if nothing was exported yet
+    """
+    try:
+        with open(os.path.join(directory, _LATEST_FILE)) as latest:
+            name = latest.read().strip()
+        with open(os.path.join(directory, name, _MANIFEST_FILE)) as manifest:
+            return AnalyticsSnapshot.model_validate(json.load(manifest))
+    except FileNotFoundError:
+        return None
+
+
+def table_path(snapshot: AnalyticsSnapshot, table: str, directory: str = ANALYTICS_EXPORT_DIR) -> str:
+    """Path of one table's Parquet file in a snapshot."""
+    return os.path.join(directory, snapshot.snapshot, f"{table}.parquet")
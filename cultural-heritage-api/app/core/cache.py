@@ -0,0 +1,201 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+# These can be set as environment variables in production
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")  # local or shared
+CACHE_PATH = os.getenv("CACHE_PATH", "./heritage_cache.db")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+LOCAL_CACHE_MAX_ENTRIES = 10_000
+SHARED_CACHE_MMAP_BYTES = 64 * 1024 * 1024
+
+# Expired rows in the shared cache are purged after this many writes
+_PURGE_EVERY = 1000
+
+
+class CacheBackend(ABC):
+    """
+    Namespaced key/value cache with per-entry expiry.
+
+    Namespaces group keys that are invalidated together (e.g. every
+    cached category response is dropped when a category is created).
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS):
+        """Store a value for ttl seconds."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str):
+        """Drop one cached value."""
+
+    @abstractmethod
+    def invalidate(self, namespace: str):
+        """Drop every cached value in a namespace."""
+
+    @abstractmethod
+    def clear(self):
+        """Drop everything."""
+
+    def get_or_set(
+        self,
+        namespace: str,
+        key: str,
+        factory: Callable[[], Any],
+        ttl: int = CACHE_TTL_SECONDS
+    ) -> Any:
+        """
+        Get a cached value, computing and storing it on a miss.
+
+        Args:
+            namespace: Invalidation group
+            key: Key within the namespace
+            factory: Computes the value on a miss; must not return None
+            ttl: Seconds to keep the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(namespace, key)
+        if value is None:
+            value = factory()
+            self.set(namespace, key, value, ttl)
+        return value
+
+
+class LocalCache(CacheBackend):
+    """In-process LRU cache; each worker process has its own copy."""
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        with self._lock:
+            cached = self._entries.get((namespace, key))
+            if cached is None:
+                return None
+            expires_at, value = cached
+            if expires_at < time.monotonic():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS):
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedCache(CacheBackend):
+    """
+    Cache shared by every worker process on a host, stored in a SQLite file.
+
+    Reads go through SQLite's memory-mapped I/O, and because every process
+    reads the same table, an invalidation in one worker is seen by all
+    others on their next lookup; no separate broadcast channel is needed.
+    Values are pickled. Losing the file only costs cache misses, so writes
+    skip fsync.
+    """
+
+    def __init__(self, path: str = CACHE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; opened lazily so it is never shared across fork()
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(f"PRAGMA mmap_size={SHARED_CACHE_MMAP_BYTES}")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at >= ?",
+            (namespace, key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: int = CACHE_TTL_SECONDS):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time() + ttl)
+        )
+
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            connection.execute("DELETE FROM cache_entries WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, namespace: str, key: str):
+        self._connection().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+
+    def invalidate(self, namespace: str):
+        self._connection().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entries")
+
+
+def create_cache(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """
+    Create the configured cache backend.
+
+    Args:
+        backend: "local" (per process) or "shared" (all workers on the host)
+
+    Returns:
+        CacheBackend: The cache
+    """
+    if backend == "shared":
+        logger.info("Using shared cache at %s", CACHE_PATH)
+        return SharedCache()
+    if backend != "local":
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return LocalCache()
+
+
+# Global cache used by the routers
+cache = create_cache()
@@ -0,0 +1,258 @@
+import logging
+import os
+import struct
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Union
+
+from sqlalchemy import Text, func, text
+from sqlalchemy.types import TypeDecorator
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency; zlib is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Compression configuration
+# These can be set as environment variables in production
+CONTENT_COMPRESSION = os.getenv("CONTENT_COMPRESSION", "none")  # none, zlib or zstd
+COMPRESSION_THRESHOLD = int(os.getenv("CONTENT_COMPRESSION_THRESHOLD", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))
+DICTIONARY_SIZE = 32 * 1024
+
+# Compressed values start with this header, followed by a one-byte
+# algorithm tag and the dictionary id (0 = no dictionary)
+_MAGIC = b"\x00HC"
+_HEADER = struct.Struct(">3scI")
+_ALGORITHM_TAGS = {"zlib": b"z", "zstd": b"s"}
+_TAG_ALGORITHMS = {tag: algorithm for algorithm, tag in _ALGORITHM_TAGS.items()}
+
+
+class ContentCodec:
+    """
+    Compresses large heritage content with zlib or zstd and a shared dictionary.
+
+    Values below the size threshold, and every value when compression is
+    off, are stored as plain text, so compressed and uncompressed rows can
+    coexist and the mode can be switched at any time.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = CONTENT_COMPRESSION,
+        threshold: int = COMPRESSION_THRESHOLD,
+        level: int = COMPRESSION_LEVEL
+    ):
+        if algorithm == "zstd" and zstandard is None:
+            logger.warning("CONTENT_COMPRESSION=zstd but zstandard is not installed; using zlib")
+            algorithm = "zlib"
+        if algorithm not in ("none", "zlib", "zstd"):
+            raise ValueError(f"Unknown content compression algorithm: {algorithm}")
+
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level
+        self._lock = threading.Lock()
+        # dictionary id -> dictionary bytes
+        self._dictionaries: Dict[int, bytes] = {}
+        self.active_dictionary_id: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.algorithm != "none"
+
+    def set_dictionary(self, dictionary_id: int, data: bytes, active: bool = False):
+        """
+        Register a dictionary, optionally making it the one used for new writes.
+
+        Args:
+            dictionary_id: ID of the stored dictionary
+            data: Dictionary bytes
+            active: Use it when compressing from now on
+        """
+        with self._lock:
+            self._dictionaries[dictionary_id] = data
+            if active:
+                self.active_dictionary_id = dictionary_id
+
+    def compress(self, value: str) -> Union[str, bytes]:
+        """
+        Compress content if compression is on and it is large enough.
+
+        Args:
+            value: Content text
+
+        Returns:
+            The text unchanged, or header-prefixed compressed bytes
+        """
+        raw = value.encode("utf-8")
+        if not self.enabled or len(raw) < self.threshold:
+            return value
+
+        dictionary_id = self.active_dictionary_id or 0
+        dictionary = self._dictionaries.get(dictionary_id)
+
+        if self.algorithm == "zstd":
+            params = {"level": self.level}
+            if dictionary:
+                params["dict_data"] = zstandard.ZstdCompressionDict(dictionary)
+            payload = zstandard.ZstdCompressor(**params).compress(raw)
+        else:
+            compressor = (
+                zlib.compressobj(self.level, zdict=dictionary) if dictionary
+                else zlib.compressobj(self.level)
+            )
+            payload = compressor.compress(raw) + compressor.flush()
+
+        compressed = _HEADER.pack(_MAGIC, _ALGORITHM_TAGS[self.algorithm], dictionary_id) + payload
+
+        # Incompressible text is cheaper to keep as is
+        return compressed if len(compressed) < len(raw) else value
+
+    def decompress(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """
+        Decompress a stored value; plain text is returned unchanged.
+
+        Args:
+            value: Stored column value
+
+        Returns:
+            Content text
+        """
+        if value is None or isinstance(value, str):
+            return value
+
+        if not self.is_compressed(value):
+            return bytes(value).decode("utf-8")
+
+        _, tag, dictionary_id = _HEADER.unpack_from(value)
+
+        payload = bytes(value[_HEADER.size:])
+        dictionary = self._dictionary(dictionary_id) if dictionary_id else None
+
+        if _TAG_ALGORITHMS[tag] == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd-compressed content found but zstandard is not installed")
+            params = {"dict_data": zstandard.ZstdCompressionDict(dictionary)} if dictionary else {}
+            raw = zstandard.ZstdDecompressor(**params).decompress(payload)
+        else:
+            decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+            raw = decompressor.decompress(payload) + decompressor.flush()
+
+        return raw.decode("utf-8")
+
+    @staticmethod
+    def is_compressed(value: Union[str, bytes, None]) -> bool:
+        """Check whether a stored value (or its first bytes) is compressed."""
+        return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:len(_MAGIC)]) == _MAGIC
+
+    def _dictionary(self, dictionary_id: int) -> bytes:
+        """Get a dictionary, loading it from the database on first use."""
+        dictionary = self._dictionaries.get(dictionary_id)
+        if dictionary is None:
+            # Imported here to avoid a circular import at model definition time
+            from app.database import engine
+
+            with engine.connect() as connection:
+                dictionary = connection.execute(
+                    text("SELECT data FROM compression_dictionaries WHERE id = :id"),
+                    {"id": dictionary_id}
+                ).scalar_one()
+            self.set_dictionary(dictionary_id, dictionary)
+        return dictionary
+
+    def train_dictionary(self, samples: List[str], size: int = DICTIONARY_SIZE) -> bytes:
+        """
+        Build a compression dictionary from sample content.
+
+        zstd uses its own trainer. For zlib, the dictionary is the most
+        frequent word sequences, most frequent last, since deflate matches
+        nearer (later) dictionary bytes more cheaply.
+
+        Args:
+            samples: Representative content texts
+            size: Maximum dictionary size in bytes
+
+        Returns:
+            bytes: Dictionary data
+        """
+        if self.algorithm == "zstd":
+            trained = zstandard.train_dictionary(size, [sample.encode("utf-8") for sample in samples])
+            return trained.as_bytes()
+
+        phrases: Counter = Counter()
+        for sample in samples:
+            words = sample.split()
+            for n in (1, 2, 3):
+                for i in range(len(words) - n + 1):
+                    phrases[" ".join(words[i:i + n])] += 1
+
+        chosen: List[bytes] = []
+        used = 0
+        ranked = sorted(phrases.items(), key=lambda item: item[1] * len(item[0]), reverse=True)
+        for phrase, count in ranked:
+            if count < 2:
+                break
+            encoded = (phrase + " ").encode("utf-8")
+            if used + len(encoded) > size:
+                continue
+            chosen.append(encoded)
+            used += len(encoded)
+
+        return b"".join(reversed(chosen))
+
+    def load_dictionaries(self, db):
+        """
+        Load stored dictionaries and activate the newest one for this algorithm.
+
+        Args:
+            db: Database session
+        """
+        rows = db.execute(text(
+            "SELECT id, algorithm, data FROM compression_dictionaries ORDER BY id"
+        )).all()
+        for dictionary_id, algorithm, data in rows:
+            self.set_dictionary(dictionary_id, data, active=(algorithm == self.algorithm))
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column that transparently compresses large values.
+
+    Compressed values are stored as BLOBs, which SQLite accepts in any
+    column; other databases always get plain text.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return content_codec.compress(value)
+
+    def process_result_value(self, value, dialect):
+        return content_codec.decompress(value)
+
+
+# Global codec used by CompressedText columns
+content_codec = ContentCodec()
+
+
+def decompressed(column):
+    """
+    SQL expression for the text of a CompressedText column, for filters like LIKE.
+
+    On SQLite, where values may be stored compressed, this goes through the
+    decompress_text() function registered on each connection (see
+    app.database); other databases store plain text.
+    """
+    # Imported here to avoid a circular import at model definition time
+    from app.database import engine
+
+    if engine.dialect.name != "sqlite":
+        return column
+    return func.decompress_text(column, type_=Text)
@@ -0,0 +1,138 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.core.compression import content_codec
+
+# Size of each read from the database while streaming content
+CONTENT_CHUNK_SIZE = 64 * 1024
+
+
+class ContentChangedError(Exception):
+    """Raised when an entry's content changes while it is being streamed."""
+    pass
+
+
+class ContentReader:
+    """
+    Random access to one heritage entry's content as UTF-8 bytes.
+
+    On SQLite, plain-text content is read in chunks straight from the
+    database file with incremental blob I/O, so a multi-megabyte entry is
+    never held in memory at once. Compressed content (and other databases)
+    fall back to loading the full value once.
+
+    A pooled connection is only held while open() runs and while
+    iter_range() is being consumed, so a response that is never streamed
+    (client gone, error before the body) does not keep one checked out.
+    """
+
+    def __init__(self, heritage_id: int):
+        self.heritage_id = heritage_id
+        self.size = 0
+        self.version: Optional[int] = None
+        self._connection = None
+        self._data: Optional[bytes] = None
+
+    @contextmanager
+    def _connected(self):
+        """Check out a connection for the duration of the block."""
+        self._connection = engine.connect()
+        try:
+            yield
+        finally:
+            self.close()
+
+    def open(self) -> bool:
+        """
+        Look up the entry and measure its content.
+
+        Returns:
+            bool: False if the entry does not exist
+        """
+        with self._connected():
+            return self._measure()
+
+    def _measure(self) -> bool:
+        self.version = self._current_version()
+        if self.version is None:
+            return False
+
+        if self._blob_io:
+            try:
+                with self._open_blob() as blob:
+                    if not content_codec.is_compressed(blob.read(8)):
+                        self.size = len(blob)
+                        return True
+            except sqlite3.OperationalError:
+                pass  # No content row; handled below
+
+        # Compressed or no blob I/O: decode the whole value once
+        content = self._connection.execute(
+            text("SELECT content FROM heritage_contents WHERE heritage_id = :id"),
+            {"id": self.heritage_id}
+        ).scalar()
+        self._data = content_codec.decompress(content or "").encode("utf-8")
+        self.size = len(self._data)
+        return True
+
+    def iter_range(self, start: int, end: int, chunk_size: int = CONTENT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the bytes from start to end (inclusive) in chunks.
+
+        Each chunk is read in its own short blob access, so slow clients
+        do not hold a database lock for the whole download. The connection
+        is checked out on the first chunk and returned when the generator
+        finishes or is closed.
+
+        Raises:
+            ContentChangedError: If the entry is updated mid-stream
+        """
+        if self._data is not None:
+            for offset in range(start, end + 1, chunk_size):
+                yield self._data[offset:min(offset + chunk_size, end + 1)]
+            return
+
+        with self._connected():
+            offset = start
+            while offset <= end:
+                length = min(chunk_size, end - offset + 1)
+                if self._current_version() != self.version:
+                    raise ContentChangedError(f"Heritage entry {self.heritage_id} changed")
+                yield self._read_blob(offset, length)
+                offset += length
+
+    def close(self):
+        """Return the connection to the pool."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def _blob_io(self) -> bool:
+        # Connection.blobopen() exists from Python 3.11
+        return engine.dialect.name == "sqlite" and hasattr(self._driver_connection, "blobopen")
+
+    @property
+    def _driver_connection(self):
+        return self._connection.connection.driver_connection
+
+    def _current_version(self) -> Optional[int]:
+        return self._connection.execute(
+            text("SELECT version FROM heritage_entries WHERE id = :id"),
+            {"id": self.heritage_id}
+        ).scalar()
+
+    def _open_blob(self):
+        # heritage_id is the table's INTEGER PRIMARY KEY, i.e. its rowid
+        return self._driver_connection.blobopen(
+            "heritage_contents", "content", self.heritage_id, readonly=True
+        )
+
+    def _read_blob(self, offset: int, length: int) -> bytes:
+        with self._open_blob() as blob:
+            blob.seek(offset)
+            return blob.read(length)
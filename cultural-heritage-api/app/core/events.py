@@ -0,0 +1,135 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event stream configuration
+# These can be set as environment variables in production
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+REPLAY_BUFFER_SIZE = int(os.getenv("SSE_REPLAY_BUFFER", "1000"))
+MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", "10000"))
+HEARTBEAT_SECONDS = 15
+
+
+class Subscription:
+    """One connected stream consumer with its own bounded queue."""
+
+    def __init__(self, queue_size: int):
+        self.queue: "asyncio.Queue[Tuple[int, str]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+class Broadcaster:
+    """
+    In-process pub/sub for server-sent events.
+
+    Each event is serialized once and fanned out to subscriber queues.
+    Subscribers whose queue is full are dropped instead of slowing down
+    publishers; they can reconnect with Last-Event-ID and replay recent
+    events from a ring buffer.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = SUBSCRIBER_QUEUE_SIZE,
+        replay_size: int = REPLAY_BUFFER_SIZE,
+        max_subscribers: int = MAX_SUBSCRIBERS
+    ):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._replay: Deque[Tuple[int, str]] = deque(maxlen=replay_size)
+        self._last_id = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        # Counters for monitoring
+        self.published = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Tuple[Subscription, List[Tuple[int, str]], bool]:
+        """
+        Register a subscriber on the running event loop.
+
+        Args:
+            last_event_id: ID of the last event the client received, to resume from
+
+        Returns:
+            Tuple of (subscription, events to replay, whether the gap was too old to replay)
+
+        Raises:
+            RuntimeError: If the subscriber limit is reached
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise RuntimeError("Too many event stream subscribers")
+
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.queue_size)
+
+        with self._lock:
+            self._subscribers.add(subscription)
+            replay: List[Tuple[int, str]] = []
+            gap = False
+            if last_event_id is not None and last_event_id < self._last_id:
+                replay = [event for event in self._replay if event[0] > last_event_id]
+                # Events between last_event_id and the buffer start are gone
+                oldest = self._replay[0][0] if self._replay else self._last_id + 1
+                gap = last_event_id + 1 < oldest
+
+        return subscription, replay, gap
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber."""
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: Dict[str, Any]):
+        """
+        Publish an event to all subscribers without blocking.
+
+        Safe to call from the event loop or from worker threads.
+
+        Args:
+            event_type: SSE event name (e.g. "created")
+            data: JSON-serializable payload
+        """
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+            message = f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+            self._replay.append((event_id, message))
+            self.published += 1
+
+        if self._loop is None:
+            return  # Nobody has subscribed yet
+
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+
+        if on_loop:
+            self._fan_out(event_id, message)
+        else:
+            self._loop.call_soon_threadsafe(self._fan_out, event_id, message)
+
+    def _fan_out(self, event_id: int, message: str):
+        for subscription in list(self._subscribers):
+            try:
+                subscription.queue.put_nowait((event_id, message))
+            except asyncio.QueueFull:
+                # Slow consumer: drop it rather than buffer without bound
+                subscription.dropped = True
+                self._subscribers.discard(subscription)
+                self.dropped += 1
+
+
+# Global broadcaster for heritage entry events
+heritage_events = Broadcaster()
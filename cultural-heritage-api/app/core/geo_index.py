@@ -0,0 +1,314 @@
+import heapq
+import logging
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+# Geo index configuration
+# These can be set as environment variables in production
+GEO_CELL_DEGREES = float(os.getenv("GEO_CELL_DEGREES", "0.5"))
+EARTH_RADIUS_KM = 6371.0088
+# Nothing on the sphere is further away than the antipode
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+
+# (cell row, cell column)
+Cell = Tuple[int, int]
+# id -> (latitude, longitude, title, category id)
+Place = Tuple[float, float, str, int]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeoIndex:
+    """
+    Uniform latitude/longitude grid over located heritage entries.
+
+    Each cell is GEO_CELL_DEGREES on a side and lists the entries inside it.
+    Bounding-box queries only visit the cells the box covers; nearest-place
+    queries visit cells in order of their distance from the query point and
+    stop once no unvisited cell can hold anything closer, or once every cell
+    holding a candidate has been seen. When that walk would cross mostly
+    empty cells (sparse data, a rare category), the occupied cells are
+    checked directly, nearest first.
+    """
+
+    def __init__(self, cell_degrees: float = GEO_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self.rows = math.ceil(180 / cell_degrees)
+        self.columns = math.ceil(360 / cell_degrees)
+        self._lock = threading.Lock()
+        self._places: Dict[int, Place] = {}
+        self._cells: Dict[Cell, Set[int]] = {}
+        # category id -> cell -> number of that category's places in the cell
+        self._category_cells: Dict[int, Dict[Cell, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        row = min(int((latitude + 90) / self.cell_degrees), self.rows - 1)
+        column = int((longitude + 180) / self.cell_degrees) % self.columns
+        return row, column
+
+    def add(
+        self,
+        heritage_id: int,
+        title: str,
+        category_id: int,
+        latitude: Optional[float],
+        longitude: Optional[float]
+    ):
+        """
+        Add or move an entry; entries without a location are removed.
+
+        Args:
+            heritage_id: Heritage entry ID
+            title: Entry title, returned in summaries
+            category_id: Entry category, for filtering
+            latitude: Degrees north, or None
+            longitude: Degrees east, or None
+        """
+        with self._lock:
+            self._discard(heritage_id)
+            if latitude is None or longitude is None:
+                return
+            self._places[heritage_id] = (latitude, longitude, title, category_id)
+            cell = self._cell(latitude, longitude)
+            self._cells.setdefault(cell, set()).add(heritage_id)
+            counts = self._category_cells.setdefault(category_id, {})
+            counts[cell] = counts.get(cell, 0) + 1
+
+    def remove_many(self, heritage_ids):
+        """
+        Remove entries if present.
+
+        Args:
+            heritage_ids: Heritage entry IDs
+        """
+        with self._lock:
+            for heritage_id in heritage_ids:
+                self._discard(heritage_id)
+
+    def _discard(self, heritage_id: int):
+        place = self._places.pop(heritage_id, None)
+        if place is None:
+            return
+        cell = self._cell(place[0], place[1])
+        members = self._cells[cell]
+        members.discard(heritage_id)
+        if not members:
+            del self._cells[cell]
+        counts = self._category_cells[place[3]]
+        counts[cell] -= 1
+        if not counts[cell]:
+            del counts[cell]
+
+    def within(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        category_id: Optional[int] = None
+    ) -> List[Tuple[int, Place]]:
+        """
+        Find entries inside a bounding box.
+
+        A box with min_lon > max_lon crosses the antimeridian.
+
+        Returns:
+            List of (entry id, place), grouped by cell
+        """
+        crosses = min_lon > max_lon
+        first_row, first_column = self._cell(min_lat, min_lon)
+        last_row, last_column = self._cell(max_lat, max_lon)
+        columns = (last_column - first_column) % self.columns + 1
+        if (crosses and last_column == first_column) or max_lon - min_lon >= 360:
+            columns = self.columns  # Both edges in one column: the box goes all the way round
+
+        results = []
+        with self._lock:
+            box_cells = (last_row - first_row + 1) * columns
+            if box_cells <= len(self._cells):
+                cells = (
+                    (row, (first_column + offset) % self.columns)
+                    for row in range(first_row, last_row + 1)
+                    for offset in range(columns)
+                )
+            else:
+                # Large boxes over sparse data: cheaper to check the occupied cells
+                cells = iter(list(self._cells))
+
+            for cell in cells:
+                for heritage_id in self._cells.get(cell, ()):
+                    place = self._places[heritage_id]
+                    latitude, longitude, _, place_category = place
+                    if not min_lat <= latitude <= max_lat:
+                        continue
+                    inside = (
+                        longitude >= min_lon or longitude <= max_lon
+                        if crosses else min_lon <= longitude <= max_lon
+                    )
+                    if inside and (category_id is None or place_category == category_id):
+                        results.append((heritage_id, place))
+        return results
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int,
+        category_id: Optional[int] = None,
+        max_km: Optional[float] = None
+    ) -> List[Tuple[int, Place, float]]:
+        """
+        Find the k entries closest to a point.
+
+        Returns:
+            List of (entry id, place, distance in km), closest first
+        """
+        limit = max_km if max_km is not None else math.inf
+        best: List[Tuple[float, int]] = []  # Max-heap of the k closest, as (-distance, id)
+        start = self._cell(latitude, longitude)
+        frontier = [(0.0, start)]
+        seen = {start}
+
+        def consider(members):
+            for heritage_id in members:
+                place_lat, place_lon, _, place_category = self._places[heritage_id]
+                if category_id is not None and place_category != category_id:
+                    continue
+                distance = haversine_km(latitude, longitude, place_lat, place_lon)
+                if distance > limit:
+                    continue
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, heritage_id))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, heritage_id))
+
+        with self._lock:
+            # Cells holding candidates; once all are visited, nothing else can match
+            occupied = self._cells if category_id is None else self._category_cells.get(category_id, {})
+            visited: Set[Cell] = set()
+            while frontier and len(visited) < len(occupied):
+                bound, cell = heapq.heappop(frontier)
+                kth = -best[0][0] if len(best) == k else math.inf
+                if bound > min(kth, limit, MAX_DISTANCE_KM):
+                    break
+
+                if len(seen) > 4 * len(occupied):
+                    # Walking empty cells now costs more than checking the
+                    # occupied ones directly (sparse data or a rare category)
+                    rest = sorted(
+                        (self._cell_distance(latitude, longitude, other), other)
+                        for other in occupied if other not in visited
+                    )
+                    for bound, other in rest:
+                        kth = -best[0][0] if len(best) == k else math.inf
+                        if bound > min(kth, limit):
+                            break
+                        consider(self._cells[other])
+                    break
+
+                if cell in occupied:
+                    visited.add(cell)
+                    consider(self._cells[cell])
+
+                row, column = cell
+                neighbours = [(row, (column - 1) % self.columns), (row, (column + 1) % self.columns)]
+                if row > 0:
+                    neighbours.append((row - 1, column))
+                if row < self.rows - 1:
+                    neighbours.append((row + 1, column))
+                for neighbour in neighbours:
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        heapq.heappush(frontier, (self._cell_distance(latitude, longitude, neighbour), neighbour))
+
+            places = {heritage_id: self._places[heritage_id] for _, heritage_id in best}
+
+        return [
+            (heritage_id, places[heritage_id], -negative_distance)
+            for negative_distance, heritage_id in sorted(best, reverse=True)
+        ]
+
+    def _cell_distance(self, latitude: float, longitude: float, cell: Cell) -> float:
+        """Lower bound on the distance in km from a point to anything in a cell."""
+        row, column = cell
+        lat_low = row * self.cell_degrees - 90
+        lat_high = min(lat_low + self.cell_degrees, 90)
+        lon_low = column * self.cell_degrees - 180
+        lon_high = lon_low + self.cell_degrees
+
+        lat_gap = max(0.0, lat_low - latitude, latitude - lat_high)
+        # Longitude gap to the nearer edge, the short way round
+        to_low = (lon_low - longitude) % 360
+        to_high = (longitude - lon_high) % 360
+        lon_gap = 0.0 if to_low > 360 - self.cell_degrees else min(to_low, to_high)
+
+        if lon_gap == 0:
+            # Any point of the cell is at least this far in latitude alone
+            return EARTH_RADIUS_KM * math.radians(lat_gap)
+
+        # Otherwise the closest point is on the nearer meridian edge: where
+        # that meridian comes closest if it is within the cell, else a corner
+        edge = lon_low if to_low <= to_high else lon_high
+        phi = math.radians(latitude)
+        foot = math.degrees(math.atan2(math.sin(phi), math.cos(phi) * math.cos(math.radians(lon_gap))))
+        candidates = [lat_low, lat_high]
+        if lat_low < foot < lat_high:
+            candidates.append(foot)
+        return min(haversine_km(latitude, longitude, candidate, edge) for candidate in candidates)
+
+    def build(self, db: Session):
+        """
+        Rebuild the index from all located heritage entries.
+
+        Args:
+            db: Database session
+        """
+        rows = db.query(
+            models.HeritageEntry.id,
+            models.HeritageEntry.title,
+            models.HeritageEntry.category_id,
+            models.HeritageEntry.latitude,
+            models.HeritageEntry.longitude
+        ).filter(
+            models.HeritageEntry.latitude.isnot(None),
+            models.HeritageEntry.longitude.isnot(None)
+        ).yield_per(1000)
+
+        places: Dict[int, Place] = {}
+        cells: Dict[Cell, Set[int]] = {}
+        category_cells: Dict[int, Dict[Cell, int]] = {}
+        for heritage_id, title, category_id, latitude, longitude in rows:
+            places[heritage_id] = (latitude, longitude, title, category_id)
+            cell = self._cell(latitude, longitude)
+            cells.setdefault(cell, set()).add(heritage_id)
+            counts = category_cells.setdefault(category_id, {})
+            counts[cell] = counts.get(cell, 0) + 1
+
+        with self._lock:
+            self._places = places
+            self._cells = cells
+            self._category_cells = category_cells
+        logger.info("Built geo index with %d places", len(self))
+
+
+# Global index instance shared by the heritage router
+geo_index = GeoIndex()
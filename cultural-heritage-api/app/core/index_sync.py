@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Iterable
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from app import models
+from app.database import SessionLocal
+from app.core.search_index import search_index
+from app.core.prefix_index import prefix_index
+from app.core.trigram_index import trigram_index
+from app.core.geo_index import geo_index
+from app.core.period_index import period_index
+from app.core.view_counter import view_counter
+from app.core.page_snapshots import page_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Multi-worker configuration (set by `python -m app.serve`)
+HERITAGE_WORKERS = int(os.getenv("HERITAGE_WORKERS", "1"))
+INDEX_SYNC_SECONDS = float(os.getenv("INDEX_SYNC_SECONDS", "1.0"))
+
+
+class IndexFollower:
+    """
+    Keeps this process's in-memory search indexes in step with writes made
+    by other worker processes.
+
+    Every write bumps the shared sync version (see app.models.sync), so the
+    follower polls for entries and tombstones newer than the last version it
+    applied. Entries this worker already indexed at that version (its own
+    writes, through index_entry) are skipped, since replacing an entry in
+    the indexes is not free.
+    """
+
+    def __init__(self, interval: float = INDEX_SYNC_SECONDS):
+        self.interval = interval
+        self.version = 0
+        self._lock = threading.Lock()
+        # entry id -> version indexed by this worker, until the follower passes it
+        self._indexed: Dict[int, int] = {}
+
+    def mark_indexed(self, heritage_id: int, version: int):
+        """
+        Record that this worker indexed an entry at a version.
+
+        Args:
+            heritage_id: Heritage entry ID
+            version: Entry version that was indexed
+        """
+        if HERITAGE_WORKERS <= 1:
+            return  # No follower runs to prune or consult the record
+        with self._lock:
+            if version > self._indexed.get(heritage_id, -1):
+                self._indexed[heritage_id] = version
+
+    def start_from(self, db: Session):
+        """
+        Record the current version; call before building the indexes.
+
+        Args:
+            db: Database session
+        """
+        self.version = db.query(func.coalesce(func.max(models.SyncCounter.value), 0)).scalar()
+
+    def apply_changes(self) -> int:
+        """
+        Apply entry changes and deletions made since the last call.
+
+        Returns:
+            int: Number of changes applied
+        """
+        db = SessionLocal()
+        try:
+            entries = db.query(models.HeritageEntry).options(
+                selectinload(models.HeritageEntry.body)
+            ).filter(
+                models.HeritageEntry.version > self.version
+            ).order_by(models.HeritageEntry.version).all()
+
+            deleted = db.query(models.Tombstone.entity_id, models.Tombstone.version).filter(
+                models.Tombstone.entity == "heritage",
+                models.Tombstone.version > self.version
+            ).all()
+        finally:
+            db.close()
+
+        with self._lock:
+            indexed = dict(self._indexed)
+        for entry in entries:
+            if indexed.get(entry.id, -1) < entry.version:
+                index_entry(entry)
+
+        if deleted:
+            unindex_entries(heritage_id for heritage_id, _ in deleted)
+
+        versions = [entry.version for entry in entries] + [version for _, version in deleted]
+        if versions:
+            # Listing snapshots may predate writes made through other workers
+            page_snapshots.invalidate()
+            self.version = max(self.version, *versions)
+            with self._lock:
+                self._indexed = {
+                    heritage_id: version for heritage_id, version in self._indexed.items()
+                    if version > self.version
+                }
+        return len(versions)
+
+    async def run(self):
+        """Poll for changes until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.apply_changes)
+            except Exception:
+                logger.exception("Failed to apply index changes from other workers")
+
+
+# Global follower, only started when running several workers
+index_follower = IndexFollower()
+
+
+def index_entry(entry: models.HeritageEntry):
+    """Add or replace an entry in this worker's in-memory search structures."""
+    search_index.add(entry.id, entry.title, entry.content, entry.category_id, entry.created_by)
+    prefix_index.add(entry.id, entry.title)
+    trigram_index.add(entry.id, entry.title, entry.content, entry.category_id)
+    geo_index.add(entry.id, entry.title, entry.category_id, entry.latitude, entry.longitude)
+    period_index.add(entry.id, entry.start_year, entry.end_year)
+    index_follower.mark_indexed(entry.id, entry.version)
+
+
+def unindex_entries(heritage_ids: Iterable[int]):
+    """Remove deleted entries from this worker's in-memory search structures."""
+    heritage_ids = list(heritage_ids)
+    search_index.remove_many(heritage_ids)
+    trigram_index.remove_many(heritage_ids)
+    geo_index.remove_many(heritage_ids)
+    period_index.remove_many(heritage_ids)
+    view_counter.remove_many(heritage_ids)
+    for heritage_id in heritage_ids:
+        prefix_index.remove(heritage_id)
@@ -0,0 +1,215 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Snapshot configuration
+# These can be set as environment variables in production
+PAGE_SNAPSHOTS = os.getenv("PAGE_SNAPSHOTS", "true").lower() in ("1", "true", "yes")
+SNAPSHOT_MAX_PAGES = int(os.getenv("SNAPSHOT_MAX_PAGES", "64"))
+# How long a snapshot may still be served after a write made it stale (0 = never)
+SNAPSHOT_MAX_STALENESS_SECONDS = float(os.getenv("SNAPSHOT_MAX_STALENESS_SECONDS", "0"))
+
+# Request counts are halved this often so hotness follows current traffic
+HOTNESS_DECAY_EVERY = 10_000
+MAX_TRACKED_KEYS = 10 * SNAPSHOT_MAX_PAGES
+
+
+class _Snapshot:
+    __slots__ = ("body", "stale_since", "invalidated_generation")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.stale_since: Optional[float] = None
+        self.invalidated_generation = 0
+
+
+class PageSnapshots:
+    """
+    Serialized responses for the most requested listing pages.
+
+    Keys are (category_id, page, size, facets). The hottest pages keep their
+    JSON body in memory and are served without touching the database.
+    Writes mark the affected snapshots stale and a background thread
+    rebuilds them, hottest first; a stale snapshot is served for at most
+    SNAPSHOT_MAX_STALENESS_SECONDS before requests fall back to the
+    database.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PAGE_SNAPSHOTS,
+        max_pages: int = SNAPSHOT_MAX_PAGES,
+        max_staleness: float = SNAPSHOT_MAX_STALENESS_SECONDS
+    ):
+        self.enabled = enabled
+        self.max_pages = max_pages
+        self.max_staleness = max_staleness
+        self._snapshots: Dict[Hashable, _Snapshot] = {}
+        self._hotness: Dict[Hashable, float] = {}
+        self._requests = 0
+        # Bumped by every invalidation, so builds that raced a write are discarded
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._builder: Optional[Callable[[Hashable], bytes]] = None
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters for monitoring
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.rebuild_seconds = 0.0
+
+    def set_builder(self, builder: Callable[[Hashable], bytes]):
+        """
+        Register the function that renders a page, used for background rebuilds.
+
+        Args:
+            builder: Takes a snapshot key and returns the serialized response
+        """
+        self._builder = builder
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Get the serialized response for a page, counting the request.
+
+        Args:
+            key: (category_id, page, size, facets)
+
+        Returns:
+            The JSON body, or None if the page must be built from the database
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            self._count_request(key)
+            snapshot = self._snapshots.get(key)
+            if snapshot is None:
+                self.misses += 1
+                return None
+            if snapshot.stale_since is not None:
+                if time.monotonic() - snapshot.stale_since > self.max_staleness:
+                    self.misses += 1
+                    return None
+                self.stale_hits += 1
+            self.hits += 1
+            return snapshot.body
+
+    def put(self, key: Hashable, body: bytes, generation: int) -> bytes:
+        """
+        Offer a freshly built page; it is kept only if it is among the hottest.
+
+        Args:
+            key: Snapshot key
+            body: Serialized response
+            generation: Value of `generation` read before the page was built
+
+        Returns:
+            The body, for convenience
+        """
+        if not self.enabled:
+            return body
+
+        with self._lock:
+            if generation != self.generation:
+                return body  # Built from data a write has since changed
+            if key not in self._snapshots and len(self._snapshots) >= self.max_pages:
+                coldest = min(self._snapshots, key=lambda k: self._hotness.get(k, 0))
+                if self._hotness.get(coldest, 0) >= self._hotness.get(key, 0):
+                    return body
+                del self._snapshots[coldest]
+            self._snapshots[key] = _Snapshot(body)
+        return body
+
+    def invalidate(self, category_ids: Optional[Iterable[Optional[int]]] = None):
+        """
+        Mark snapshots affected by a write as stale and schedule rebuilds.
+
+        Args:
+            category_ids: Categories whose entries changed; None marks every snapshot
+        """
+        if not self.enabled:
+            return
+
+        changed = None if category_ids is None else set(category_ids)
+        now = time.monotonic()
+        with self._lock:
+            self.generation += 1
+            for (category_id, _, _, facets), snapshot in self._snapshots.items():
+                # Unfiltered pages and facet counts change with any write
+                if changed is None or category_id is None or facets or category_id in changed:
+                    if snapshot.stale_since is None:
+                        snapshot.stale_since = now
+                    snapshot.invalidated_generation = self.generation
+
+        self._ensure_started()
+        self._wakeup.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for monitoring."""
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "stale": sum(1 for s in self._snapshots.values() if s.stale_since is not None),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "rebuilds": self.rebuilds,
+                "rebuild_seconds": round(self.rebuild_seconds, 3),
+            }
+
+    def _count_request(self, key: Hashable):
+        self._hotness[key] = self._hotness.get(key, 0) + 1
+        self._requests += 1
+        if self._requests % HOTNESS_DECAY_EVERY == 0 or len(self._hotness) > MAX_TRACKED_KEYS:
+            self._hotness = {
+                k: count / 2 for k, count in self._hotness.items()
+                if count >= 2 or k in self._snapshots
+            }
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None and self._builder is not None:
+                self._thread = threading.Thread(target=self._rebuilder, name="page-snapshots", daemon=True)
+                self._thread.start()
+
+    def _stale_keys(self) -> Tuple[Hashable, ...]:
+        with self._lock:
+            stale = [key for key, s in self._snapshots.items() if s.stale_since is not None]
+            stale.sort(key=lambda k: self._hotness.get(k, 0), reverse=True)
+            return tuple(stale)
+
+    def _rebuilder(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+
+            for key in self._stale_keys():
+                started = time.monotonic()
+                generation = self.generation
+                try:
+                    body = self._builder(key)
+                except Exception:
+                    logger.exception("Failed to rebuild page snapshot %s", key)
+                    continue
+
+                with self._lock:
+                    snapshot = self._snapshots.get(key)
+                    # Another write may have landed while building; keep it stale then
+                    if snapshot is not None and snapshot.invalidated_generation <= generation:
+                        self._snapshots[key] = _Snapshot(body)
+                    self.rebuilds += 1
+                    self.rebuild_seconds += time.monotonic() - started
+
+                if self._wakeup.is_set():
+                    break  # New writes: start over with the hottest stale pages
+
+
+# Global snapshots of the default heritage listings
+page_snapshots = PageSnapshots()
@@ -0,0 +1,141 @@
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+# Stand-ins for an open end of a query range
+EARLIEST_YEAR = -10 ** 9
+LATEST_YEAR = 10 ** 9
+
+
+class PeriodIndex:
+    """
+    Interval index over the historical periods (start/end years) of entries.
+
+    Periods are grouped by length class (lengths up to 0, 1, 3, 7, 15, ...
+    years) and each group is kept sorted by start year. Within a group every
+    period overlapping [X, Y] starts between X minus the group's longest
+    length and Y, so a query is one bisect and a short scan per group; a
+    few very long eras cannot slow down queries for short ones.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # entry id -> (start year, end year)
+        self._periods: Dict[int, Tuple[int, int]] = {}
+        # length class -> sorted (start, end, entry id)
+        self._groups: Dict[int, List[Tuple[int, int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._periods)
+
+    @staticmethod
+    def _length_class(start: int, end: int) -> int:
+        return (end - start).bit_length()
+
+    def add(self, heritage_id: int, start_year: Optional[int], end_year: Optional[int]):
+        """
+        Add or replace an entry's period; entries without one are removed.
+
+        Args:
+            heritage_id: Heritage entry ID
+            start_year: First year (negative for BCE), or None
+            end_year: Last year, not before start_year
+        """
+        with self._lock:
+            self._discard(heritage_id)
+            if start_year is None:
+                return
+            end_year = start_year if end_year is None else end_year
+            self._periods[heritage_id] = (start_year, end_year)
+            group = self._groups.setdefault(self._length_class(start_year, end_year), [])
+            bisect.insort(group, (start_year, end_year, heritage_id))
+
+    def remove_many(self, heritage_ids):
+        """
+        Remove entries if present.
+
+        Args:
+            heritage_ids: Heritage entry IDs
+        """
+        with self._lock:
+            for heritage_id in heritage_ids:
+                self._discard(heritage_id)
+
+    def _discard(self, heritage_id: int):
+        period = self._periods.pop(heritage_id, None)
+        if period is None:
+            return
+        key = (period[0], period[1], heritage_id)
+        group = self._groups[self._length_class(*period)]
+        position = bisect.bisect_left(group, key)
+        if position < len(group) and group[position] == key:
+            del group[position]
+
+    def overlapping(self, year_from: Optional[int], year_to: Optional[int]) -> List[int]:
+        """
+        Find entries whose period overlaps a range of years.
+
+        Args:
+            year_from: First year of the range, or None for no lower bound
+            year_to: Last year of the range, or None for no upper bound
+
+        Returns:
+            Entry IDs in chronological order (by start year, then ID)
+        """
+        year_from = EARLIEST_YEAR if year_from is None else year_from
+        year_to = LATEST_YEAR if year_to is None else year_to
+
+        matches = []
+        with self._lock:
+            for length_class, group in self._groups.items():
+                longest = (1 << length_class) - 1
+                position = bisect.bisect_left(group, (year_from - longest,))
+                for index in range(position, len(group)):
+                    start, end, heritage_id = group[index]
+                    if start > year_to:
+                        break
+                    if end >= year_from:
+                        matches.append((start, heritage_id))
+
+        matches.sort()
+        return [heritage_id for _, heritage_id in matches]
+
+    def build(self, db: Session):
+        """
+        Rebuild the index from all dated heritage entries.
+
+        Args:
+            db: Database session
+        """
+        rows = db.query(
+            models.HeritageEntry.id,
+            models.HeritageEntry.start_year,
+            models.HeritageEntry.end_year
+        ).filter(models.HeritageEntry.start_year.isnot(None)).yield_per(1000)
+
+        periods: Dict[int, Tuple[int, int]] = {}
+        groups: Dict[int, List[Tuple[int, int, int]]] = {}
+        for heritage_id, start_year, end_year in rows:
+            end_year = start_year if end_year is None else end_year
+            periods[heritage_id] = (start_year, end_year)
+            groups.setdefault(self._length_class(start_year, end_year), []).append(
+                (start_year, end_year, heritage_id)
+            )
+        for group in groups.values():
+            group.sort()
+
+        with self._lock:
+            self._periods = periods
+            self._groups = groups
+        logger.info("Built period index with %d entries", len(self))
+
+
+# Global index instance shared by the heritage router
+period_index = PeriodIndex()
@@ -0,0 +1,129 @@
+import bisect
+import logging
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.text import normalize_title
+
+logger = logging.getLogger(__name__)
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index over heritage entry titles.
+
+    Keys are (normalized title, entry id) pairs kept in sorted order, so all
+    titles sharing a prefix form one contiguous run found with bisect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[str, int]] = []
+        # entry id -> original title, for display
+        self._titles: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, heritage_id: int, title: str):
+        """
+        Add or replace a title.
+
+        Args:
+            heritage_id: Heritage entry ID
+            title: Entry title
+        """
+        with self._lock:
+            if heritage_id in self._titles:
+                self._discard(heritage_id)
+            bisect.insort(self._keys, (normalize_title(title), heritage_id))
+            self._titles[heritage_id] = title
+
+    def remove(self, heritage_id: int):
+        """
+        Remove a title if present.
+
+        Args:
+            heritage_id: Heritage entry ID
+        """
+        with self._lock:
+            if heritage_id in self._titles:
+                self._discard(heritage_id)
+
+    def _discard(self, heritage_id: int):
+        key = (normalize_title(self._titles.pop(heritage_id)), heritage_id)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        Find titles starting with a prefix, in alphabetical order.
+
+        Args:
+            prefix: Typed prefix
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of (entry id, title) pairs
+        """
+        normalized = normalize_title(prefix)
+        if not normalized:
+            return []
+
+        with self._lock:
+            start = bisect.bisect_left(self._keys, (normalized,))
+            results = []
+            for key, heritage_id in self._keys[start:start + limit]:
+                if not key.startswith(normalized):
+                    break
+                results.append((heritage_id, self._titles[heritage_id]))
+            return results
+
+    def titles(self, heritage_ids: Iterable[int]) -> Dict[int, str]:
+        """
+        Look up the titles of entries.
+
+        Args:
+            heritage_ids: Heritage entry IDs
+
+        Returns:
+            Mapping of entry id -> title for the entries that exist
+        """
+        with self._lock:
+            return {
+                heritage_id: self._titles[heritage_id]
+                for heritage_id in heritage_ids if heritage_id in self._titles
+            }
+
+    def build(self, db: Session):
+        """
+        Rebuild the index from all heritage entry titles.
+
+        Args:
+            db: Database session
+        """
+        titles = dict(
+            db.query(models.HeritageEntry.id, models.HeritageEntry.title).yield_per(1000)
+        )
+        self.load_titles(titles)
+        logger.info("Built title prefix index with %d entries", len(self))
+
+    def load_titles(self, titles: Dict[int, str]):
+        """
+        Replace the index contents with the given titles in one sort.
+
+        Args:
+            titles: Mapping of entry id -> title
+        """
+        keys = sorted((normalize_title(title), heritage_id) for heritage_id, title in titles.items())
+        with self._lock:
+            self._keys = keys
+            self._titles = titles
+
+
+# Global index instance shared by the heritage router
+prefix_index = PrefixIndex()
@@ -0,0 +1,289 @@
+import heapq
+import logging
+import os
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.search_index import FIELD_BOOSTS
+from app.core.text import tokenize
+
+try:
+    import numpy
+    from scipy import sparse
+except ImportError:  # Optional dependencies; only the batch job needs them
+    numpy = None
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Related entries configuration
+# These can be set as environment variables in production
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "10"))
+RELATED_MIN_SCORE = float(os.getenv("RELATED_MIN_SCORE", "0.05"))
+# Terms in more than this share of entries are ignored, like stop words,
+# but only once they are in more than RELATED_MAX_DF_FLOOR entries: in a
+# small corpus every useful term is in a large share of it
+RELATED_MAX_DF = float(os.getenv("RELATED_MAX_DF", "0.5"))
+RELATED_MAX_DF_FLOOR = int(os.getenv("RELATED_MAX_DF_FLOOR", "20"))
+
+# (position of the related entry in the corpus, cosine similarity)
+Neighbour = Tuple[int, float]
+
+
+def require_numpy():
+    """Raise if the optional numpy/scipy dependencies are missing."""
+    if numpy is None:
+        raise RuntimeError("Related entries need numpy and scipy: pip install -r requirements.txt")
+
+
+class Corpus:
+    """
+    TF-IDF vectors of every heritage entry, one L2-normalized sparse row each.
+
+    Term frequencies count title tokens with the search index's title boost
+    and are dampened logarithmically; cosine similarity is then a sparse dot
+    product. Very common terms are dropped like stop words, and terms found
+    in a single entry are dropped after normalizing since they cannot match.
+    """
+
+    def __init__(self, ids, versions, vectors):
+        self.ids = ids
+        self.versions = versions
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        max_df: float = RELATED_MAX_DF,
+        max_df_floor: int = RELATED_MAX_DF_FLOOR
+    ) -> "Corpus":
+        """
+        Tokenize and vectorize all heritage entries.
+
+        Args:
+            db: Database session
+            max_df: Largest share of entries a term may appear in
+            max_df_floor: Terms in at most this many entries are always kept
+
+        Returns:
+            Corpus: Entries in ID order
+        """
+        require_numpy()
+
+        rows = db.query(
+            models.HeritageEntry.id,
+            models.HeritageEntry.version,
+            models.HeritageEntry.title,
+            models.HeritageContent.content
+        ).outerjoin(models.HeritageEntry.body).order_by(models.HeritageEntry.id).yield_per(1000)
+
+        ids, versions = [], []
+        vocabulary: Dict[str, int] = {}
+        indptr, indices, counts = [0], [], []
+        for heritage_id, version, title, content in rows:
+            weighted: Dict[int, float] = {}
+            for boost, text in ((FIELD_BOOSTS["title"], title), (FIELD_BOOSTS["content"], content)):
+                for token in tokenize(text or ""):
+                    column = vocabulary.setdefault(token, len(vocabulary))
+                    weighted[column] = weighted.get(column, 0.0) + boost
+            ids.append(heritage_id)
+            versions.append(version)
+            indices.extend(weighted)
+            counts.extend(weighted.values())
+            indptr.append(len(indices))
+
+        vectors = sparse.csr_matrix(
+            (numpy.array(counts, dtype=numpy.float64), numpy.array(indices, dtype=numpy.int64), indptr),
+            shape=(len(ids), len(vocabulary))
+        )
+
+        entries = len(ids)
+        df = numpy.bincount(vectors.indices, minlength=len(vocabulary))
+        idf = numpy.log((1 + entries) / (1 + df)) + 1
+        idf[df > max(1.0, max_df * entries, max_df_floor)] = 0
+        vectors.data = (1 + numpy.log(vectors.data)) * idf[vectors.indices]
+
+        norms = numpy.sqrt(numpy.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        vectors = sparse.diags(1 / norms) @ vectors
+        vectors.data[df[vectors.indices] <= 1] = 0
+        vectors.eliminate_zeros()
+
+        logger.info("Vectorized %d entries over %d terms", entries, len(vocabulary))
+        return cls(numpy.array(ids), numpy.array(versions), vectors.tocsr())
+
+    def changed_since(self, version: int) -> List[int]:
+        """Positions of entries written after a version."""
+        return numpy.flatnonzero(self.versions > version).tolist()
+
+    def top_related(
+        self,
+        positions: Sequence[int],
+        k: int = RELATED_TOP_K,
+        min_score: float = RELATED_MIN_SCORE
+    ) -> List[List[Neighbour]]:
+        """
+        Find the k most similar entries for some entries with one sparse product.
+
+        Args:
+            positions: Corpus positions to compute lists for (a block)
+            k: Neighbours per entry
+            min_score: Lowest cosine similarity worth keeping
+
+        Returns:
+            List of neighbour lists, most similar first (ties by ID)
+        """
+        scores = (self.vectors[positions] @ self.vectors.T).tocsr()
+
+        results = []
+        for row, position in enumerate(positions):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            columns, values = scores.indices[start:end], scores.data[start:end]
+            keep = (columns != position) & (values >= min_score)
+            columns, values = columns[keep], values[keep]
+            if len(columns) > k:
+                best = numpy.argpartition(-values, k - 1)[:k]
+                columns, values = columns[best], values[best]
+            order = numpy.lexsort((self.ids[columns], -values))
+            results.append([(int(columns[i]), float(values[i])) for i in order])
+        return results
+
+
+def completed_version(db: Session) -> int:
+    """Newest entry version covered by the last finished run, or -1 if none finished."""
+    version = db.query(models.RelatedRun.version).filter(models.RelatedRun.id == 1).scalar()
+    return -1 if version is None else version
+
+
+def complete_run(db: Session, corpus: Corpus):
+    """
+    Record that every entry of a corpus has its list stored.
+
+    Only called once a run has written all its blocks, so an interrupted run
+    is redone from the previous watermark. Entries without any similar
+    entry store no rows, which is why the stored versions cannot serve.
+
+    Args:
+        db: Database session
+        corpus: Corpus the run computed lists for
+    """
+    if not len(corpus):
+        return
+    version = int(corpus.versions.max())
+    result = db.execute(update(models.RelatedRun).where(models.RelatedRun.id == 1).values(version=version))
+    if result.rowcount == 0:
+        db.execute(insert(models.RelatedRun).values(id=1, version=version))
+    db.commit()
+
+
+def write_related(db: Session, corpus: Corpus, lists: Dict[int, List[Neighbour]]):
+    """
+    Replace the stored lists of some entries in one transaction.
+
+    Entries deleted since the corpus was loaded are skipped; the DELETE
+    takes the write lock first, so none can disappear before the INSERT.
+
+    Args:
+        db: Database session
+        corpus: Corpus the positions refer to
+        lists: Corpus position -> neighbours, most similar first
+    """
+    heritage_ids = [int(corpus.ids[position]) for position in lists]
+    db.execute(delete(models.RelatedEntry).where(models.RelatedEntry.heritage_id.in_(heritage_ids)))
+
+    referenced = set(heritage_ids)
+    for neighbours in lists.values():
+        referenced.update(int(corpus.ids[related]) for related, _ in neighbours)
+    existing = set(db.scalars(
+        select(models.HeritageEntry.id).where(models.HeritageEntry.id.in_(referenced))
+    ))
+
+    rows = []
+    for position, neighbours in lists.items():
+        heritage_id = int(corpus.ids[position])
+        if heritage_id not in existing:
+            continue
+        kept = [
+            (int(corpus.ids[related]), score) for related, score in neighbours
+            if int(corpus.ids[related]) in existing
+        ]
+        rows.extend(
+            {
+                "heritage_id": heritage_id,
+                "rank": rank,
+                "related_id": related_id,
+                "score": score,
+                "version": int(corpus.versions[position])
+            }
+            for rank, (related_id, score) in enumerate(kept)
+        )
+    if rows:
+        db.execute(insert(models.RelatedEntry), rows)
+    db.commit()
+
+
+def merge_related(
+    db: Session,
+    corpus: Corpus,
+    changed: Dict[int, List[Neighbour]],
+    k: int = RELATED_TOP_K
+) -> Dict[int, List[Neighbour]]:
+    """
+    Work out how recomputed entries change the stored lists of the others.
+
+    Similarity is symmetric, so if a changed entry C has B among its
+    neighbours, B's list may now include C. The scores come from C's list;
+    B's other neighbours are read back from the table.
+
+    Args:
+        db: Database session
+        corpus: Corpus the positions refer to
+        changed: Recomputed lists, corpus position -> neighbours
+        k: Neighbours per entry
+
+    Returns:
+        Updated lists of unchanged entries, corpus position -> neighbours
+    """
+    # Best changed entries per unchanged entry, as a min-heap of (score, position)
+    offers: Dict[int, List[Tuple[float, int]]] = {}
+    for position, neighbours in changed.items():
+        for related, score in neighbours:
+            if related in changed:
+                continue
+            heap = offers.setdefault(related, [])
+            if len(heap) < k:
+                heapq.heappush(heap, (score, position))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, position))
+    if not offers:
+        return {}
+
+    positions = {int(heritage_id): position for position, heritage_id in enumerate(corpus.ids)}
+    changed_ids = {int(corpus.ids[position]) for position in changed}
+    stored: Dict[int, List[Neighbour]] = {position: [] for position in offers}
+    for heritage_id, related_id, score in db.execute(
+        select(
+            models.RelatedEntry.heritage_id,
+            models.RelatedEntry.related_id,
+            models.RelatedEntry.score
+        ).where(
+            models.RelatedEntry.heritage_id.in_([int(corpus.ids[position]) for position in offers])
+        ).order_by(models.RelatedEntry.heritage_id, models.RelatedEntry.rank)
+    ):
+        # Old scores of changed entries are replaced by the new ones
+        if related_id in positions and related_id not in changed_ids:
+            stored[positions[heritage_id]].append((positions[related_id], score))
+
+    merged = {}
+    for position, heap in offers.items():
+        neighbours = stored[position] + [(offer, score) for score, offer in heap]
+        neighbours.sort(key=lambda neighbour: (-neighbour[1], int(corpus.ids[neighbour[0]])))
+        merged[position] = neighbours[:k]
+    return merged
@@ -0,0 +1,408 @@
+import array
+import bisect
+import heapq
+import logging
+import math
+import os
+import pickle
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Index configuration
+# These can be set as environment variables in production
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "./search_index.bin")
+FIELD_BOOSTS = {"title": 2.5, "content": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+INDEX_FORMAT_VERSION = 4
+
+
+class SearchIndex:
+    """
+    BM25 inverted index over heritage entry titles and content.
+
+    Postings are stored per field as two parallel arrays (doc ids and term
+    frequencies) sorted by doc id, which keeps memory close to 8 bytes per
+    posting. Each entry also keeps its distinct terms per field, so
+    replacing or removing it only touches the posting lists it appears in,
+    at a binary search each.
+
+    The saved file records the sync version (app.models.sync) the index was
+    complete up to, so loading it replays only the writes made after that.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        # Sync version every write up to which is indexed
+        self.version = 0
+        self._reset()
+
+    def _reset(self):
+        # field -> term -> (doc ids, term frequencies)
+        self._postings: Dict[str, Dict[str, Tuple[array.array, array.array]]] = {
+            field: {} for field in FIELD_BOOSTS
+        }
+        # field -> doc id -> number of tokens
+        self._doc_len: Dict[str, Dict[int, int]] = {field: {} for field in FIELD_BOOSTS}
+        # field -> doc id -> distinct terms
+        self._doc_terms: Dict[str, Dict[int, Tuple[str, ...]]] = {field: {} for field in FIELD_BOOSTS}
+        self._total_len: Dict[str, int] = {field: 0 for field in FIELD_BOOSTS}
+        # doc id -> category id / creator id, used for filtering and facets
+        self._doc_category: Dict[int, int] = {}
+        self._doc_creator: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_category)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self._doc_category
+
+    def add(self, doc_id: int, title: str, content: str, category_id: int, created_by: int):
+        """
+        Index a heritage entry. Re-adding an existing ID replaces it.
+
+        Args:
+            doc_id: Heritage entry ID
+            title: Entry title
+            content: Entry content
+            category_id: Entry category, for filtered searches and facets
+            created_by: Entry creator, for facets
+        """
+        with self._lock:
+            if doc_id in self._doc_category:
+                self.remove_many([doc_id])
+
+            for field, text in (("title", title), ("content", content)):
+                tokens = tokenize(text or "")
+                counts: Dict[str, int] = {}
+                for token in tokens:
+                    counts[token] = counts.get(token, 0) + 1
+
+                postings = self._postings[field]
+                for term, tf in counts.items():
+                    posting = postings.get(term)
+                    if posting is None:
+                        posting = postings[term] = (array.array("I"), array.array("I"))
+                    doc_list, tf_list = posting
+                    if not doc_list or doc_list[-1] < doc_id:
+                        doc_list.append(doc_id)
+                        tf_list.append(tf)
+                    else:
+                        position = bisect.bisect_left(doc_list, doc_id)
+                        doc_list.insert(position, doc_id)
+                        tf_list.insert(position, tf)
+
+                self._doc_len[field][doc_id] = len(tokens)
+                self._doc_terms[field][doc_id] = tuple(counts)
+                self._total_len[field] += len(tokens)
+
+            self._doc_category[doc_id] = category_id
+            self._doc_creator[doc_id] = created_by
+
+    def remove_many(self, doc_ids: Iterable[int]):
+        """
+        Remove heritage entries from the index.
+
+        Only the posting lists of the removed entries' terms are touched.
+
+        Args:
+            doc_ids: Heritage entry IDs to remove
+        """
+        with self._lock:
+            removed = {doc_id for doc_id in doc_ids if doc_id in self._doc_category}
+            if not removed:
+                return
+
+            for field, postings in self._postings.items():
+                # term -> removed entries containing it
+                affected: Dict[str, Set[int]] = {}
+                for doc_id in removed:
+                    for term in self._doc_terms[field].pop(doc_id, ()):
+                        affected.setdefault(term, set()).add(doc_id)
+                    self._total_len[field] -= self._doc_len[field].pop(doc_id, 0)
+
+                for term, docs in affected.items():
+                    doc_list, tf_list = postings[term]
+                    positions = sorted(bisect.bisect_left(doc_list, doc_id) for doc_id in docs)
+                    if len(positions) == 1:
+                        del doc_list[positions[0]]
+                        del tf_list[positions[0]]
+                    else:
+                        # Copy the runs between removed postings as slices
+                        kept_docs, kept_tfs = array.array("I"), array.array("I")
+                        for previous, position in zip([-1] + positions, positions + [len(doc_list)]):
+                            kept_docs.extend(doc_list[previous + 1:position])
+                            kept_tfs.extend(tf_list[previous + 1:position])
+                        doc_list = kept_docs
+                        postings[term] = (kept_docs, kept_tfs)
+                    if not doc_list:
+                        del postings[term]
+
+            for doc_id in removed:
+                del self._doc_category[doc_id]
+                del self._doc_creator[doc_id]
+
+    def reassign_creator(self, doc_ids: Iterable[int], created_by: int):
+        """
+        Record a new creator for indexed entries; the text is unchanged.
+
+        Args:
+            doc_ids: Heritage entry IDs
+            created_by: New creator ID
+        """
+        with self._lock:
+            for doc_id in doc_ids:
+                if doc_id in self._doc_creator:
+                    self._doc_creator[doc_id] = created_by
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        category_id: Optional[int] = None,
+        doc_ids: Optional[Set[int]] = None
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Rank entries matching any query term with BM25.
+
+        Args:
+            query: Search keywords
+            k: Number of top results to return
+            category_id: Optional category filter
+            doc_ids: Optional set of entries to restrict results to
+
+        Returns:
+            Tuple of (top-k (doc id, score) pairs best first, total matches)
+        """
+        terms = set(tokenize(query))
+        scores: Dict[int, float] = {}
+
+        with self._lock:
+            doc_count = len(self._doc_category)
+            if not terms or doc_count == 0:
+                return [], 0
+
+            for field, boost in FIELD_BOOSTS.items():
+                avg_len = (self._total_len[field] / doc_count) or 1.0
+                doc_len = self._doc_len[field]
+
+                for term in terms:
+                    posting = self._postings[field].get(term)
+                    if posting is None:
+                        continue
+
+                    doc_list, tf_list = posting
+                    df = len(doc_list)
+                    idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+
+                    for doc_id, tf in zip(doc_list, tf_list):
+                        if category_id is not None and self._doc_category[doc_id] != category_id:
+                            continue
+                        if doc_ids is not None and doc_id not in doc_ids:
+                            continue
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[doc_id] / avg_len)
+                        scores[doc_id] = scores.get(doc_id, 0.0) + (
+                            boost * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        )
+
+        # Heap-select the top k instead of sorting every match
+        top = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return top, len(scores)
+
+    def facet_counts(
+        self,
+        query: str,
+        category_id: Optional[int] = None,
+        doc_ids: Optional[Set[int]] = None
+    ) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """
+        Count entries matching a query per category and per creator.
+
+        Category counts ignore the category filter so callers can show the
+        spread across all categories; creator counts apply it.
+
+        Args:
+            query: Search keywords
+            category_id: Optional category filter
+            doc_ids: Optional set of entries to restrict counts to
+
+        Returns:
+            Tuple of (category id -> count, creator id -> count)
+        """
+        terms = set(tokenize(query))
+        matched = set()
+
+        with self._lock:
+            for postings in self._postings.values():
+                for term in terms:
+                    posting = postings.get(term)
+                    if posting is not None:
+                        matched.update(posting[0])
+            if doc_ids is not None:
+                matched &= doc_ids
+
+            category_counts: Dict[int, int] = {}
+            creator_counts: Dict[int, int] = {}
+            for doc_id in matched:
+                doc_category = self._doc_category[doc_id]
+                category_counts[doc_category] = category_counts.get(doc_category, 0) + 1
+                if category_id is None or doc_category == category_id:
+                    creator = self._doc_creator[doc_id]
+                    creator_counts[creator] = creator_counts.get(creator, 0) + 1
+
+        return category_counts, creator_counts
+
+    def build(self, db: Session):
+        """
+        Rebuild the index from the database.
+
+        Args:
+            db: Database session
+        """
+        version = _sync_version(db)
+        rows = db.query(
+            models.HeritageEntry.id,
+            models.HeritageEntry.title,
+            models.HeritageContent.content,
+            models.HeritageEntry.category_id,
+            models.HeritageEntry.created_by
+        ).outerjoin(models.HeritageEntry.body).order_by(models.HeritageEntry.id).yield_per(1000)
+
+        with self._lock:
+            self._reset()
+            for doc_id, title, content, category_id, created_by in rows:
+                self.add(doc_id, title, content, category_id, created_by)
+            self.version = version
+
+        logger.info("Built search index with %d entries", len(self))
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist the index to disk (written atomically).
+
+        Args:
+            path: Destination file, defaults to SEARCH_INDEX_PATH
+        """
+        path = path or self.path
+        with self._lock:
+            state = {
+                "version": INDEX_FORMAT_VERSION,
+                "sync_version": self.version,
+                "postings": self._postings,
+                "doc_len": self._doc_len,
+                "doc_terms": self._doc_terms,
+                "total_len": self._total_len,
+                "doc_category": self._doc_category,
+                "doc_creator": self._doc_creator,
+            }
+            # Per-process temporary file: several workers may save at once
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Load a previously saved index.
+
+        Args:
+            path: Source file, defaults to SEARCH_INDEX_PATH
+
+        Returns:
+            bool: True if the index was loaded, False if missing or incompatible
+        """
+        path = path or self.path
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+
+        if state.get("version") != INDEX_FORMAT_VERSION:
+            return False
+
+        with self._lock:
+            self._postings = state["postings"]
+            self._doc_len = state["doc_len"]
+            self._doc_terms = state["doc_terms"]
+            self._total_len = state["total_len"]
+            self._doc_category = state["doc_category"]
+            self._doc_creator = state["doc_creator"]
+            self.version = state["sync_version"]
+        return True
+
+    def catch_up(self, db: Session) -> int:
+        """
+        Apply entry writes and deletions newer than the index's sync version.
+
+        Args:
+            db: Database session
+
+        Returns:
+            int: Number of changes applied
+        """
+        version = _sync_version(db)
+        deleted = db.query(models.Tombstone.entity_id).filter(
+            models.Tombstone.entity == "heritage",
+            models.Tombstone.version > self.version
+        ).all()
+        rows = db.query(
+            models.HeritageEntry.id,
+            models.HeritageEntry.title,
+            models.HeritageContent.content,
+            models.HeritageEntry.category_id,
+            models.HeritageEntry.created_by
+        ).outerjoin(models.HeritageEntry.body).filter(
+            models.HeritageEntry.version > self.version
+        ).all()
+
+        with self._lock:
+            # Deletions first: a deleted entry's ID may have been reused since
+            self.remove_many(heritage_id for heritage_id, in deleted)
+            for doc_id, title, content, category_id, created_by in rows:
+                self.add(doc_id, title, content, category_id, created_by)
+            self.version = version
+        return len(deleted) + len(rows)
+
+    def load_or_build(self, db: Session):
+        """
+        Load the saved index and replay newer writes, or rebuild it.
+
+        The replayed index is only kept if it then has as many entries, and
+        the same largest ID, as the database.
+
+        Args:
+            db: Database session
+        """
+        if self.load():
+            replayed = self.catch_up(db)
+            count, max_id = db.query(
+                func.count(models.HeritageEntry.id), func.max(models.HeritageEntry.id)
+            ).one()
+            if len(self) == count and max(self._doc_category, default=None) == max_id:
+                logger.info(
+                    "Loaded search index with %d entries from %s, replayed %d changes",
+                    len(self), self.path, replayed
+                )
+                return
+
+        self.build(db)
+        self.save()
+
+
+def _sync_version(db: Session) -> int:
+    """Current shared sync version; every write with this version or older is committed."""
+    return db.query(func.coalesce(func.max(models.SyncCounter.value), 0)).scalar()
+
+
+# Global index instance shared by the heritage router
+search_index = SearchIndex()
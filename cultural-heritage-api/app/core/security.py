@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+import hmac
 import os
+import secrets
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -15,6 +18,7 @@ pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -91,3 +95,41 @@ def verify_token(token: str) -> Optional[dict]:
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+def create_refresh_secret() -> Tuple[str, bytes]:
+    """
+    Generate the random part of a refresh token.
+
+    Returns:
+        Tuple of (secret to hand to the client, HMAC of it to store)
+    """
+    secret = secrets.token_urlsafe(32)
+    return secret, hash_refresh_secret(secret)
+
+def hash_refresh_secret(secret: str) -> bytes:
+    """
+    Hash a refresh token secret for storage and comparison.
+
+    A keyed HMAC-SHA256 is enough here: the secret is random, so unlike
+    passwords it needs no slow hash.
+
+    Args:
+        secret: Secret part of the refresh token
+
+    Returns:
+        bytes: 32-byte digest
+    """
+    return hmac.new(SECRET_KEY.encode("utf-8"), secret.encode("utf-8"), hashlib.sha256).digest()
+
+def refresh_secret_matches(secret: str, secret_hash: bytes) -> bool:
+    """
+    Compare a presented refresh token secret with the stored hash in constant time.
+
+    Args:
+        secret: Secret part of the presented token
+        secret_hash: Stored HMAC
+
+    Returns:
+        bool: True if they match
+    """
+    return hmac.compare_digest(hash_refresh_secret(secret), secret_hash)
@@ -0,0 +1,93 @@
+import os
+import re
+import unicodedata
+from typing import List
+
+# Normalization configuration
+# Changing this requires re-running `python -m app.cli backfill-search`
+STRIP_DIACRITICS = os.getenv("SEARCH_STRIP_DIACRITICS", "true").lower() in ("1", "true", "yes")
+
+# Combining marks are only stripped after characters below this code point
+# (Latin, Greek, Cyrillic, Hebrew, Arabic...). In Indic and Southeast Asian
+# scripts the marks are vowels, and dropping them would merge distinct words.
+_DIACRITIC_BASE_LIMIT = 0x0800
+
+_ARABIC_TATWEEL = "\u0640"
+
+# Words are letters, digits and combining marks; Python's \w alone would
+# split Devanagari, Ethiopic and Thai words at every vowel sign
+_COMBINING_MARKS = "".join(
+    chr(code) for code in range(0x10000) if unicodedata.category(chr(code)) in ("Mn", "Mc", "Me")
+)
+_WORD_PATTERN = re.compile(f"[\\w{re.escape(_COMBINING_MARKS)}]+", re.UNICODE)
+
+# Scripts written without spaces between words: Thai, Lao, Myanmar, Khmer,
+# Hiragana/Katakana and CJK ideographs
+_UNSPACED = "\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_SEGMENT_PATTERN = re.compile(f"([{_UNSPACED}]+)|([^{_UNSPACED}]+)")
+
+
+def normalize_text(text: str, strip_diacritics: bool = STRIP_DIACRITICS) -> str:
+    """
+    Normalize text for search: NFKC, case folding and optional diacritic removal.
+
+    Args:
+        text: Raw text in any script
+        strip_diacritics: Remove accents and Arabic vowel marks
+
+    Returns:
+        str: Normalized text
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold().replace(_ARABIC_TATWEEL, "")
+
+    if strip_diacritics:
+        kept = []
+        base = 0
+        for ch in unicodedata.normalize("NFD", text):
+            if unicodedata.combining(ch):
+                if base < _DIACRITIC_BASE_LIMIT:
+                    continue
+            else:
+                base = ord(ch)
+            kept.append(ch)
+        text = unicodedata.normalize("NFC", "".join(kept))
+
+    return text
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a title for prefix and trigram matching.
+
+    Args:
+        title: Raw title or typed prefix
+
+    Returns:
+        str: Normalized title with collapsed whitespace
+    """
+    return " ".join(normalize_text(title).split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search tokens.
+
+    Words are runs of letters and digits. Runs in scripts written without
+    spaces are split into overlapping character bigrams instead.
+
+    Args:
+        text: Raw text in any script
+
+    Returns:
+        List[str]: Tokens in document order
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(normalize_text(text)):
+        for unspaced, spaced in _SEGMENT_PATTERN.findall(word):
+            if spaced:
+                tokens.append(spaced)
+            elif len(unspaced) == 1:
+                tokens.append(unspaced)
+            else:
+                tokens.extend(unspaced[i:i + 2] for i in range(len(unspaced) - 1))
+    return tokens
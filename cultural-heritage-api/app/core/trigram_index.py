@@ -0,0 +1,250 @@
+import array
+import bisect
+import heapq
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.text import normalize_title
+
+logger = logging.getLogger(__name__)
+
+# Index configuration
+# These can be set as environment variables in production
+TRIGRAM_INDEX_CONTENT = os.getenv("TRIGRAM_INDEX_CONTENT", "false").lower() in ("1", "true", "yes")
+TRIGRAM_MIN_SIMILARITY = float(os.getenv("TRIGRAM_MIN_SIMILARITY", "0.4"))
+CONTENT_WEIGHT = 0.8  # Content matches rank below equally good title matches
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split text into the set of its word trigrams.
+
+    Each word is padded like PostgreSQL's pg_trgm ("  word "), so word
+    beginnings weigh more than their middles.
+
+    Args:
+        text: Title, content or query text
+
+    Returns:
+        Set[str]: Distinct trigrams
+    """
+    grams = set()
+    for word in normalize_title(text).split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class _TrigramField:
+    """
+    Posting lists (trigram -> array of entry ids, sorted) for one text field.
+
+    Each entry's trigrams are kept too, so removing it only touches the
+    posting lists it is in, at a binary search each.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, array.array] = {}
+        # entry id -> distinct trigrams
+        self.grams: Dict[int, Tuple[str, ...]] = {}
+
+    def add(self, heritage_id: int, text: str):
+        grams = trigrams(text or "")
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                posting = self.postings[gram] = array.array("I")
+            if not posting or posting[-1] < heritage_id:
+                posting.append(heritage_id)
+            else:
+                posting.insert(bisect.bisect_left(posting, heritage_id), heritage_id)
+        self.grams[heritage_id] = tuple(grams)
+
+    def size(self, heritage_id: int) -> int:
+        """Number of distinct trigrams of an entry."""
+        return len(self.grams[heritage_id])
+
+    def remove_many(self, removed: Set[int]):
+        # trigram -> removed entries containing it
+        affected: Dict[str, Set[int]] = {}
+        for heritage_id in removed:
+            for gram in self.grams.pop(heritage_id, ()):
+                affected.setdefault(gram, set()).add(heritage_id)
+
+        for gram, entries in affected.items():
+            posting = self.postings[gram]
+            positions = sorted(bisect.bisect_left(posting, heritage_id) for heritage_id in entries)
+            if len(positions) == 1:
+                del posting[positions[0]]
+            else:
+                # Copy the runs between removed entries as slices
+                kept = array.array("I")
+                for previous, position in zip([-1] + positions, positions + [len(posting)]):
+                    kept.extend(posting[previous + 1:position])
+                posting = self.postings[gram] = kept
+            if not posting:
+                del self.postings[gram]
+
+    def overlap(self, grams: Set[str]) -> Dict[int, int]:
+        """Count shared trigrams per entry."""
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                continue
+            for heritage_id in posting:
+                counts[heritage_id] = counts.get(heritage_id, 0) + 1
+        return counts
+
+
+class TrigramIndex:
+    """
+    Trigram index for typo-tolerant search over titles (and optionally content).
+
+    Candidates are entries sharing trigrams with the query; they are scored by
+    the fraction of query trigrams they contain, with Jaccard similarity of
+    the title breaking ties. Entries remember their category so searches can
+    filter by it, and by a set of allowed entries, before the results are
+    cut to the limit.
+    """
+
+    def __init__(self, index_content: bool = TRIGRAM_INDEX_CONTENT):
+        self.index_content = index_content
+        self._lock = threading.Lock()
+        self._title = _TrigramField()
+        self._content = _TrigramField() if index_content else None
+        # entry id -> category id
+        self._categories: Dict[int, Optional[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._title.grams)
+
+    def add(
+        self,
+        heritage_id: int,
+        title: str,
+        content: Optional[str] = None,
+        category_id: Optional[int] = None
+    ):
+        """
+        Index a heritage entry. Re-adding an existing ID replaces it.
+
+        Args:
+            heritage_id: Heritage entry ID
+            title: Entry title
+            content: Entry content (ignored unless content indexing is enabled)
+            category_id: Entry category, for filtering
+        """
+        with self._lock:
+            if heritage_id in self._title.grams:
+                self._remove_many({heritage_id})
+            self._title.add(heritage_id, title)
+            if self._content is not None:
+                self._content.add(heritage_id, content)
+            self._categories[heritage_id] = category_id
+
+    def remove_many(self, heritage_ids: Iterable[int]):
+        """
+        Remove heritage entries.
+
+        Args:
+            heritage_ids: Heritage entry IDs to remove
+        """
+        with self._lock:
+            self._remove_many(set(heritage_ids))
+
+    def _remove_many(self, removed: Set[int]):
+        self._title.remove_many(removed)
+        if self._content is not None:
+            self._content.remove_many(removed)
+        for heritage_id in removed:
+            self._categories.pop(heritage_id, None)
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        min_similarity: float = TRIGRAM_MIN_SIMILARITY,
+        category_id: Optional[int] = None,
+        doc_ids: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Find entries similar to the query.
+
+        Args:
+            query: Search text, possibly misspelled
+            limit: Maximum number of results
+            min_similarity: Minimum fraction of query trigrams an entry must contain
+            category_id: Optional category filter
+            doc_ids: Optional set of entries to restrict results to
+
+        Returns:
+            List of (entry id, similarity) pairs, best first
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+
+        with self._lock:
+            scores: Dict[int, Tuple[float, float]] = {}
+
+            def wanted(heritage_id: int) -> bool:
+                if doc_ids is not None and heritage_id not in doc_ids:
+                    return False
+                return category_id is None or self._categories[heritage_id] == category_id
+
+            for heritage_id, common in self._title.overlap(grams).items():
+                similarity = common / len(grams)
+                if similarity >= min_similarity and wanted(heritage_id):
+                    jaccard = common / (len(grams) + self._title.size(heritage_id) - common)
+                    scores[heritage_id] = (similarity, jaccard)
+
+            if self._content is not None:
+                for heritage_id, common in self._content.overlap(grams).items():
+                    similarity = CONTENT_WEIGHT * common / len(grams)
+                    if (
+                        similarity >= min_similarity
+                        and similarity > scores.get(heritage_id, (0.0,))[0]
+                        and wanted(heritage_id)
+                    ):
+                        scores[heritage_id] = (similarity, 0.0)
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(heritage_id, score[0]) for heritage_id, score in top]
+
+    def build(self, db: Session):
+        """
+        Rebuild the index from the database.
+
+        Args:
+            db: Database session
+        """
+        columns = [models.HeritageEntry.id, models.HeritageEntry.title, models.HeritageEntry.category_id]
+        if self.index_content:
+            columns.append(models.HeritageContent.content)
+
+        query = db.query(*columns)
+        if self.index_content:
+            query = query.outerjoin(models.HeritageEntry.body)
+
+        with self._lock:
+            self._title = _TrigramField()
+            self._content = _TrigramField() if self.index_content else None
+            self._categories = {}
+            for row in query.yield_per(1000):
+                self._title.add(row[0], row[1])
+                if self._content is not None:
+                    self._content.add(row[0], row[3])
+                self._categories[row[0]] = row[2]
+
+        logger.info("Built trigram index with %d entries", len(self))
+
+
+# Global index instance shared by the heritage router
+trigram_index = TrigramIndex()
@@ -0,0 +1,144 @@
+import logging
+import os
+import secrets
+from typing import Iterator
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.models.sync import next_version, record_tombstones
+from app.core.cache import cache
+from app.core.events import heritage_events
+from app.core.index_sync import unindex_entries
+from app.core.page_snapshots import page_snapshots
+from app.core.search_index import search_index
+from app.core.security import get_password_hash
+from app.schemas import UserDeletionProgress
+
+logger = logging.getLogger(__name__)
+
+# User deletion configuration
+# These can be set as environment variables in production
+USER_DELETE_CHUNK_SIZE = int(os.getenv("USER_DELETE_CHUNK_SIZE", "1000"))
+SYSTEM_USERNAME = os.getenv("SYSTEM_USERNAME", "deleted-user")
+
+# What happens to the entries of a deleted user
+DELETION_POLICIES = ("reassign", "cascade")
+
+
+def get_system_user(db: Session) -> models.User:
+    """
+    Get the account that inherits entries of deleted users, creating it if needed.
+
+    It has a random password nobody knows, so it cannot be logged into.
+
+    Args:
+        db: Database session
+
+    Returns:
+        models.User: The system user
+    """
+    user = db.query(models.User).filter(models.User.username == SYSTEM_USERNAME).first()
+    if user is not None:
+        return user
+
+    try:
+        user = models.User(
+            username=SYSTEM_USERNAME,
+            email=f"{SYSTEM_USERNAME}@invalid",
+            hashed_password=get_password_hash(secrets.token_urlsafe(32)),
+            role="system"
+        )
+        db.add(user)
+        db.commit()
+    except IntegrityError:
+        # Another request created it first
+        db.rollback()
+        user = db.query(models.User).filter(models.User.username == SYSTEM_USERNAME).one()
+    return user
+
+
+def delete_user(
+    db: Session,
+    user_id: int,
+    policy: str = "reassign",
+    chunk_size: int = USER_DELETE_CHUNK_SIZE
+) -> Iterator[UserDeletionProgress]:
+    """
+    Delete a user, first reassigning or deleting the entries they created.
+
+    Entries are handled with set-based UPDATE/DELETE statements, chunk by
+    chunk, each chunk in its own transaction, so no entry is loaded into
+    memory and the write lock is released between chunks. Every chunk gets
+    one new sync version (reassign) or tombstone version (cascade), since
+    bulk statements bypass the ORM version hooks; entry content and refresh
+    tokens go with their rows through ON DELETE CASCADE. If interrupted,
+    calling it again carries on with the entries that are left.
+
+    Args:
+        db: Database session
+        user_id: User to delete
+        policy: "reassign" hands entries to the system user, "cascade" deletes them
+        chunk_size: Entries per transaction
+
+    Yields:
+        UserDeletionProgress: After each chunk, and once more when the user is gone
+    """
+    if policy not in DELETION_POLICIES:
+        raise ValueError(f"Unknown deletion policy: {policy}")
+
+    new_creator = get_system_user(db).id if policy == "reassign" else None
+    total = db.query(func.count(models.HeritageEntry.id)).filter(
+        models.HeritageEntry.created_by == user_id
+    ).scalar()
+    processed = 0
+
+    while True:
+        rows = db.query(models.HeritageEntry.id, models.HeritageEntry.category_id).filter(
+            models.HeritageEntry.created_by == user_id
+        ).order_by(models.HeritageEntry.id).limit(chunk_size).all()
+        if not rows:
+            break
+
+        heritage_ids = [heritage_id for heritage_id, _ in rows]
+        if policy == "reassign":
+            db.execute(
+                update(models.HeritageEntry)
+                .where(models.HeritageEntry.id.in_(heritage_ids))
+                .values(created_by=new_creator, version=next_version(db.connection()), updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            db.execute(
+                delete(models.HeritageEntry)
+                .where(models.HeritageEntry.id.in_(heritage_ids))
+                .execution_options(synchronize_session=False)
+            )
+            record_tombstones(db.connection(), "heritage", heritage_ids)
+        db.commit()
+
+        # Keep this worker's indexes and caches in step; other workers
+        # follow through the new versions and tombstones
+        if policy == "reassign":
+            search_index.reassign_creator(heritage_ids, new_creator)
+        else:
+            unindex_entries(heritage_ids)
+            for heritage_id in heritage_ids:
+                heritage_events.publish("deleted", {"id": heritage_id})
+        cache.invalidate("heritage")
+        page_snapshots.invalidate({category_id for _, category_id in rows})
+
+        processed += len(heritage_ids)
+        total = max(total, processed)  # Entries may have been added meanwhile
+        logger.info("Deleting user %s: %s of %s entries done (%s)", user_id, processed, total, policy)
+        yield UserDeletionProgress(user_id=user_id, policy=policy, total=total, processed=processed)
+
+    db.query(models.User).filter(models.User.id == user_id).delete(synchronize_session=False)
+    db.commit()
+
+    # Tokens of the deleted user must stop working in every worker
+    cache.delete("users", str(user_id))
+
+    yield UserDeletionProgress(user_id=user_id, policy=policy, total=total, processed=processed, done=True)
@@ -0,0 +1,235 @@
+import asyncio
+import heapq
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# View counting configuration
+# These can be set as environment variables in production
+VIEW_FLUSH_SECONDS = float(os.getenv("VIEW_FLUSH_SECONDS", "10"))
+TRENDING_BUCKET_SECONDS = int(os.getenv("TRENDING_BUCKET_SECONDS", "300"))
+TRENDING_BUCKETS = int(os.getenv("TRENDING_BUCKETS", "288"))  # 24 hours of 5-minute buckets
+TRENDING_HALF_LIFE_SECONDS = float(os.getenv("TRENDING_HALF_LIFE_SECONDS", "3600"))
+POPULAR_SIZE = int(os.getenv("POPULAR_SIZE", "100"))
+
+# id -> (decayed score, views)
+Scores = Dict[int, Tuple[float, int]]
+
+
+class ViewCounter:
+    """
+    Write-behind view counts plus a time-decayed trending score.
+
+    Views are counted in memory and added to heritage_entries.view_count
+    every VIEW_FLUSH_SECONDS in one transaction, so reading an entry never
+    writes to the database. The all-time top list is re-read after each
+    flush and includes other workers' views.
+
+    For trending, views also go into a ring of TRENDING_BUCKETS time buckets
+    of TRENDING_BUCKET_SECONDS each; a bucket's views count half as much
+    every TRENDING_HALF_LIFE_SECONDS, and buckets older than the ring are
+    forgotten. Scores of the finished buckets only change when a new bucket
+    starts, so they are summed once per bucket and the live bucket is added
+    per request. Trending only sees views made through this worker.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = TRENDING_BUCKET_SECONDS,
+        buckets: int = TRENDING_BUCKETS,
+        half_life_seconds: float = TRENDING_HALF_LIFE_SECONDS,
+        popular_size: int = POPULAR_SIZE,
+        interval: float = VIEW_FLUSH_SECONDS
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.half_life_seconds = half_life_seconds
+        self.popular_size = popular_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        # Views not yet written to the database
+        self._pending: Dict[int, int] = {}
+        # Ring buffer: slot -> views per entry, and which bucket number each slot holds
+        self._buckets: List[Dict[int, int]] = [{} for _ in range(buckets)]
+        self._bucket_numbers: List[int] = [-1] * buckets
+        # Summed scores of the finished buckets, for one current bucket number
+        self._finished: Optional[Tuple[int, Scores]] = None
+        # (entry id, all-time views), most viewed first
+        self._popular: List[Tuple[int, int]] = []
+
+        # Counters for monitoring
+        self.flushes = 0
+        self.flushed_views = 0
+
+    def _bucket(self, number: int) -> Dict[int, int]:
+        slot = number % len(self._buckets)
+        if self._bucket_numbers[slot] != number:
+            # The slot still holds a bucket that has left the window
+            self._bucket_numbers[slot] = number
+            self._buckets[slot] = {}
+        return self._buckets[slot]
+
+    def _bucket_number(self, now: Optional[float]) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def record(self, heritage_id: int, now: Optional[float] = None):
+        """
+        Count one view of an entry.
+
+        Args:
+            heritage_id: Heritage entry ID
+            now: Time of the view (defaults to now)
+        """
+        number = self._bucket_number(now)
+        with self._lock:
+            self._pending[heritage_id] = self._pending.get(heritage_id, 0) + 1
+            bucket = self._bucket(number)
+            bucket[heritage_id] = bucket.get(heritage_id, 0) + 1
+
+    def remove_many(self, heritage_ids: Iterable[int]):
+        """
+        Forget deleted entries.
+
+        Args:
+            heritage_ids: Heritage entry IDs
+        """
+        removed = set(heritage_ids)
+        with self._lock:
+            for heritage_id in removed:
+                self._pending.pop(heritage_id, None)
+                for bucket in self._buckets:
+                    bucket.pop(heritage_id, None)
+            self._popular = [item for item in self._popular if item[0] not in removed]
+            self._finished = None
+
+    def trending(self, limit: int, now: Optional[float] = None) -> List[Tuple[int, float, int]]:
+        """
+        Get the entries with the highest time-decayed view scores.
+
+        Args:
+            limit: Maximum number of entries
+            now: Time to score at (defaults to now)
+
+        Returns:
+            List of (entry id, score, views inside the window), highest score first
+        """
+        number = self._bucket_number(now)
+        with self._lock:
+            if self._finished is None or self._finished[0] != number:
+                self._finished = (number, self._score_finished(number))
+            finished = self._finished[1]
+            current = dict(self._bucket(number))
+
+        def candidates():
+            for heritage_id, (score, views) in finished.items():
+                extra = current.get(heritage_id, 0)
+                yield heritage_id, score + extra, views + extra
+            for heritage_id, views in current.items():
+                if heritage_id not in finished:
+                    yield heritage_id, float(views), views
+
+        return heapq.nlargest(limit, candidates(), key=lambda item: (item[1], -item[0]))
+
+    def _score_finished(self, number: int) -> Scores:
+        scores: Scores = {}
+        for slot, bucket_number in enumerate(self._bucket_numbers):
+            age = number - bucket_number
+            if not 0 < age < len(self._buckets):
+                continue
+            weight = 0.5 ** (age * self.bucket_seconds / self.half_life_seconds)
+            for heritage_id, views in self._buckets[slot].items():
+                score, total = scores.get(heritage_id, (0.0, 0))
+                scores[heritage_id] = (score + views * weight, total + views)
+        return scores
+
+    def popular(self, limit: int) -> List[Tuple[int, int]]:
+        """
+        Get the most viewed entries of all time, as of the last flush.
+
+        Args:
+            limit: Maximum number of entries (at most POPULAR_SIZE)
+
+        Returns:
+            List of (entry id, views), most viewed first
+        """
+        with self._lock:
+            return self._popular[:limit]
+
+    def flush(self) -> int:
+        """
+        Write pending views in one transaction and refresh the top list.
+
+        Views of entries deleted meanwhile update no rows and are dropped.
+        If the write fails they are kept for the next flush.
+
+        Returns:
+            int: Number of views written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if pending:
+            entries = models.HeritageEntry.__table__
+            try:
+                # Core executemany, so view counts never bump sync versions
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(entries).where(entries.c.id == bindparam("heritage_id")).values(
+                            view_count=entries.c.view_count + bindparam("views")
+                        ),
+                        [{"heritage_id": heritage_id, "views": views} for heritage_id, views in pending.items()]
+                    )
+            except Exception:
+                with self._lock:
+                    for heritage_id, views in pending.items():
+                        self._pending[heritage_id] = self._pending.get(heritage_id, 0) + views
+                raise
+            self.flushes += 1
+            self.flushed_views += sum(pending.values())
+
+        with engine.connect() as connection:
+            self._load_popular(connection)
+        return sum(pending.values())
+
+    def _load_popular(self, connection):
+        rows = connection.execute(
+            select(models.HeritageEntry.id, models.HeritageEntry.view_count).where(
+                models.HeritageEntry.view_count > 0
+            ).order_by(
+                models.HeritageEntry.view_count.desc(), models.HeritageEntry.id
+            ).limit(self.popular_size)
+        ).all()
+        with self._lock:
+            self._popular = [(heritage_id, views) for heritage_id, views in rows]
+
+    def build(self, db: Session):
+        """
+        Load the all-time top list.
+
+        Args:
+            db: Database session
+        """
+        self._load_popular(db.connection())
+        logger.info("Loaded %d most viewed entries", len(self._popular))
+
+    async def run(self):
+        """Flush pending views periodically until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("Failed to write view counts")
+
+
+# Global counter instance shared by the heritage router
+view_counter = ViewCounter()
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Write coalescing configuration
+# These can be set as environment variables in production
+WRITE_COALESCING = os.getenv("WRITE_COALESCING", "false").lower() in ("1", "true", "yes")
+WRITE_BATCH_MAX_ROWS = int(os.getenv("WRITE_BATCH_MAX_ROWS", "100"))
+WRITE_BATCH_MAX_DELAY_MS = float(os.getenv("WRITE_BATCH_MAX_DELAY_MS", "5"))
+
+T = TypeVar("T")
+
+# A unit of work: adds rows to the session and returns a plain result (e.g. the new ID)
+Work = Callable[[Session], T]
+
+
+class WriteCoalescer:
+    """
+    Group commit for concurrent inserts.
+
+    Callers queue small units of work; a single writer thread collects them
+    for up to WRITE_BATCH_MAX_DELAY_MS or WRITE_BATCH_MAX_ROWS units, runs
+    them in one transaction and commits once, so many requests share one
+    fsync and never compete for SQLite's write lock within this process.
+
+    Each unit is flushed on its own, so a failing unit (e.g. a unique
+    constraint violation) is attributed to its caller; the transaction is
+    then rolled back and the remaining units are re-run without it.
+    Units must therefore only touch the session they are given.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = WRITE_COALESCING,
+        max_rows: int = WRITE_BATCH_MAX_ROWS,
+        max_delay_ms: float = WRITE_BATCH_MAX_DELAY_MS
+    ):
+        self.enabled = enabled
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.Queue[Optional[Tuple[Work, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_batch_size = 0
+
+        # Counters for monitoring
+        self.batches = 0
+        self.committed = 0
+        self.failed = 0
+
+    async def run(self, work: Work, db: Session) -> T:
+        """
+        Run a unit of work and commit it, batched with concurrent callers.
+
+        With coalescing disabled the unit runs in the caller's session and
+        is committed immediately.
+
+        Args:
+            work: Function adding rows to a session and returning a plain result
+            db: The caller's session (used when coalescing is disabled)
+
+        Returns:
+            The unit's result, once its transaction has committed
+
+        Raises:
+            Exception: Whatever the unit (or the commit) raised
+        """
+        if not self.enabled:
+            result = work(db)
+            db.commit()
+            return result
+
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((work, future))
+        return await asyncio.wrap_future(future)
+
+    def stop(self):
+        """Flush queued work and stop the writer thread."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="write-coalescer", daemon=True)
+                self._thread.start()
+
+    def _writer(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            # Only wait for company when writes have recently been concurrent;
+            # a lone writer should not pay the delay on every commit
+            deadline = time.monotonic() + (self.max_delay if self._last_batch_size > 1 else 0)
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._last_batch_size = len(batch)
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception("Write batch failed")
+
+    def _flush(self, batch: List[Tuple[Work, Future]]):
+        # Skip units whose callers went away before we got to them
+        pending = [(work, future) for work, future in batch if future.set_running_or_notify_cancel()]
+
+        while pending:
+            results = []
+            failed_index = None
+            db = SessionLocal()
+            try:
+                for index, (work, future) in enumerate(pending):
+                    try:
+                        results.append(work(db))
+                        db.flush()
+                    except Exception as exc:
+                        failed_index = index
+                        future.set_exception(exc)
+                        self.failed += 1
+                        break
+
+                if failed_index is None:
+                    db.commit()
+            except Exception as exc:
+                # The commit itself failed: nothing in the batch was written
+                for _, future in pending:
+                    future.set_exception(exc)
+                self.failed += len(pending)
+                return
+            finally:
+                db.close()
+
+            if failed_index is None:
+                for (_, future), result in zip(pending, results):
+                    future.set_result(result)
+                self.batches += 1
+                self.committed += len(pending)
+                return
+
+            # Roll back and re-run everyone else without the failed unit
+            del pending[failed_index]
+
+
+# Global coalescer used by the routers for inserts
+write_coalescer = WriteCoalescer()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -14,12 +14,85 @@ engine = create_engine(
 )
 
 
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def enable_foreign_keys(dbapi_connection, connection_record):
+        """SQLite only enforces foreign keys (and ON DELETE) when asked to, per connection."""
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    @event.listens_for(engine, "connect")
+    def register_decompress_text(dbapi_connection, connection_record):
+        """Let SQL filters read compressed columns (see app.core.compression.decompressed)."""
+        from app.core.compression import content_codec  # Imported here to avoid a circular import
+
+        dbapi_connection.create_function("decompress_text", 1, content_codec.decompress, deterministic=True)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 Base = declarative_base()
 
 
+def add_missing_columns():
+    """
+    Add model columns and indexes that are missing from existing tables.
+
+    create_all() only creates missing tables, so this lets upgrades add new
+    nullable columns without a separate migration tool.
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                connection.execute(text(ddl))
+
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+
+def move_heritage_content():
+    """
+    Move content from heritage_entries into the heritage_contents table.
+
+    Databases created before content got its own table keep it in the entry
+    rows; copy it over and drop the old columns so entry rows stay narrow.
+    Run VACUUM afterwards to give the freed pages back to the filesystem.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table("heritage_entries"):
+        return
+
+    existing_columns = {column["name"] for column in inspector.get_columns("heritage_entries")}
+    if "content" not in existing_columns:
+        return
+
+    normalized = "content_normalized" if "content_normalized" in existing_columns else "NULL"
+
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO heritage_contents (heritage_id, content, content_normalized) "
+            f"SELECT id, content, {normalized} FROM heritage_entries "
+            "WHERE id NOT IN (SELECT heritage_id FROM heritage_contents)"
+        ))
+        connection.execute(text("ALTER TABLE heritage_entries DROP COLUMN content"))
+        if normalized != "NULL":
+            connection.execute(text("ALTER TABLE heritage_entries DROP COLUMN content_normalized"))
+
+
 def get_db():
     """
     Provides a database session for each request.
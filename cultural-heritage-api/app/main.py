@@ -1,12 +1,78 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 
-from app.database import engine, Base
-from app.routers import auth, users, categories, heritage
+from app.database import engine, Base, SessionLocal, add_missing_columns, move_heritage_content
+from app.models.heritage import backfill_search_columns
+from app.routers import auth, users, categories, heritage, exports
+from app.core.search_index import search_index
+from app.core.prefix_index import prefix_index
+from app.core.trigram_index import trigram_index
+from app.core.geo_index import geo_index
+from app.core.period_index import period_index
+from app.core.view_counter import view_counter
+from app.core.compression import content_codec
+from app.core.index_sync import index_follower, HERITAGE_WORKERS
+from app.core.write_coalescer import write_coalescer
+
+logger = logging.getLogger(__name__)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+add_missing_columns()
+move_heritage_content()
+backfill_search_columns()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build in-memory structures on startup and persist them on shutdown.
+    """
+    db = SessionLocal()
+    try:
+        # Dictionaries must be known before any compressed content is read
+        content_codec.load_dictionaries(db)
+
+        # With several workers, catch up on other workers' writes from here on
+        if HERITAGE_WORKERS > 1:
+            index_follower.start_from(db)
+
+        # Load the saved search index, rebuilding it if the database moved on
+        search_index.load_or_build(db)
+        prefix_index.build(db)
+        trigram_index.build(db)
+        geo_index.build(db)
+        period_index.build(db)
+        view_counter.build(db)
+    finally:
+        db.close()
+
+    follower_task = asyncio.create_task(index_follower.run()) if HERITAGE_WORKERS > 1 else None
+    view_task = asyncio.create_task(view_counter.run())
+
+    yield
+
+    if follower_task is not None:
+        follower_task.cancel()
+    view_task.cancel()
+
+    # Commit anything still queued before the process exits
+    write_coalescer.stop()
+
+    # Write views counted since the last flush; losing them must not stop
+    # the search index from being saved
+    try:
+        view_counter.flush()
+    except Exception:
+        logger.exception("Failed to write view counts on shutdown")
+
+    search_index.save()
+
 
 # Initialize FastAPI app with metadata for documentation
 app = FastAPI(
@@ -14,7 +80,8 @@ app = FastAPI(
     description="A REST API for preserving and serving cultural heritage content including history, traditions, leaders, places, and sayings.",
     version="1.0.0",
     docs_url="/docs",  
-    redoc_url="/redoc" 
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS middleware to allow frontend connections
@@ -53,6 +120,12 @@ app.include_router(
     tags=["Heritage Entries"]
 )
 
+app.include_router(
+    exports,
+    prefix="/exports",
+    tags=["Exports"]
+)
+
 
 @app.get("/")
 async def root():
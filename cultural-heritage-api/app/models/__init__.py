@@ -1,6 +1,14 @@
 from .user import User
 from .category import Category
-from .heritage import HeritageEntry
+from .heritage import HeritageEntry, HeritageContent
+from .sync import SyncCounter, Tombstone
+from .compression import CompressionDictionary
+from .token import RefreshToken
+from .related import RelatedEntry, RelatedRun
 
 
-__all__ = ["User", "Category", "HeritageEntry"]
+__all__ = [
+    "User", "Category", "HeritageEntry", "HeritageContent", "SyncCounter", "Tombstone",
+    "CompressionDictionary", "RefreshToken", "RelatedEntry",
+    "RelatedRun"
+]
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, DateTime, event
+from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.sync import next_version, record_tombstones
 
 class Category(Base):
    
@@ -10,5 +12,23 @@ class Category(Base):
     name = Column(String, unique=True, index=True, nullable=False)
     description = Column(Text, nullable=True)
 
+    # Change tracking for delta sync (see GET /heritage/changes)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, index=True, nullable=False, server_default="0")
+
     def __repr__(self):
         return f"<Category(id={self.id}, name='{self.name}')>"
+
+
+@event.listens_for(Category, "before_insert")
+@event.listens_for(Category, "before_update")
+def bump_category_version(mapper, connection, target):
+    """Stamp every write with a new change version."""
+    target.version = next_version(connection)
+    target.updated_at = func.now()
+
+
+@event.listens_for(Category, "after_delete")
+def record_category_tombstone(mapper, connection, target):
+    """Leave a tombstone so sync clients learn about the delete."""
+    record_tombstones(connection, "category", [target.id])
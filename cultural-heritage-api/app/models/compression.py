@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+class CompressionDictionary(Base):
+   
+    __tablename__ = "compression_dictionaries"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    algorithm = Column(String, nullable=False)  # "zlib" or "zstd"
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CompressionDictionary(id={self.id}, algorithm='{self.algorithm}', size={len(self.data or b'')})>"
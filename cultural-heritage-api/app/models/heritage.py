@@ -1,23 +1,178 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from typing import Callable, Optional
+
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Index, event, update
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
-from app.database import Base
+from app.database import Base, SessionLocal
+from app.core.text import normalize_text
+from app.core.compression import CompressedText
+from app.models.sync import next_version, record_tombstones
 
 class HeritageEntry(Base):
    
     __tablename__ = "heritage_entries"
+    __table_args__ = (
+        # Period filters that are too broad for app.core.period_index use this
+        Index("ix_heritage_entries_period", "start_year", "end_year"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String, index=True, nullable=False)
-    content = Column(Text, nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Deleting a user must first reassign or delete their entries (app.core.user_deletion)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="RESTRICT"), index=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # Change tracking for delta sync (see GET /heritage/changes)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    version = Column(Integer, index=True, nullable=False, server_default="0")
+
+    # Search form of the title (NFKC, case-folded, diacritics stripped)
+    # Populated on write; existing rows at startup (app.models.heritage.backfill_search_columns)
+    title_normalized = Column(String, index=True, nullable=True)
+
+    # Optional location (WGS84 degrees), mainly for places; see app.core.geo_index
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+
+    # Optional historical period in years (negative for BCE); end_year is
+    # set to start_year for a single year, see app.core.period_index
+    start_year = Column(Integer, nullable=True)
+    end_year = Column(Integer, nullable=True)
+
+    # All-time views, added in batches by app.core.view_counter; not a
+    # content change, so it is written without bumping the sync version
+    view_count = Column(Integer, index=True, nullable=False, server_default="0")
+
     # Relationships for easier querying
     category = relationship("Category")
     creator = relationship("User")
+    # Content lives in its own table so listing, counting and filtering
+    # scan narrow rows; load it with selectinload() where it is returned
+    body = relationship(
+        "HeritageContent", uselist=False, back_populates="entry", cascade="all, delete-orphan"
+    )
+
+    @property
+    def content(self) -> Optional[str]:
+        return self.body.content if self.body is not None else None
+
+    @content.setter
+    def content(self, value: str):
+        if self.body is None:
+            self.body = HeritageContent(content=value)
+        else:
+            self.body.content = value
+        # Content-only edits must still bump the entry's sync version
+        self.updated_at = func.now()
 
     def __repr__(self):
         return f"<HeritageEntry(id={self.id}, title='{self.title}', category_id={self.category_id})>"
+
+
+class HeritageContent(Base):
+   
+    __tablename__ = "heritage_contents"
+
+    heritage_id = Column(Integer, ForeignKey("heritage_entries.id", ondelete="CASCADE"), primary_key=True)
+    # Large values may be stored compressed (CONTENT_COMPRESSION)
+    content = Column(CompressedText, nullable=False)
+    # Search form of the content; only needed by SQL filters, which read it
+    # through decompressed() since it is compressed like the content
+    content_normalized = deferred(Column(CompressedText, nullable=True))
+
+    entry = relationship("HeritageEntry", back_populates="body")
+
+    def __repr__(self):
+        return f"<HeritageContent(heritage_id={self.heritage_id})>"
+
+
+@event.listens_for(HeritageEntry, "before_insert")
+@event.listens_for(HeritageEntry, "before_update")
+def populate_normalized_title(mapper, connection, target):
+    """Keep the normalized search title in sync with the title."""
+    target.title_normalized = normalize_text(target.title)
+
+
+@event.listens_for(HeritageContent, "before_insert")
+@event.listens_for(HeritageContent, "before_update")
+def populate_normalized_content(mapper, connection, target):
+    """Keep the normalized search content in sync with the content."""
+    target.content_normalized = normalize_text(target.content)
+
+
+@event.listens_for(HeritageEntry, "before_insert")
+@event.listens_for(HeritageEntry, "before_update")
+def bump_heritage_version(mapper, connection, target):
+    """Stamp every write with a new change version."""
+    target.version = next_version(connection)
+    target.updated_at = func.now()
+
+
+@event.listens_for(HeritageEntry, "after_delete")
+def record_heritage_tombstone(mapper, connection, target):
+    """Leave a tombstone so sync clients learn about the delete."""
+    record_tombstones(connection, "heritage", [target.id])
+
+
+def backfill_search_columns(
+    batch_size: int = 1000,
+    missing_only: bool = True,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> int:
+    """
+    Populate the normalized search columns of existing heritage entries.
+
+    Substring search only looks at the normalized columns, so entries
+    written before they existed are invisible to it until this has run;
+    startup calls it for rows that were never normalized. Rows are
+    processed in primary-key order in batches, each in its own transaction,
+    through bulk updates that do not bump sync versions.
+
+    Args:
+        batch_size: Entries per transaction
+        missing_only: Only fill rows whose normalized title is missing
+        progress: Called with (entries updated so far, last ID) after each batch
+
+    Returns:
+        int: Number of entries updated
+    """
+    db = SessionLocal()
+    last_id = 0
+    updated = 0
+
+    try:
+        while True:
+            query = db.query(
+                HeritageEntry.id,
+                HeritageEntry.title,
+                HeritageContent.content
+            ).outerjoin(HeritageEntry.body).filter(HeritageEntry.id > last_id)
+            if missing_only:
+                query = query.filter(HeritageEntry.title_normalized.is_(None))
+
+            rows = query.order_by(HeritageEntry.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            db.execute(update(HeritageEntry), [
+                {"id": heritage_id, "title_normalized": normalize_text(title)}
+                for heritage_id, title, _ in rows
+            ])
+            contents = [
+                {"heritage_id": heritage_id, "content_normalized": normalize_text(content)}
+                for heritage_id, _, content in rows if content is not None
+            ]
+            if contents:
+                db.execute(update(HeritageContent), contents)
+            db.commit()
+
+            last_id = rows[-1][0]
+            updated += len(rows)
+            if progress is not None:
+                progress(updated, last_id)
+    finally:
+        db.close()
+
+    return updated
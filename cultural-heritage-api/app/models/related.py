@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey
+
+from app.database import Base
+
+class RelatedEntry(Base):
+   
+    __tablename__ = "related_entries"
+
+    # Top-k most similar entries per entry, precomputed by
+    # `python -m app.cli related` (see app.core.related); rank 0 is the closest
+    heritage_id = Column(Integer, ForeignKey("heritage_entries.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_id = Column(Integer, ForeignKey("heritage_entries.id", ondelete="CASCADE"), index=True, nullable=False)
+    score = Column(Float, nullable=False)
+    # Version of heritage_id when its list was computed
+    version = Column(Integer, index=True, nullable=False)
+
+    def __repr__(self):
+        return f"<RelatedEntry(heritage_id={self.heritage_id}, rank={self.rank}, related_id={self.related_id})>"
+
+
+class RelatedRun(Base):
+   
+    __tablename__ = "related_runs"
+
+    # Single row: newest entry version covered by the last run that
+    # finished; incremental refreshes recompute entries with newer versions
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<RelatedRun(version={self.version})>"
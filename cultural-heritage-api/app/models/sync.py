@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Integer, String, DateTime, select, update, insert
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+class SyncCounter(Base):
+   
+    __tablename__ = "sync_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SyncCounter(value={self.value})>"
+
+
+class Tombstone(Base):
+   
+    __tablename__ = "tombstones"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # "heritage" or "category"
+    entity_id = Column(Integer, nullable=False)
+    version = Column(Integer, index=True, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<Tombstone(entity='{self.entity}', entity_id={self.entity_id}, version={self.version})>"
+
+
+def next_version(connection) -> int:
+    """
+    Allocate the next change version inside the current transaction.
+
+    The counter row is updated before it is read, so the write lock is held
+    until commit and concurrent writers get distinct, increasing versions.
+
+    Args:
+        connection: Connection of the flushing session
+
+    Returns:
+        int: New version number
+    """
+    result = connection.execute(
+        update(SyncCounter).where(SyncCounter.id == 1).values(value=SyncCounter.value + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(SyncCounter).values(id=1, value=1))
+    return connection.execute(select(SyncCounter.value).where(SyncCounter.id == 1)).scalar_one()
+
+
+def record_tombstones(connection, entity: str, entity_ids):
+    """
+    Record deletions so sync clients can remove their copies.
+
+    Args:
+        connection: Connection of the deleting transaction
+        entity: Entity type ("heritage" or "category")
+        entity_ids: IDs of the deleted rows
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    version = next_version(connection)
+    connection.execute(insert(Tombstone), [
+        {"entity": entity, "entity_id": entity_id, "version": version}
+        for entity_id in entity_ids
+    ])
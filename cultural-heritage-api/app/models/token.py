@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, LargeBinary
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+class RefreshToken(Base):
+   
+    __tablename__ = "refresh_tokens"
+
+    # Tokens are "<id>.<secret>": lookups go by primary key and only an
+    # HMAC of the secret is stored
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    secret_hash = Column(LargeBinary(32), nullable=False)
+    # First token of a rotation chain; reuse of a rotated token revokes the whole family
+    family_id = Column(Integer, index=True, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id={self.family_id})>"
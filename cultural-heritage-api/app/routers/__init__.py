@@ -2,6 +2,7 @@ from .auth import router as auth
 from .users import router as users
 from .categories import router as categories
 from .heritage import router as heritage
+from .exports import router as exports
 
 # Export all routers
-__all__ = ["auth", "users", "categories", "heritage"]
+__all__ = ["auth", "users", "categories", "heritage", "exports"]
@@ -1,4 +1,6 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
@@ -9,15 +11,93 @@ from app.core.security import (
     verify_password,
     get_password_hash,
     create_access_token,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    create_refresh_secret,
+    refresh_secret_matches,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    REFRESH_TOKEN_EXPIRE_DAYS
 )
-from app.schemas import UserCreate, UserResponse, UserLogin, Token
+from app.schemas import UserCreate, UserResponse, UserLogin, Token, RefreshTokenRequest
 from app.utils.dependencies import get_current_user
+from app.core.write_coalescer import write_coalescer
 
 # Create the authentication router
 router = APIRouter()
 
 
+def _issue_tokens(db: Session, user_id: int, family_id: Optional[int] = None) -> dict:
+    """
+    Create an access token and a new refresh token for a user.
+
+    Args:
+        db: Database session (committed here)
+        user_id: User to issue tokens for
+        family_id: Rotation chain the refresh token continues, if any
+
+    Returns:
+        dict: Token response data
+    """
+    now = datetime.utcnow()
+
+    # Expired tokens are useless; drop them while we are here
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.user_id == user_id,
+        models.RefreshToken.expires_at < now
+    ).delete(synchronize_session=False)
+
+    secret, secret_hash = create_refresh_secret()
+    refresh_token = models.RefreshToken(
+        user_id=user_id,
+        secret_hash=secret_hash,
+        family_id=family_id,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(refresh_token)
+    db.flush()
+    if refresh_token.family_id is None:
+        refresh_token.family_id = refresh_token.id
+    db.commit()
+
+    access_token = create_access_token(
+        data={"sub": str(user_id)},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": f"{refresh_token.id}.{secret}",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
+def _find_refresh_token(token: str, db: Session) -> models.RefreshToken:
+    """
+    Look up a presented refresh token by ID and check its secret.
+
+    Raises:
+        HTTPException: If the token is malformed or unknown
+    """
+    token_id, _, secret = token.partition(".")
+    stored = db.get(models.RefreshToken, int(token_id)) if token_id.isdigit() else None
+
+    if stored is None or not refresh_secret_matches(secret, stored.secret_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return stored
+
+
+def _revoke_family(db: Session, family_id: int):
+    """Revoke every still-active refresh token in a rotation chain."""
+    db.query(models.RefreshToken).filter(
+        models.RefreshToken.family_id == family_id,
+        models.RefreshToken.revoked_at.is_(None)
+    ).update({models.RefreshToken.revoked_at: datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+
 @router.post("/register", response_model=UserResponse)
 async def register_user(user: UserCreate, db: Session = Depends(get_db)):
    
@@ -32,18 +112,30 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     # Hash the password
     hashed_password = get_password_hash(user.password)
 
-    # Create new user
-    new_user = models.User(
-        username=user.username,
-        email=user.email,
-        hashed_password=hashed_password,
-        role="admin"  # default role for testing
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    def insert_user(session: Session) -> int:
+        # Create new user
+        new_user = models.User(
+            username=user.username,
+            email=user.email,
+            hashed_password=hashed_password,
+            role="admin"  # default role for testing
+        )
+        session.add(new_user)
+        session.flush()
+        return new_user.id
+
+    # Save to database (group-committed with concurrent registrations if enabled)
+    try:
+        user_id = await write_coalescer.run(insert_user, db)
+    except IntegrityError:
+        # Lost a race with a concurrent registration
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or email already exists"
+        )
 
-    return new_user
+    return db.get(models.User, user_id)
 
 
 @router.post("/login", response_model=Token)
@@ -63,14 +155,8 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
-
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Create access and refresh tokens
+    return _issue_tokens(db, user.id)
 
 
 
@@ -80,7 +166,7 @@ async def login_with_json(user_credentials: UserLogin, db: Session = Depends(get
     Authenticate user and return JWT access token using JSON body.
 
     - Accepts JSON with username & password
-    - Returns JWT token for authenticated requests
+    - Returns JWT token for authenticated requests, plus a refresh token
     """
     # Find user by username
     user = db.query(models.User).filter(models.User.username == user_credentials.username).first()
@@ -93,14 +179,62 @@ async def login_with_json(user_credentials: UserLogin, db: Session = Depends(get
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": str(user.id)},
-        expires_delta=access_token_expires
-    )
+    # Create access and refresh tokens
+    return _issue_tokens(db, user.id)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    - Each refresh token works once; the response carries its replacement
+    - Presenting an already used token revokes the whole chain, since it
+      means the token was copied
+    """
+    stored = _find_refresh_token(request.refresh_token, db)
+    now = datetime.utcnow()
+
+    if stored.revoked_at is not None:
+        _revoke_family(db, stored.family_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if stored.expires_at < now or db.get(models.User, stored.user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Rotate: only one of two concurrent refreshes with the same token wins
+    rotated = db.query(models.RefreshToken).filter(
+        models.RefreshToken.id == stored.id,
+        models.RefreshToken.revoked_at.is_(None)
+    ).update({models.RefreshToken.revoked_at: now}, synchronize_session=False)
+    if not rotated:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return _issue_tokens(db, stored.user_id, family_id=stored.family_id)
+
+
+@router.post("/logout")
+async def logout(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """
+    Revoke a refresh token and every token rotated from the same login.
+    """
+    stored = _find_refresh_token(request.refresh_token, db)
+    _revoke_family(db, stored.family_id)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"message": "Logged out"}
 
 
 @router.get("/me", response_model=UserResponse)
@@ -1,4 +1,5 @@
 from typing import List
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException, status
 
@@ -6,6 +7,10 @@ from app.database import get_db
 from app import models
 from app.schemas import CategoryCreate, CategoryResponse
 from app.utils.dependencies import get_current_admin_user
+from app.core.cache import cache
+
+# Columns of a category response, fetched as plain rows
+_CATEGORY_COLUMNS = (models.Category.id, models.Category.name, models.Category.description)
 
 # Create the categories router
 router = APIRouter()
@@ -13,8 +18,11 @@ router = APIRouter()
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(db: Session = Depends(get_db)):
   
-    categories = db.query(models.Category).all()
-    return categories
+    # Cached as plain data so every worker can share it
+    return cache.get_or_set("categories", "all", lambda: [
+        CategoryResponse.model_validate(row).model_dump()
+        for row in db.execute(select(*_CATEGORY_COLUMNS)).all()
+    ])
 
 @router.post("/", response_model=CategoryResponse)
 async def create_category(
@@ -45,13 +53,20 @@ async def create_category(
     db.commit()
     db.refresh(db_category)
 
+    # Make the new category visible to every worker
+    cache.invalidate("categories")
+
     return db_category
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(category_id: int, db: Session = Depends(get_db)):
    
-    category = db.query(models.Category).filter(
-        models.Category.id == category_id
+    cached = cache.get("categories", str(category_id))
+    if cached is not None:
+        return cached
+
+    category = db.execute(
+        select(*_CATEGORY_COLUMNS).where(models.Category.id == category_id)
     ).first()
 
     if not category:
@@ -60,4 +75,6 @@ async def get_category(category_id: int, db: Session = Depends(get_db)):
             detail="Category not found"
         )
 
-    return category
+    response = CategoryResponse.model_validate(category).model_dump()
+    cache.set("categories", str(category_id), response)
+    return response
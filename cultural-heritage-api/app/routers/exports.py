@@ -0,0 +1,93 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app import models
+from app.schemas import AnalyticsSnapshot
+from app.utils.dependencies import get_current_admin_user
+from app.core.analytics_export import (
+    PUBLIC_TABLES, export_lock, export_snapshot, latest_snapshot, require_pyarrow, table_path
+)
+
+# Create the exports router
+router = APIRouter()
+
+
+def _run_export() -> AnalyticsSnapshot:
+    """Write a snapshot unless another export is already running."""
+    if not export_lock.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="An export is already running"
+        )
+    try:
+        return export_snapshot()
+    finally:
+        export_lock.release()
+
+
+def _table_file(table: str) -> FileResponse:
+    """Serve a table of the latest snapshot as a Parquet download."""
+    snapshot = latest_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No analytics snapshot has been exported yet"
+        )
+    return FileResponse(
+        table_path(snapshot, table),
+        media_type="application/vnd.apache.parquet",
+        filename=f"{table}-{snapshot.snapshot}.parquet",
+        headers={"X-Snapshot": snapshot.snapshot}
+    )
+
+@router.post("/analytics", response_model=AnalyticsSnapshot)
+async def export_analytics_snapshot(current_user: models.User = Depends(get_current_admin_user)):
+    """
+    Write a new columnar snapshot (admin only).
+
+    Entries, contents, categories and users are streamed from the database
+    in batches into compressed Parquet files. Needs pyarrow on the server.
+    """
+    try:
+        require_pyarrow()
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    # Exports read the whole database; keep the event loop free meanwhile
+    return await asyncio.to_thread(_run_export)
+
+@router.get("/analytics", response_model=AnalyticsSnapshot)
+async def get_analytics_snapshot():
+    """
+    Get the manifest of the latest snapshot: when it was taken and its tables.
+    """
+    snapshot = latest_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No analytics snapshot has been exported yet"
+        )
+    return snapshot
+
+@router.get("/analytics/users.parquet")
+async def download_analytics_users(current_user: models.User = Depends(get_current_admin_user)):
+    """
+    Download the users table of the latest snapshot (admin only).
+    """
+    return _table_file("users")
+
+@router.get("/analytics/{table}.parquet")
+async def download_analytics_table(table: str):
+    """
+    Download a table of the latest snapshot as Parquet.
+
+    Tables are heritage_entries, heritage_contents and categories; entry
+    content is in heritage_contents, keyed by heritage_id.
+    """
+    if table not in PUBLIC_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown snapshot table"
+        )
+    return _table_file(table)
@@ -1,100 +1,880 @@
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import heapq
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import or_, func, select, Select
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Header
+from fastapi.responses import Response, StreamingResponse
 from math import ceil
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app import models
 from app.schemas import (
-    HeritageEntryCreate, HeritageEntryResponse, HeritageEntryDetailResponse,
-    PaginatedResponse, HeritageSearchParams
+    HeritageEntryCreate, HeritageEntryUpdate, HeritageEntryResponse, HeritageEntryDetailResponse,
+    PaginatedResponse, HeritageSearchParams,
+    HeritageBatchRequest, HeritageBatchResponse,
+    FacetCount, HeritageFacets, HeritageSuggestion, HeritageRelated, HeritageViews,
+    HeritagePlace, HeritagePlacesResponse,
+    SyncHeritageEntry, SyncCategory, SyncTombstone, SyncCheckpoint
 )
 from app.utils.dependencies import get_current_admin_user
+from app.core.search_index import search_index
+from app.core.prefix_index import prefix_index
+from app.core.trigram_index import trigram_index
+from app.core.geo_index import geo_index
+from app.core.period_index import period_index
+from app.core.view_counter import view_counter, POPULAR_SIZE
+from app.core.text import normalize_text
+from app.core.compression import decompressed
+from app.core.events import heritage_events, Subscription, HEARTBEAT_SECONDS
+from app.core.content_reader import ContentReader
+from app.core.cache import cache
+from app.core.index_sync import index_entry, unindex_entries
+from app.core.write_coalescer import write_coalescer
+from app.core.page_snapshots import page_snapshots
 
 # Create the heritage router
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
-async def get_heritage_entries(
-    page: int = Query(1, ge=1, description="Page number (1-based)"),
-    size: int = Query(10, ge=1, le=100, description="Items per page"),
-    search: str = Query(None, description="Search keyword in title or content"),
-    category_id: int = Query(None, description="Filter by category ID"),
-    db: Session = Depends(get_db)
-):
-    
-    # Build base query
-    query = db.query(
-        models.HeritageEntry,
-        models.Category.name.label('category_name'),
-        models.User.username.label('creator_username')
+# Limits for batch lookups (query strings have practical length limits)
+MAX_BATCH_GET_IDS = 100
+MAX_BATCH_IDS = 1000
+
+# Upper bound on fuzzy search candidates (kept below SQLite's bound-parameter limit)
+MAX_FUZZY_MATCHES = 500
+
+# Period matches up to this many are filtered by ID, broader ones by column
+MAX_PERIOD_IDS = 500
+
+# Characters of content per listing item; the full text is at GET /heritage/{id}/content
+LISTING_PREVIEW_CHARS = 500
+
+# Default and maximum number of changes per sync response
+DEFAULT_SYNC_LIMIT = 1000
+MAX_SYNC_LIMIT = 10000
+
+# How long EventSource clients wait before reconnecting
+SSE_RETRY_MS = 3000
+
+# Default and maximum number of places per map query
+DEFAULT_PLACES_LIMIT = 2000
+MAX_PLACES_LIMIT = 20000
+MAX_NEAREST = 100
+
+# Entry fields that are NOT NULL, so updates may not clear them
+REQUIRED_ENTRY_FIELDS = ("title", "content", "category_id")
+
+# Facets that can be requested on the listing endpoint
+FACET_NAMES = {"category", "creator"}
+
+
+def _parse_facets(facets: Optional[str]) -> Set[str]:
+    """
+    Parse the comma-separated facets query parameter.
+
+    Raises:
+        HTTPException: If an unknown facet is requested
+    """
+    requested = {name.strip() for name in (facets or "").split(",") if name.strip()}
+    unknown = requested - FACET_NAMES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown facets: {', '.join(sorted(unknown))}"
+        )
+    return requested
+
+
+def _facet_list(counts: Dict[int, int], names: Dict[int, str]) -> List[FacetCount]:
+    """Convert facet counts to a list ordered by count, largest first."""
+    return [
+        FacetCount(id=facet_id, name=names.get(facet_id), count=count)
+        for facet_id, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def _sql_facets(
+    db: Session,
+    requested_facets: Set[str],
+    search_filters: list,
+    category_filters: list,
+    category_id: Optional[int]
+) -> Tuple[Optional[HeritageFacets], Optional[int]]:
+    """
+    Compute facet counts and the total with one GROUP BY over the listing joins and filters.
+
+    Matches are counted per (category, creator) pair and summed per facet
+    here, so the table is scanned once whichever facets are requested.
+    Category counts ignore the category filter so every option can show its
+    count; creator counts and the total apply all filters.
+
+    Returns:
+        Tuple of (facets or None, total matches or None)
+    """
+    if not requested_facets:
+        return None, None
+
+    # Without the category facet the category filter can narrow the scan
+    filters = search_filters if "category" in requested_facets else search_filters + category_filters
+    rows = db.query(
+        models.Category.id,
+        models.Category.name,
+        models.User.id,
+        models.User.username,
+        func.count(models.HeritageEntry.id)
+    ).select_from(models.HeritageEntry).join(
+        models.Category, models.HeritageEntry.category_id == models.Category.id
     ).join(
+        models.User, models.HeritageEntry.created_by == models.User.id
+    ).filter(*filters).group_by(
+        models.Category.id, models.Category.name, models.User.id, models.User.username
+    ).all()
+
+    category_counts: Dict[int, int] = {}
+    creator_counts: Dict[int, int] = {}
+    category_names: Dict[int, str] = {}
+    creator_names: Dict[int, str] = {}
+    total = 0
+    for facet_category, category_name, facet_creator, username, count in rows:
+        category_counts[facet_category] = category_counts.get(facet_category, 0) + count
+        category_names[facet_category] = category_name
+        if category_id is None or facet_category == category_id:
+            creator_counts[facet_creator] = creator_counts.get(facet_creator, 0) + count
+            creator_names[facet_creator] = username
+            total += count
+
+    facet_response = HeritageFacets()
+    if "category" in requested_facets:
+        facet_response.categories = _facet_list(category_counts, category_names)
+    if "creator" in requested_facets:
+        facet_response.creators = _facet_list(creator_counts, creator_names)
+
+    return facet_response, total
+
+
+def _check_period(start_year: Optional[int], end_year: Optional[int]) -> Optional[int]:
+    """
+    Validate a historical period.
+
+    Returns:
+        The end year to store (start_year for a single year)
+
+    Raises:
+        HTTPException: If there is an end without a start, or it comes first
+    """
+    if start_year is None:
+        if end_year is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="end_year requires start_year"
+            )
+        return None
+    if end_year is None:
+        return start_year
+    if end_year < start_year:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_year must not be before start_year"
+        )
+    return end_year
+
+
+def _check_location(latitude: Optional[float], longitude: Optional[float]):
+    """
+    Reject a location with only one coordinate.
+
+    Raises:
+        HTTPException: If exactly one of latitude and longitude is set
+    """
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="latitude and longitude must be given together"
+        )
+
+
+def _stream_changes(since_version: int, limit: int) -> Iterator[str]:
+    """
+    Yield NDJSON lines for every change after a version, in version order.
+
+    Entries, categories and tombstones are read with three streaming
+    queries and merged by version. A version is never split across two
+    responses, so the checkpoint token is always safe to resume from.
+    """
+    # The request's session is closed before streaming starts, so use our own
+    db = SessionLocal()
+    try:
+        entries = db.query(
+            models.HeritageEntry,
+            models.Category.name.label('category_name'),
+            models.User.username.label('creator_username')
+        ).outerjoin(
+            models.Category, models.HeritageEntry.category_id == models.Category.id
+        ).outerjoin(
+            models.User, models.HeritageEntry.created_by == models.User.id
+        ).filter(
+            models.HeritageEntry.version > since_version
+        ).options(
+            selectinload(models.HeritageEntry.body)
+        ).order_by(models.HeritageEntry.version).yield_per(500)
+
+        categories = db.query(models.Category).filter(
+            models.Category.version > since_version
+        ).order_by(models.Category.version).yield_per(500)
+
+        tombstones = db.query(models.Tombstone).filter(
+            models.Tombstone.version > since_version
+        ).order_by(models.Tombstone.version, models.Tombstone.id).yield_per(500)
+
+        changes = heapq.merge(
+            (
+                (entry.version, SyncHeritageEntry(
+                    id=entry.id,
+                    title=entry.title,
+                    content=entry.content,
+                    category_id=entry.category_id,
+                    created_by=entry.created_by,
+                    created_at=entry.created_at,
+                    category_name=category_name,
+                    creator_username=creator_username,
+                    latitude=entry.latitude,
+                    longitude=entry.longitude,
+                    start_year=entry.start_year,
+                    end_year=entry.end_year,
+                    version=entry.version,
+                    updated_at=entry.updated_at
+                )) for entry, category_name, creator_username in entries
+            ),
+            (
+                (category.version, SyncCategory(
+                    id=category.id,
+                    name=category.name,
+                    description=category.description,
+                    version=category.version,
+                    updated_at=category.updated_at
+                )) for category in categories
+            ),
+            (
+                (tombstone.version, SyncTombstone(
+                    entity=tombstone.entity,
+                    id=tombstone.entity_id,
+                    version=tombstone.version
+                )) for tombstone in tombstones
+            ),
+            key=lambda change: change[0]
+        )
+
+        last_version = since_version
+        sent = 0
+        has_more = False
+        for version, change in changes:
+            if sent >= limit and version != last_version:
+                has_more = True
+                break
+            yield change.model_dump_json() + "\n"
+            last_version = version
+            sent += 1
+
+        yield SyncCheckpoint(token=str(max(last_version, 0)), has_more=has_more).model_dump_json() + "\n"
+    finally:
+        db.close()
+
+
+async def _event_stream(
+    request: Request,
+    subscription: Subscription,
+    replay: List[Tuple[int, str]],
+    gap: bool
+):
+    """
+    Yield server-sent events for one subscriber until it disconnects or is dropped.
+    """
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        # Missed events are no longer buffered: the client should resync
+        # through GET /heritage/changes
+        if gap:
+            yield "event: reset\ndata: {}\n\n"
+
+        for _, message in replay:
+            yield message
+        last_sent = replay[-1][0] if replay else 0
+
+        while True:
+            if subscription.dropped and subscription.queue.empty():
+                # Fell too far behind; the client reconnects with Last-Event-ID
+                yield "event: dropped\ndata: {}\n\n"
+                return
+
+            try:
+                # Drain queued events without arming a timer for each one
+                event_id, message = subscription.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    event_id, message = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": heartbeat\n\n"
+                    continue
+
+            # Events published while replaying arrive in the queue as well
+            if event_id <= last_sent:
+                continue
+            yield message
+            last_sent = event_id
+    finally:
+        heritage_events.unsubscribe(subscription)
+
+
+def _event_payload(entry: HeritageEntryResponse) -> dict:
+    """Event data for an entry; content is left out to keep fan-out cheap."""
+    return entry.model_dump(mode="json", exclude={"content"})
+
+
+# Columns of an entry response, fetched as plain rows rather than ORM
+# entities so no identity map or instance state is built per row
+_ENTRY_COLUMNS = (
+    models.HeritageEntry.id,
+    models.HeritageEntry.title,
+    models.HeritageEntry.category_id,
+    models.HeritageEntry.created_by,
+    models.HeritageEntry.created_at,
+    models.Category.name.label('category_name'),
+    models.User.username.label('creator_username'),
+    models.HeritageEntry.latitude,
+    models.HeritageEntry.longitude,
+    models.HeritageEntry.start_year,
+    models.HeritageEntry.end_year
+)
+
+
+def _select_entries(with_content: bool = False) -> Select:
+    """
+    Core SELECT of entry response columns, joined with the category and creator names.
+
+    Args:
+        with_content: Also select the content (cheap for ID lookups, not for offset scans)
+
+    Returns:
+        Select: Statement to add filters to
+    """
+    columns = _ENTRY_COLUMNS + (models.HeritageContent.content,) if with_content else _ENTRY_COLUMNS
+    statement = select(*columns).join(
         models.Category, models.HeritageEntry.category_id == models.Category.id
     ).join(
         models.User, models.HeritageEntry.created_by == models.User.id
     )
+    if with_content:
+        statement = statement.outerjoin(
+            models.HeritageContent, models.HeritageContent.heritage_id == models.HeritageEntry.id
+        )
+    return statement
+
+
+def _lookup_heritage_batch(ids: List[int], db: Session) -> HeritageBatchResponse:
+    """
+    Resolve many heritage entries with a single IN query.
+
+    Args:
+        ids: Requested heritage entry IDs (duplicates allowed)
+        db: Database session
+
+    Returns:
+        HeritageBatchResponse: Entries in request order plus missing IDs
+    """
+    unique_ids = list(dict.fromkeys(ids))
+
+    rows = db.execute(
+        _select_entries(with_content=True).where(models.HeritageEntry.id.in_(unique_ids))
+    ).all() if unique_ids else []
+
+    found = {row.id: HeritageEntryResponse(**row._mapping) for row in rows}
+
+    # Preserve request order and report what was not found
+    return HeritageBatchResponse(
+        items=[found[heritage_id] for heritage_id in unique_ids if heritage_id in found],
+        missing=[heritage_id for heritage_id in unique_ids if heritage_id not in found]
+    )
+
+
+def _with_previews(items: List[HeritageEntryResponse]) -> List[HeritageEntryResponse]:
+    """Cut listing items' content to a preview, keeping the full size in content_length."""
+    for item in items:
+        if item.content is not None:
+            item.content_length = len(item.content.encode("utf-8"))
+            item.content = item.content[:LISTING_PREVIEW_CHARS]
+    return items
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header into inclusive byte offsets.
+
+    Multiple ranges and malformed headers are ignored (the full content is
+    sent), as RFC 9110 allows.
+
+    Raises:
+        HTTPException: 416 if the range lies outside the content
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def _list_heritage_entries(
+    db: Session,
+    page: int,
+    size: int,
+    search: Optional[str],
+    category_id: Optional[int],
+    ranked: bool,
+    fuzzy: bool,
+    requested_facets: Set[str],
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None
+) -> PaginatedResponse:
+    """Build one page of the heritage listing (see GET /heritage/)."""
+    facet_response = HeritageFacets() if requested_facets else None
+
+    # Entries whose historical period overlaps the requested years, oldest first
+    period_ids = None
+    if year_from is not None or year_to is not None:
+        period_ids = period_index.overlapping(year_from, year_to)
+
+    # Ranked search is served from the in-memory index, then hydrated by ID
+    if search and ranked and not fuzzy:
+        allowed = set(period_ids) if period_ids is not None else None
+        top, total = search_index.search(search, k=page * size, category_id=category_id, doc_ids=allowed)
+        page_ids = [doc_id for doc_id, _ in top[(page - 1) * size:]]
+
+        # Facets come straight from the index postings
+        if requested_facets:
+            category_counts, creator_counts = search_index.facet_counts(search, category_id, allowed)
+            if "category" in requested_facets:
+                names = dict(db.query(models.Category.id, models.Category.name).filter(
+                    models.Category.id.in_(list(category_counts))
+                ).all())
+                facet_response.categories = _facet_list(category_counts, names)
+            if "creator" in requested_facets:
+                names = dict(db.query(models.User.id, models.User.username).filter(
+                    models.User.id.in_(list(creator_counts))
+                ).all())
+                facet_response.creators = _facet_list(creator_counts, names)
+
+        return PaginatedResponse(
+            items=_with_previews(_lookup_heritage_batch(page_ids, db).items),
+            total=total,
+            page=page,
+            size=size,
+            pages=ceil(total / size) if total > 0 else 1,
+            facets=facet_response
+        )
 
     # Apply search filter if provided
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
+    search_filters = []
+    fuzzy_ids = None
+    if search and fuzzy:
+        # Typo-tolerant candidates from the trigram index, best match first;
+        # the index filters by category and period before cutting to MAX_FUZZY_MATCHES
+        in_period = set(period_ids) if period_ids is not None else None
+        fuzzy_ids = [
+            doc_id for doc_id, _ in trigram_index.search(
+                search, MAX_FUZZY_MATCHES, category_id=category_id, doc_ids=in_period
+            )
+        ]
+        facet_ids = fuzzy_ids
+        if category_id is not None and "category" in requested_facets:
+            # Category facets also count the other categories' matches
+            facet_ids = [
+                doc_id for doc_id, _ in trigram_index.search(search, MAX_FUZZY_MATCHES, doc_ids=in_period)
+            ]
+        search_filters.append(models.HeritageEntry.id.in_(facet_ids))
+    elif search:
+        # Match against the precomputed normalized columns, which fold case
+        # and accents for every script (ilike only folds ASCII on SQLite)
+        search_term = f"%{normalize_text(search)}%"
+        search_filters.append(
             or_(
-                models.HeritageEntry.title.ilike(search_term),
-                models.HeritageEntry.content.ilike(search_term)
+                models.HeritageEntry.title_normalized.like(search_term),
+                models.HeritageEntry.body.has(
+                    decompressed(models.HeritageContent.content_normalized).like(search_term)
+                )
             )
         )
 
+    # Apply period filter if provided; facets honour it like the search filter
+    if period_ids is not None:
+        if len(period_ids) <= MAX_PERIOD_IDS:
+            search_filters.append(models.HeritageEntry.id.in_(period_ids))
+        else:
+            if year_to is not None:
+                search_filters.append(models.HeritageEntry.start_year <= year_to)
+            if year_from is not None:
+                search_filters.append(models.HeritageEntry.end_year >= year_from)
+
     # Apply category filter if provided
+    category_filters = []
     if category_id is not None:
-        query = query.filter(models.HeritageEntry.category_id == category_id)
+        category_filters.append(models.HeritageEntry.category_id == category_id)
+
+    facet_response, total = _sql_facets(
+        db, requested_facets, search_filters, category_filters, category_id
+    )
+
+    if fuzzy_ids is not None:
+        # Keep similarity order; the index has applied every filter
+        total = len(fuzzy_ids)
+        return PaginatedResponse(
+            items=_with_previews(_lookup_heritage_batch(fuzzy_ids[(page - 1) * size:page * size], db).items),
+            total=total,
+            page=page,
+            size=size,
+            pages=ceil(total / size) if total > 0 else 1,
+            facets=facet_response
+        )
+
+    # Build base query; timeline queries list the oldest periods first
+    query = _select_entries().where(*search_filters, *category_filters)
+    if period_ids is not None:
+        query = query.order_by(models.HeritageEntry.start_year, models.HeritageEntry.id)
 
-    # Get total count for pagination
-    total = query.count()
+    def count_rows() -> int:
+        return db.execute(select(func.count()).select_from(query.subquery())).scalar_one()
 
-    # Apply pagination
-    items = query.offset((page - 1) * size).limit(size).all()
+    # Get total count for pagination; unfiltered and per-category counts
+    # are shared through the cache until the next write. Year ranges are
+    # arbitrary, so period counts would mostly fill the cache with misses
+    if total is None and not search and period_ids is None:
+        total = cache.get_or_set("heritage", f"count:{category_id}", count_rows)
+    elif total is None:
+        total = count_rows()
+
+    # Apply pagination; content is loaded for the page rows only
+    rows = db.execute(query.offset((page - 1) * size).limit(size)).all()
+    contents = dict(db.execute(
+        select(models.HeritageContent.heritage_id, models.HeritageContent.content).where(
+            models.HeritageContent.heritage_id.in_([row.id for row in rows])
+        )
+    ).all()) if rows else {}
 
     # Calculate pagination metadata
     pages = ceil(total / size) if total > 0 else 1
 
     # Convert to response format
-    heritage_items = []
-    for item in items:
-        entry, category_name, creator_username = item
-        heritage_items.append(HeritageEntryResponse(
-            id=entry.id,
-            title=entry.title,
-            content=entry.content,
-            category_id=entry.category_id,
-            created_by=entry.created_by,
-            created_at=entry.created_at,
-            category_name=category_name,
-            creator_username=creator_username
-        ))
+    heritage_items = _with_previews([
+        HeritageEntryResponse(**row._mapping, content=contents.get(row.id))
+        for row in rows
+    ])
 
     return PaginatedResponse(
         items=heritage_items,
         total=total,
         page=page,
         size=size,
-        pages=pages
+        pages=pages,
+        facets=facet_response
     )
 
+
+def _build_page_snapshot(key: Tuple) -> bytes:
+    """Render a default listing page for the snapshot layer."""
+    category_id, page, size, facets = key
+    db = SessionLocal()
+    try:
+        return _list_heritage_entries(
+            db, page, size, None, category_id, False, False, set(facets)
+        ).model_dump_json().encode("utf-8")
+    finally:
+        db.close()
+
+
+page_snapshots.set_builder(_build_page_snapshot)
+
+
+@router.get("/", response_model=PaginatedResponse)
+async def get_heritage_entries(
+    page: int = Query(1, ge=1, description="Page number (1-based)"),
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    search: str = Query(None, description="Search keyword in title or content"),
+    category_id: int = Query(None, description="Filter by category ID"),
+    ranked: bool = Query(False, description="Rank search results by relevance (BM25)"),
+    fuzzy: bool = Query(False, description="Typo-tolerant search ranked by trigram similarity"),
+    facets: str = Query(None, description="Comma-separated facets to include: category, creator"),
+    year_from: int = Query(None, description="Only entries whose historical period overlaps this year or later (negative for BCE)"),
+    year_to: int = Query(None, description="Only entries whose historical period overlaps this year or earlier"),
+    db: Session = Depends(get_db)
+):
+
+    requested_facets = _parse_facets(facets)
+
+    if year_from is not None and year_to is not None and year_from > year_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="year_from must not be after year_to"
+        )
+
+    if search or year_from is not None or year_to is not None:
+        return _list_heritage_entries(
+            db, page, size, search, category_id, ranked, fuzzy, requested_facets, year_from, year_to
+        )
+
+    # Default listings are served from prebuilt JSON when they are hot enough
+    key = (category_id, page, size, tuple(sorted(requested_facets)))
+    body = page_snapshots.get(key)
+    if body is None:
+        generation = page_snapshots.generation
+        response = _list_heritage_entries(
+            db, page, size, None, category_id, ranked, fuzzy, requested_facets
+        )
+        body = page_snapshots.put(key, response.model_dump_json().encode("utf-8"), generation)
+
+    return Response(content=body, media_type="application/json")
+
+@router.get("/snapshots/stats")
+async def get_page_snapshot_stats(current_user: models.User = Depends(get_current_admin_user)):
+    """
+    Hit and rebuild counters of the listing snapshot layer.
+    """
+    return page_snapshots.stats()
+
+@router.get("/suggest", response_model=List[HeritageSuggestion])
+async def suggest_heritage_titles(
+    prefix: str = Query(..., min_length=1, description="Beginning of a heritage entry title"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions")
+):
+    """
+    Suggest heritage entry titles for type-ahead search.
+
+    Served from the in-memory title prefix index; no database access.
+    """
+    return [
+        HeritageSuggestion(id=heritage_id, title=title)
+        for heritage_id, title in prefix_index.suggest(prefix, limit)
+    ]
+
+@router.get("/trending", response_model=List[HeritageViews])
+async def get_trending_heritage_entries(
+    limit: int = Query(10, ge=1, le=100, description="Maximum number of entries")
+):
+    """
+    Get the entries with the most recent views, recent views weighing more.
+
+    Served from the in-memory view counter; no database access. Scores are
+    view counts that halve every TRENDING_HALF_LIFE_SECONDS.
+    """
+    trending = view_counter.trending(limit)
+    titles = prefix_index.titles(heritage_id for heritage_id, _, _ in trending)
+    return [
+        HeritageViews(id=heritage_id, title=titles[heritage_id], views=views, score=round(score, 3))
+        for heritage_id, score, views in trending if heritage_id in titles
+    ]
+
+@router.get("/popular", response_model=List[HeritageViews])
+async def get_popular_heritage_entries(
+    limit: int = Query(10, ge=1, le=POPULAR_SIZE, description="Maximum number of entries")
+):
+    """
+    Get the most viewed entries of all time.
+
+    Served from memory; counts are as of the last view counter flush
+    (every VIEW_FLUSH_SECONDS) and include views through all workers.
+    """
+    popular = view_counter.popular(limit)
+    titles = prefix_index.titles(heritage_id for heritage_id, _ in popular)
+    return [
+        HeritageViews(id=heritage_id, title=titles[heritage_id], views=views)
+        for heritage_id, views in popular if heritage_id in titles
+    ]
+
+@router.get("/places", response_model=HeritagePlacesResponse)
+async def get_heritage_places(
+    min_lat: float = Query(..., ge=-90, le=90, description="Southern edge of the box"),
+    min_lon: float = Query(..., ge=-180, le=180, description="Western edge of the box"),
+    max_lat: float = Query(..., ge=-90, le=90, description="Northern edge of the box"),
+    max_lon: float = Query(..., ge=-180, le=180, description="Eastern edge; less than min_lon crosses the antimeridian"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    limit: int = Query(DEFAULT_PLACES_LIMIT, ge=1, le=MAX_PLACES_LIMIT, description="Maximum places to return")
+):
+    """
+    Get located heritage entries inside a bounding box, for maps.
+
+    Served from the in-memory geo index; no database access. When more
+    than `limit` places match, an evenly spread sample is returned and
+    `total` gives the full count.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not be greater than max_lat"
+        )
+
+    matches = geo_index.within(min_lat, min_lon, max_lat, max_lon, category_id)
+    total = len(matches)
+    if total > limit:
+        # Matches are grouped by grid cell, so a stride keeps the spread
+        matches = [matches[i * total // limit] for i in range(limit)]
+
+    return HeritagePlacesResponse(
+        items=[
+            HeritagePlace(
+                id=heritage_id, title=title, category_id=place_category,
+                latitude=latitude, longitude=longitude
+            )
+            for heritage_id, (latitude, longitude, title, place_category) in matches
+        ],
+        total=total
+    )
+
+@router.get("/nearby", response_model=List[HeritagePlace])
+async def get_nearby_heritage_places(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the point"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude of the point"),
+    k: int = Query(10, ge=1, le=MAX_NEAREST, description="Number of places to return"),
+    category_id: Optional[int] = Query(None, description="Filter by category ID"),
+    max_km: Optional[float] = Query(None, gt=0, description="Ignore places further away than this")
+):
+    """
+    Get the located heritage entries nearest to a point, closest first.
+
+    Served from the in-memory geo index; no database access.
+    """
+    return [
+        HeritagePlace(
+            id=heritage_id, title=title, category_id=place_category,
+            latitude=latitude, longitude=longitude, distance_km=round(distance, 3)
+        )
+        for heritage_id, (latitude, longitude, title, place_category), distance
+        in geo_index.nearest(lat, lon, k, category_id, max_km)
+    ]
+
+@router.get("/changes")
+async def get_heritage_changes(
+    since: str = Query(None, description="Token from the previous sync; omit for a full snapshot"),
+    limit: int = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT, description="Maximum changes to return"),
+):
+    """
+    Stream heritage entries and categories changed since a sync token.
+
+    The response is NDJSON, ordered by version: `heritage` and `category`
+    lines carry the full current row, `tombstone` lines report deletions, and
+    a final `checkpoint` line holds the token for the next call. Repeat while
+    `has_more` is true.
+    """
+    try:
+        since_version = int(since) if since else -1
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token"
+        )
+
+    return StreamingResponse(
+        _stream_changes(since_version, limit),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/stream")
+async def stream_heritage_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, description="Resume after this event ID"),
+):
+    """
+    Push heritage entry changes as server-sent events.
+
+    Events are `created`, `updated` and `deleted`, with the entry (without
+    content) as JSON data. Reconnecting with `Last-Event-ID` replays recent
+    events; a `reset` event means some were missed and the client should
+    resync with GET /heritage/changes.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    try:
+        subscription, replay, gap = heritage_events.subscribe(resume_from)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+    return StreamingResponse(
+        _event_stream(request, subscription, replay, gap),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/batch", response_model=HeritageBatchResponse)
+async def get_heritage_entries_batch(
+    ids: str = Query(..., description="Comma-separated heritage entry IDs"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get several heritage entries in one request.
+
+    Entries are returned in request order; unknown IDs are listed in `missing`.
+    Use POST /heritage/batch for long ID lists.
+    """
+    try:
+        heritage_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+
+    if len(heritage_ids) > MAX_BATCH_GET_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids (max {MAX_BATCH_GET_IDS}); use POST /heritage/batch"
+        )
+
+    return _lookup_heritage_batch(heritage_ids, db)
+
+@router.post("/batch", response_model=HeritageBatchResponse)
+async def post_heritage_entries_batch(
+    batch: HeritageBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """Get several heritage entries by ID, for ID lists too long for a query string."""
+    if len(batch.ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids (max {MAX_BATCH_IDS})"
+        )
+
+    return _lookup_heritage_batch(batch.ids, db)
+
 @router.get("/{heritage_id}", response_model=HeritageEntryDetailResponse)
 async def get_heritage_entry(heritage_id: int, db: Session = Depends(get_db)):
    
     # Query with joins to get related data
-    result = db.query(
-        models.HeritageEntry,
-        models.Category.name.label('category_name'),
-        models.User.username.label('creator_username')
-    ).join(
-        models.Category, models.HeritageEntry.category_id == models.Category.id
-    ).join(
-        models.User, models.HeritageEntry.created_by == models.User.id
-    ).filter(
-        models.HeritageEntry.id == heritage_id
+    result = db.execute(
+        _select_entries(with_content=True).where(models.HeritageEntry.id == heritage_id)
     ).first()
 
     if not result:
@@ -103,17 +883,92 @@ async def get_heritage_entry(heritage_id: int, db: Session = Depends(get_db)):
             detail="Heritage entry not found"
         )
 
-    entry, category_name, creator_username = result
+    view_counter.record(heritage_id)
+    return HeritageEntryDetailResponse(**result._mapping)
+
+@router.get("/{heritage_id}/related", response_model=List[HeritageRelated])
+async def get_related_heritage_entries(
+    heritage_id: int,
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of related entries"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the entries most similar to an entry, most similar first.
+
+    Reads the lists precomputed by `python -m app.cli related`, so this is
+    one primary-key range lookup; entries added since the last run have none.
+    """
+    rows = db.execute(
+        select(
+            models.HeritageEntry.id,
+            models.HeritageEntry.title,
+            models.HeritageEntry.category_id,
+            models.Category.name.label('category_name'),
+            models.RelatedEntry.score
+        ).join(
+            models.HeritageEntry, models.RelatedEntry.related_id == models.HeritageEntry.id
+        ).join(
+            models.Category, models.HeritageEntry.category_id == models.Category.id
+        ).where(
+            models.RelatedEntry.heritage_id == heritage_id
+        ).order_by(models.RelatedEntry.rank).limit(limit)
+    ).all()
+
+    if not rows and db.get(models.HeritageEntry, heritage_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Heritage entry not found"
+        )
+
+    return [HeritageRelated(**row._mapping) for row in rows]
+
+@router.get("/{heritage_id}/content")
+async def get_heritage_content(
+    heritage_id: int,
+    range_header: Optional[str] = Header(None, alias="Range", description="Byte range, e.g. bytes=0-65535"),
+    if_range: Optional[str] = Header(None, description="Only honour Range if the ETag still matches")
+):
+    """
+    Stream an entry's content as plain UTF-8 text.
 
-    return HeritageEntryDetailResponse(
-        id=entry.id,
-        title=entry.title,
-        content=entry.content,
-        category_id=entry.category_id,
-        created_by=entry.created_by,
-        created_at=entry.created_at,
-        category_name=category_name,
-        creator_username=creator_username
+    Supports single HTTP byte ranges so clients can load very long entries
+    progressively or resume a download. Byte ranges may split a multi-byte
+    character; clients should decode incrementally.
+    """
+    # The reader only holds a connection while measuring and while the body streams
+    reader = ContentReader(heritage_id)
+    if not reader.open():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Heritage entry not found"
+        )
+
+    etag = f'"{heritage_id}-{reader.version}"'
+    headers = {"Accept-Ranges": "bytes", "ETag": etag}
+
+    byte_range = None
+    if range_header and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, reader.size)
+
+    if byte_range is None:
+        start, end = 0, reader.size - 1
+        status_code = status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{reader.size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+
+    # Reading from the beginning counts as a view; later chunks of the same read do not
+    if start == 0:
+        view_counter.record(heritage_id)
+
+    return StreamingResponse(
+        reader.iter_range(start, end),
+        status_code=status_code,
+        media_type="text/plain; charset=utf-8",
+        headers=headers
     )
 
 @router.post("/", response_model=HeritageEntryResponse)
@@ -134,27 +989,166 @@ async def create_heritage_entry(
             detail="Invalid category ID"
         )
 
-    # Create new heritage entry
-    db_entry = models.HeritageEntry(
-        title=entry_data.title,
-        content=entry_data.content,
-        category_id=entry_data.category_id,
-        created_by=current_user.id
+    _check_location(entry_data.latitude, entry_data.longitude)
+    end_year = _check_period(entry_data.start_year, entry_data.end_year)
+
+    creator_id = current_user.id
+
+    def insert_entry(session: Session) -> int:
+        # Create new heritage entry
+        new_entry = models.HeritageEntry(
+            title=entry_data.title,
+            content=entry_data.content,
+            category_id=entry_data.category_id,
+            created_by=creator_id,
+            latitude=entry_data.latitude,
+            longitude=entry_data.longitude,
+            start_year=entry_data.start_year,
+            end_year=end_year
+        )
+        session.add(new_entry)
+        session.flush()
+        return new_entry.id
+
+    # Save to database (group-committed with concurrent creates if enabled)
+    entry_id = await write_coalescer.run(insert_entry, db)
+    db_entry = db.get(models.HeritageEntry, entry_id)
+
+    # Keep the search indexes current without a rebuild
+    index_entry(db_entry)
+    cache.invalidate("heritage")
+    page_snapshots.invalidate([db_entry.category_id])
+
+    # Return with additional metadata
+    response = HeritageEntryResponse(
+        id=db_entry.id,
+        title=db_entry.title,
+        content=db_entry.content,
+        category_id=db_entry.category_id,
+        created_by=db_entry.created_by,
+        created_at=db_entry.created_at,
+        category_name=category.name,
+        creator_username=current_user.username,
+        latitude=db_entry.latitude,
+        longitude=db_entry.longitude,
+        start_year=db_entry.start_year,
+        end_year=db_entry.end_year
     )
 
-    # Save to database
-    db.add(db_entry)
+    # Notify stream subscribers
+    heritage_events.publish("created", _event_payload(response))
+
+    return response
+
+@router.patch("/{heritage_id}", response_model=HeritageEntryResponse)
+async def update_heritage_entry(
+    heritage_id: int,
+    entry_data: HeritageEntryUpdate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+
+    db_entry = db.query(models.HeritageEntry).filter(
+        models.HeritageEntry.id == heritage_id
+    ).first()
+
+    if not db_entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Heritage entry not found"
+        )
+
+    # Explicit nulls clear optional fields (e.g. a location); required ones can't be cleared
+    changes = entry_data.model_dump(exclude_unset=True)
+    for field in REQUIRED_ENTRY_FIELDS:
+        if field in changes and changes[field] is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{field} cannot be null"
+            )
+
+    # Verify the new category exists
+    if "category_id" in changes:
+        category = db.query(models.Category).filter(
+            models.Category.id == changes["category_id"]
+        ).first()
+
+        if not category:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid category ID"
+            )
+
+    _check_location(
+        changes.get("latitude", db_entry.latitude),
+        changes.get("longitude", db_entry.longitude)
+    )
+    start_year = changes.get("start_year", db_entry.start_year)
+    if "start_year" in changes or "end_year" in changes:
+        # Clearing the start year removes the whole period
+        end_year = changes.get("end_year", None if start_year is None else db_entry.end_year)
+        changes["end_year"] = _check_period(start_year, end_year)
+
+    # Pages of both the old and the new category change
+    affected_categories = {db_entry.category_id, changes.get("category_id", db_entry.category_id)}
+
+    for field, value in changes.items():
+        setattr(db_entry, field, value)
+
+    # Save to database (bumps the sync version)
     db.commit()
     db.refresh(db_entry)
 
-    # Return with additional metadata
-    return HeritageEntryResponse(
+    # Reindexing takes the index locks; keep it off the event loop
+    await asyncio.to_thread(index_entry, db_entry)
+    cache.invalidate("heritage")
+    page_snapshots.invalidate(affected_categories)
+
+    response = HeritageEntryResponse(
         id=db_entry.id,
         title=db_entry.title,
         content=db_entry.content,
         category_id=db_entry.category_id,
         created_by=db_entry.created_by,
         created_at=db_entry.created_at,
-        category_name=category.name,
-        creator_username=current_user.username
+        category_name=db_entry.category.name,
+        creator_username=db_entry.creator.username,
+        latitude=db_entry.latitude,
+        longitude=db_entry.longitude,
+        start_year=db_entry.start_year,
+        end_year=db_entry.end_year
     )
+
+    heritage_events.publish("updated", _event_payload(response))
+
+    return response
+
+@router.delete("/{heritage_id}")
+async def delete_heritage_entry(
+    heritage_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+
+    db_entry = db.query(models.HeritageEntry).filter(
+        models.HeritageEntry.id == heritage_id
+    ).first()
+
+    if not db_entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Heritage entry not found"
+        )
+
+    category_id = db_entry.category_id
+
+    # Delete entry (leaves a tombstone for sync clients)
+    db.delete(db_entry)
+    db.commit()
+
+    unindex_entries([heritage_id])
+    cache.invalidate("heritage")
+    page_snapshots.invalidate([category_id])
+    heritage_events.publish("deleted", {"id": heritage_id})
+
+    return {"message": f"Heritage entry {db_entry.title} has been deleted"}
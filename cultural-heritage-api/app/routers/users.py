@@ -1,22 +1,172 @@
-from typing import List
+import asyncio
+import sys
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select, Select
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app import models
-from app.schemas import UserResponse
+from app.schemas import UserResponse, UserPage
 from app.utils.dependencies import get_current_admin_user
+from app.core.user_deletion import delete_user as delete_user_and_entries, SYSTEM_USERNAME
+
+# Listing configuration
+DEFAULT_USER_PAGE_SIZE = 50
+MAX_USER_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+# Columns of a user response, fetched as plain rows (never the password hash)
+_USER_COLUMNS = (
+    models.User.id,
+    models.User.username,
+    models.User.email,
+    models.User.role,
+    models.User.created_at
+)
 
 # Create the users router
 router = APIRouter()
 
-@router.get("/", response_model=List[UserResponse])
+
+def _filter_users(
+    query: Select,
+    role: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    username_prefix: Optional[str]
+) -> Select:
+    """Apply the optional listing filters to a user query."""
+    if role:
+        query = query.where(models.User.role == role)
+    if created_from:
+        query = query.where(models.User.created_at >= created_from)
+    if created_to:
+        query = query.where(models.User.created_at < created_to)
+    if username_prefix:
+        # A range rather than LIKE, so the username index is used
+        query = query.where(models.User.username >= username_prefix)
+        upper = _prefix_upper_bound(username_prefix)
+        if upper is not None:
+            query = query.where(models.User.username < upper)
+    return query
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Smallest string greater than every string starting with prefix.
+
+    Trailing U+10FFFF characters cannot be incremented and are dropped;
+    None means there is no upper bound.
+    """
+    stripped = prefix.rstrip(chr(sys.maxunicode))
+    if not stripped:
+        return None
+    following = ord(stripped[-1]) + 1
+    if 0xD800 <= following <= 0xDFFF:
+        following = 0xE000  # Surrogates cannot be encoded, so skip past them
+    return stripped[:-1] + chr(following)
+
+
+def _stream_users(
+    role: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    username_prefix: Optional[str]
+) -> Iterator[str]:
+    """
+    Yield NDJSON lines for every matching user, in ID order.
+
+    Rows are fetched in batches of EXPORT_BATCH_SIZE, so memory use does
+    not grow with the number of users.
+    """
+    # The request's session is closed before streaming starts, so use our own
+    db = SessionLocal()
+    try:
+        users = db.execute(
+            _filter_users(
+                select(*_USER_COLUMNS), role, created_from, created_to, username_prefix
+            ).order_by(models.User.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+
+        for user in users:
+            yield UserResponse.model_validate(user).model_dump_json() + "\n"
+    finally:
+        db.close()
+
+
+def _stream_deletion(user_id: int, policy: str) -> Iterator[str]:
+    """Delete a user, yielding an NDJSON progress line after each chunk."""
+    # The request's session is closed before streaming starts, so use our own
+    db = SessionLocal()
+    try:
+        for progress in delete_user_and_entries(db, user_id, policy):
+            yield progress.model_dump_json() + "\n"
+    finally:
+        db.close()
+
+
+def _run_deletion(user_id: int, policy: str):
+    """Delete a user, returning the final progress report."""
+    db = SessionLocal()
+    try:
+        progress = None
+        for progress in delete_user_and_entries(db, user_id, policy):
+            pass
+        return progress
+    finally:
+        db.close()
+
+
+@router.get("/", response_model=UserPage)
 async def get_users(
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    limit: int = Query(DEFAULT_USER_PAGE_SIZE, ge=1, le=MAX_USER_PAGE_SIZE, description="Users per page"),
+    role: Optional[str] = Query(None, description="Only users with this role"),
+    created_from: Optional[datetime] = Query(None, description="Only users created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only users created before this time"),
+    username_prefix: Optional[str] = Query(None, min_length=1, description="Only usernames starting with this"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="`ndjson` streams every matching user"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
-    users = db.query(models.User).all()
-    return users
+    """
+    List users in ID order, a page at a time.
+
+    Pages are keyset-paginated: pass the returned `next_cursor` to get the
+    next page, which costs the same however deep it is. With
+    `format=ndjson` every matching user is streamed instead, one JSON
+    object per line, for exports.
+    """
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_users(role, created_from, created_to, username_prefix),
+            media_type="application/x-ndjson"
+        )
+
+    try:
+        after_id = int(cursor) if cursor else 0
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    query = _filter_users(
+        select(*_USER_COLUMNS), role, created_from, created_to, username_prefix
+    ).where(models.User.id > after_id)
+
+    # Fetch one extra row to learn whether another page follows
+    users = db.execute(query.order_by(models.User.id).limit(limit + 1)).all()
+    has_more = len(users) > limit
+    users = users[:limit]
+
+    return UserPage(
+        items=users,
+        next_cursor=str(users[-1].id) if has_more else None
+    )
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
@@ -25,7 +175,9 @@ async def get_user(
     current_user: models.User = Depends(get_current_admin_user)
 ):
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.execute(
+        select(*_USER_COLUMNS).where(models.User.id == user_id)
+    ).first()
 
     if not user:
         raise HTTPException(
@@ -33,15 +185,25 @@ async def get_user(
             detail="User not found"
         )
 
-    return user
+    return UserResponse.model_validate(user)
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: int,
+    policy: str = Query("reassign", pattern="^(reassign|cascade)$", description="What happens to the user's heritage entries"),
+    stream: bool = Query(False, description="Stream NDJSON progress reports while deleting"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
-   
+    """
+    Delete a user and deal with the heritage entries they created.
+
+    - `reassign` (default) hands the entries to the system user
+    - `cascade` deletes them
+
+    Entries are processed in chunks; with `stream=true` a progress line is
+    sent after every chunk, which helps with very prolific creators.
+    """
     # Prevent admin from deleting themselves
     if user_id == current_user.id:
         raise HTTPException(
@@ -57,8 +219,22 @@ async def delete_user(
             detail="User not found"
         )
 
-    # Delete user (this will cascade to their heritage entries if configured)
-    db.delete(user)
-    db.commit()
+    if user.username == SYSTEM_USERNAME:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete the system user"
+        )
+
+    if stream:
+        return StreamingResponse(
+            _stream_deletion(user_id, policy),
+            media_type="application/x-ndjson"
+        )
+
+    progress = await asyncio.to_thread(_run_deletion, user_id, policy)
 
-    return {"message": f"User {user.username} has been deleted"}
+    return {
+        "message": f"User {user.username} has been deleted",
+        "policy": policy,
+        "entries": progress.processed
+    }
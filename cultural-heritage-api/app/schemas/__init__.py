@@ -1,6 +1,7 @@
 from .user import (
     UserBase, UserCreate, UserUpdate, UserResponse,
-    UserLogin, Token, TokenData
+    UserLogin, Token, TokenData, RefreshTokenRequest, UserPage,
+    UserDeletionProgress
 )
 from .category import (
     CategoryBase, CategoryCreate, CategoryUpdate, CategoryResponse
@@ -8,14 +9,22 @@ from .category import (
 from .heritage import (
     HeritageEntryBase, HeritageEntryCreate, HeritageEntryUpdate,
     HeritageEntryResponse, HeritageEntryDetailResponse,
-    PaginationParams, HeritageSearchParams, PaginatedResponse
+    PaginationParams, HeritageSearchParams, PaginatedResponse,
+    HeritageBatchRequest, HeritageBatchResponse,
+    FacetCount, HeritageFacets, HeritageSuggestion, HeritageRelated, HeritageViews,
+    HeritagePlace, HeritagePlacesResponse
 )
+from .sync import (
+    SyncHeritageEntry, SyncCategory, SyncTombstone, SyncCheckpoint
+)
+from .export import AnalyticsTable, AnalyticsSnapshot
 
 # Export all schemas for easy importing
 __all__ = [
     # User schemas
     "UserBase", "UserCreate", "UserUpdate", "UserResponse",
-    "UserLogin", "Token", "TokenData",
+    "UserLogin", "Token", "TokenData", "RefreshTokenRequest", "UserPage",
+    "UserDeletionProgress",
 
     # Category schemas
     "CategoryBase", "CategoryCreate", "CategoryUpdate", "CategoryResponse",
@@ -23,5 +32,14 @@ __all__ = [
     # Heritage schemas
     "HeritageEntryBase", "HeritageEntryCreate", "HeritageEntryUpdate",
     "HeritageEntryResponse", "HeritageEntryDetailResponse",
-    "PaginationParams", "HeritageSearchParams", "PaginatedResponse"
+    "PaginationParams", "HeritageSearchParams", "PaginatedResponse",
+    "HeritageBatchRequest", "HeritageBatchResponse",
+    "FacetCount", "HeritageFacets", "HeritageSuggestion", "HeritageRelated", "HeritageViews",
+    "HeritagePlace", "HeritagePlacesResponse",
+
+    # Sync schemas
+    "SyncHeritageEntry", "SyncCategory", "SyncTombstone", "SyncCheckpoint",
+
+    # Export schemas
+    "AnalyticsTable", "AnalyticsSnapshot"
 ]
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+
+# Analytics export schemas
+# Snapshots are Parquet files written by `python -m app.cli export-analytics`
+# or POST /exports/analytics
+class AnalyticsTable(BaseModel):
+    """One exported table of a snapshot."""
+    name: str
+    rows: int
+    bytes: int  # Compressed file size
+
+class AnalyticsSnapshot(BaseModel):
+    """Manifest of a columnar snapshot."""
+    snapshot: str  # Snapshot name, a UTC timestamp
+    created_at: datetime
+    tables: List[AnalyticsTable]
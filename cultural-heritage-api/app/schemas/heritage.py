@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class HeritageEntryBase(BaseModel):
     """Base heritage entry schema with common fields."""
@@ -10,13 +10,20 @@ class HeritageEntryBase(BaseModel):
 
 class HeritageEntryCreate(HeritageEntryBase):
     """Schema for heritage entry creation requests."""
-    pass  # All fields are in base
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    start_year: Optional[int] = None  # Negative for BCE
+    end_year: Optional[int] = None  # Defaults to start_year
 
 class HeritageEntryUpdate(BaseModel):
     """Schema for heritage entry update requests."""
     title: Optional[str] = None
     content: Optional[str] = None
     category_id: Optional[int] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
 
 class HeritageEntryResponse(HeritageEntryBase):
     """Schema for heritage entry response data."""
@@ -25,6 +32,11 @@ class HeritageEntryResponse(HeritageEntryBase):
     created_at: datetime
     category_name: Optional[str] = None  # Joined from category table
     creator_username: Optional[str] = None  # Joined from user table
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    content_length: Optional[int] = None  # Full content size in bytes; listings only send a preview as content
 
     class Config:
         """Pydantic configuration for ORM compatibility."""
@@ -44,6 +56,20 @@ class HeritageSearchParams(PaginationParams):
     """Schema for heritage search and filtering parameters."""
     search: Optional[str] = None
     category_id: Optional[int] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+
+# Facet schemas
+class FacetCount(BaseModel):
+    """Number of matching entries for one facet value."""
+    id: int
+    name: Optional[str] = None
+    count: int
+
+class HeritageFacets(BaseModel):
+    """Per-category (and optionally per-creator) counts of matching entries."""
+    categories: Optional[List[FacetCount]] = None
+    creators: Optional[List[FacetCount]] = None
 
 class PaginatedResponse(BaseModel):
     """Generic paginated response wrapper."""
@@ -52,3 +78,49 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+    facets: Optional[HeritageFacets] = None  # Only when requested
+
+# Batch lookup schemas
+class HeritageBatchRequest(BaseModel):
+    """Schema for batch heritage entry lookup requests."""
+    ids: List[int]
+
+# Map schemas
+class HeritagePlace(BaseModel):
+    """Compact summary of a located entry, for maps."""
+    id: int
+    title: str
+    category_id: int
+    latitude: float
+    longitude: float
+    distance_km: Optional[float] = None  # Only for nearest-place queries
+
+class HeritagePlacesResponse(BaseModel):
+    """Located entries inside a bounding box."""
+    items: List[HeritagePlace]
+    total: int  # Matches in the box; items are an evenly spread sample when larger than the limit
+
+class HeritageBatchResponse(BaseModel):
+    """Heritage entries for a batch lookup, in request order."""
+    items: List[HeritageEntryResponse]
+    missing: List[int]  # Requested IDs that do not exist
+
+class HeritageSuggestion(BaseModel):
+    """Type-ahead title suggestion."""
+    id: int
+    title: str
+
+class HeritageViews(BaseModel):
+    """Entry in the most viewed or trending list."""
+    id: int
+    title: str
+    views: int  # All time for the popular list, inside the trending window for trending
+    score: Optional[float] = None  # Time-decayed views, trending only
+
+class HeritageRelated(BaseModel):
+    """Entry similar to another one, from the precomputed related entries."""
+    id: int
+    title: str
+    category_id: int
+    category_name: str
+    score: float  # Cosine similarity of the TF-IDF vectors, 0-1
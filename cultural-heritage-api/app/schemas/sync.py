@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import Optional, Literal
+from pydantic import BaseModel
+
+from .category import CategoryResponse
+from .heritage import HeritageEntryResponse
+
+# Delta sync schemas
+# GET /heritage/changes streams one JSON object per line, ordered by version
+class SyncHeritageEntry(HeritageEntryResponse):
+    """Heritage entry created or updated since the sync token."""
+    type: Literal["heritage"] = "heritage"
+    version: int
+    updated_at: Optional[datetime] = None
+
+class SyncCategory(CategoryResponse):
+    """Category created or updated since the sync token."""
+    type: Literal["category"] = "category"
+    version: int
+    updated_at: Optional[datetime] = None
+
+class SyncTombstone(BaseModel):
+    """Record deleted since the sync token."""
+    type: Literal["tombstone"] = "tombstone"
+    entity: str  # "heritage" or "category"
+    id: int
+    version: int
+
+class SyncCheckpoint(BaseModel):
+    """Last line of a change stream: the token for the next request."""
+    type: Literal["checkpoint"] = "checkpoint"
+    token: str
+    has_more: bool
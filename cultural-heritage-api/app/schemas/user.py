@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 
 class UserBase(BaseModel):
@@ -29,6 +29,19 @@ class UserResponse(UserBase):
         """Pydantic configuration for ORM compatibility."""
         from_attributes = True
 
+class UserPage(BaseModel):
+    """One page of a keyset-paginated user listing."""
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page; None on the last page
+
+class UserDeletionProgress(BaseModel):
+    """Progress of a user deletion; the last report has done set."""
+    user_id: int
+    policy: str  # "reassign" or "cascade"
+    total: int  # Entries created by the user
+    processed: int
+    done: bool = False
+
 class UserLogin(BaseModel):
     """Schema for login requests."""
     username: str
@@ -38,6 +51,12 @@ class Token(BaseModel):
     """Schema for JWT token responses."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for token refresh and logout requests."""
+    refresh_token: str
 
 class TokenData(BaseModel):
     """Schema for token payload data."""
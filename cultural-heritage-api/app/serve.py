@@ -0,0 +1,39 @@
+"""
+Run the Cultural Heritage API with several worker processes.
+
+Run from the cultural-heritage-api directory:
+    python -m app.serve --workers 4 [--host 0.0.0.0] [--port 8000]
+
+Workers share one cache (a SQLite file next to the database, see
+CACHE_PATH) so invalidations are seen by all of them at once, and each
+worker follows the others' writes to keep its search indexes current.
+"""
+
+import argparse
+import os
+import sys
+
+import uvicorn
+
+
+def main(argv=None):
+    """Parse command line arguments and start uvicorn with several workers."""
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    # Workers are started as new processes and read these at import time
+    os.environ["HERITAGE_WORKERS"] = str(args.workers)
+    if args.workers > 1:
+        os.environ.setdefault("CACHE_BACKEND", "shared")
+
+    # Create or upgrade the schema once, before the workers start and race to do it
+    import app.main  # noqa: F401
+
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,20 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.database import get_db
 from app import models
 from app.core.security import verify_token
+from app.core.cache import cache
 
 # HTTP Bearer token scheme for JWT authentication
 security = HTTPBearer()
 
+# User columns kept in the cache: what authorization needs, never the
+# password hash (the shared backend stores values in a plain SQLite file)
+_CACHED_USER_COLUMNS = ("id", "username", "email", "role", "created_at")
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -30,7 +35,15 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
+    # Get user from the cache, falling back to the database
+    cached = cache.get("users", str(user_id))
+    if cached is not None:
+        # Attach without a query; the cached columns are trusted as current
+        # and anything else (the password hash) loads on first access
+        user = models.User(**cached)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
         raise HTTPException(
@@ -39,6 +52,10 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cache.set("users", str(user_id), {
+        column: getattr(user, column) for column in _CACHED_USER_COLUMNS
+    })
+
     return user
 
 def get_current_admin_user(current_user: models.User = Depends(get_current_user)) -> models.User:
@@ -0,0 +1,126 @@
+"""
+Benchmark content compression: stored size, database file size, read latency
+and substring-search scan time.
+
+Both the content and its normalized search form are stored per entry, as in
+heritage_contents; searches scan the normalized form through decompress_text().
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_compression
+"""
+
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+
+from app.core.compression import ContentCodec, zstandard
+from app.core.text import normalize_text
+
+ENTRIES = 5_000
+SAMPLES = 500
+
+# Boilerplate that recurs across entries, as in real heritage articles
+PHRASES = [
+    "is one of the oldest traditions of the Ethiopian highlands",
+    "according to oral history passed down through generations",
+    "the Ethiopian Orthodox Tewahedo Church",
+    "during the reign of Emperor",
+    "is celebrated every year by communities across the region",
+    "UNESCO World Heritage Site",
+]
+
+
+def random_content(rng: random.Random, vocabulary) -> str:
+    sentences = []
+    for _ in range(rng.randint(10, 60)):
+        words = rng.choices(vocabulary, k=rng.randint(6, 18))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(PHRASES))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def database_size(rows, codec: ContentCodec, term: str):
+    """
+    Write (content, normalized) rows into a fresh SQLite table.
+
+    Returns:
+        (file size in bytes, seconds for one LIKE scan of the normalized column)
+    """
+    handle, path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    try:
+        connection = sqlite3.connect(path)
+        connection.create_function("decompress_text", 1, codec.decompress, deterministic=True)
+        connection.execute("CREATE TABLE entries (id INTEGER PRIMARY KEY, content TEXT, content_normalized TEXT)")
+        connection.executemany("INSERT INTO entries (content, content_normalized) VALUES (?, ?)", rows)
+        connection.commit()
+        connection.execute("VACUUM")
+
+        start = time.perf_counter()
+        matches = connection.execute(
+            "SELECT count(*) FROM entries WHERE decompress_text(content_normalized) LIKE ?", (f"%{term}%",)
+        ).fetchone()[0]
+        scan_seconds = time.perf_counter() - start
+        assert matches > 0
+
+        connection.close()
+        return os.path.getsize(path), scan_seconds
+    finally:
+        os.remove(path)
+
+
+def main():
+    rng = random.Random(42)
+    # Zipf-like vocabulary: a few words are very common
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(5_000)]
+    vocabulary = words[:200] * 20 + words
+
+    contents = [random_content(rng, vocabulary) for _ in range(ENTRIES)]
+    normalized = [normalize_text(content) for content in contents]
+    raw_bytes = sum(len(value.encode("utf-8")) for value in contents + normalized)
+    samples = rng.sample(contents, SAMPLES)
+    term = normalize_text(PHRASES[0])
+
+    configurations = [("none", False), ("zlib", False), ("zlib", True)]
+    if zstandard is not None:
+        configurations += [("zstd", False), ("zstd", True)]
+    else:
+        print("zstandard not installed; skipping zstd")
+
+    print(f"{ENTRIES} entries, {raw_bytes / 1e6:.1f} MB raw text (content and normalized copy)")
+    print(f"{'mode':<14}{'stored MB':>10}{'ratio':>8}{'db MB':>8}{'read us':>10}{'scan ms':>10}")
+
+    for algorithm, with_dictionary in configurations:
+        codec = ContentCodec(algorithm=algorithm, threshold=1024)
+        if with_dictionary:
+            codec.set_dictionary(1, codec.train_dictionary(samples), active=True)
+
+        stored = [codec.compress(content) for content in contents]
+        stored_normalized = [codec.compress(value) for value in normalized]
+        stored_bytes = sum(
+            len(value) if isinstance(value, bytes) else len(value.encode("utf-8"))
+            for value in stored + stored_normalized
+        )
+
+        start = time.perf_counter()
+        for value in stored:
+            codec.decompress(value)
+        read_us = (time.perf_counter() - start) / len(stored) * 1e6
+
+        assert [codec.decompress(value) for value in stored[:100]] == contents[:100]
+        assert [codec.decompress(value) for value in stored_normalized[:100]] == normalized[:100]
+
+        db_bytes, scan_seconds = database_size(list(zip(stored, stored_normalized)), codec, term)
+        label = algorithm + ("+dict" if with_dictionary else "")
+        print(
+            f"{label:<14}{stored_bytes / 1e6:>10.2f}{raw_bytes / stored_bytes:>8.2f}"
+            f"{db_bytes / 1e6:>8.2f}{read_us:>10.1f}{scan_seconds * 1e3:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
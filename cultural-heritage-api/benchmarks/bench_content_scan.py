@@ -0,0 +1,116 @@
+"""
+Benchmark metadata scans with content stored inline vs. in its own table.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_content_scan
+"""
+
+import os
+import random
+import sqlite3
+import string
+import tempfile
+import time
+
+ENTRIES = 20_000
+CONTENT_SIZES = [512, 4_096, 16_384]
+REPEATS = 5
+
+INLINE_SCHEMA = """
+CREATE TABLE heritage_entries (
+    id INTEGER PRIMARY KEY, title TEXT, content TEXT, content_normalized TEXT,
+    category_id INTEGER, created_by INTEGER, version INTEGER
+)
+"""
+
+SPLIT_SCHEMA = """
+CREATE TABLE heritage_entries (
+    id INTEGER PRIMARY KEY, title TEXT, category_id INTEGER, created_by INTEGER, version INTEGER
+);
+CREATE TABLE heritage_contents (
+    heritage_id INTEGER PRIMARY KEY, content TEXT, content_normalized TEXT
+)
+"""
+
+# Queries the listing endpoint runs that never need content
+QUERIES = {
+    "count by category": "SELECT COUNT(*) FROM heritage_entries WHERE category_id = 3",
+    "facet counts": "SELECT category_id, COUNT(*) FROM heritage_entries GROUP BY category_id",
+    "page deep offset": (
+        "SELECT id, title, category_id FROM heritage_entries "
+        "WHERE created_by = 2 ORDER BY id LIMIT 20 OFFSET 2000"
+    ),
+}
+
+
+def build(path: str, split: bool, content_size: int, rng: random.Random):
+    connection = sqlite3.connect(path)
+    connection.executescript(SPLIT_SCHEMA if split else INLINE_SCHEMA)
+
+    # Slices of one random text are cheap to make and still incompressible
+    text = "".join(rng.choices(string.ascii_lowercase + " ", k=content_size * 64))
+
+    rows = []
+    for heritage_id in range(1, ENTRIES + 1):
+        title = "".join(rng.choices(string.ascii_lowercase, k=12))
+        start = rng.randrange(len(text) - content_size)
+        content = text[start:start + content_size]
+        rows.append((heritage_id, title, content, rng.randint(1, 10), rng.randint(1, 20)))
+
+    if split:
+        connection.executemany(
+            "INSERT INTO heritage_entries VALUES (?, ?, ?, ?, 0)",
+            ((i, t, cat, by) for i, t, _, cat, by in rows)
+        )
+        connection.executemany(
+            "INSERT INTO heritage_contents VALUES (?, ?, ?)",
+            ((i, c, c) for i, _, c, _, _ in rows)
+        )
+    else:
+        connection.executemany(
+            "INSERT INTO heritage_entries VALUES (?, ?, ?, ?, ?, ?, 0)",
+            ((i, t, c, c, cat, by) for i, t, c, cat, by in rows)
+        )
+    connection.commit()
+    connection.close()
+
+
+def time_query(path: str, sql: str) -> float:
+    """Best-of-N time in milliseconds, on a fresh connection each run."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        connection = sqlite3.connect(path)
+        start = time.perf_counter()
+        connection.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - start)
+        connection.close()
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    directory = tempfile.mkdtemp()
+
+    print(f"{ENTRIES} entries")
+    print(f"{'content':>8}  {'query':<20}{'inline ms':>10}{'split ms':>10}{'speedup':>9}")
+
+    for content_size in CONTENT_SIZES:
+        paths = {}
+        for split in (False, True):
+            path = os.path.join(directory, f"{'split' if split else 'inline'}_{content_size}.db")
+            build(path, split, content_size, rng)
+            paths[split] = path
+
+        for name, sql in QUERIES.items():
+            inline_ms = time_query(paths[False], sql)
+            split_ms = time_query(paths[True], sql)
+            print(f"{content_size:>8}  {name:<20}{inline_ms:>10.2f}{split_ms:>10.2f}{inline_ms / split_ms:>8.1f}x")
+
+        for path in paths.values():
+            os.remove(path)
+
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
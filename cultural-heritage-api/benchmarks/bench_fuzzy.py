@@ -0,0 +1,51 @@
+"""
+Benchmark typo-tolerant search latency against corpus size.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_fuzzy
+"""
+
+import random
+import string
+import time
+
+from app.core.trigram_index import TrigramIndex
+
+CORPUS_SIZES = [10_000, 100_000, 500_000]
+QUERIES = 200
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Replace one character, as a transliteration variant would."""
+    position = rng.randrange(len(word))
+    return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+
+
+def main():
+    rng = random.Random(42)
+    vocabulary = [random_word(rng) for _ in range(20_000)]
+
+    for size in CORPUS_SIZES:
+        titles = [" ".join(rng.choices(vocabulary, k=rng.randint(2, 5))) for _ in range(size)]
+
+        index = TrigramIndex(index_content=False)
+        start = time.perf_counter()
+        for heritage_id, title in enumerate(titles, start=1):
+            index.add(heritage_id, title)
+        build_seconds = time.perf_counter() - start
+
+        queries = [misspell(rng.choice(titles).split()[0], rng) for _ in range(QUERIES)]
+        start = time.perf_counter()
+        for query in queries:
+            index.search(query, limit=20)
+        per_query_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+        print(f"{size:>9,} titles: build {build_seconds:6.2f} s, search {per_query_ms:7.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
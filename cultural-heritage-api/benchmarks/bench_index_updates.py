@@ -0,0 +1,90 @@
+"""
+Benchmark replacing entries in the in-memory search and trigram indexes.
+
+Every edit re-adds the entry, so replacing must cost about as much as the
+entry's own terms, not a pass over the whole index. Results are checked
+against an index built from scratch with the final texts.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_index_updates
+"""
+
+import random
+import string
+import time
+
+from app.core.search_index import SearchIndex
+from app.core.trigram_index import TrigramIndex
+
+ENTRIES = 20_000
+TOKENS = 300
+REPLACES = 200
+QUERIES = 50
+
+
+def random_text(rng: random.Random, vocabulary, tokens: int) -> str:
+    return " ".join(rng.choices(vocabulary, k=tokens))
+
+
+def main():
+    rng = random.Random(42)
+    # Zipf-like vocabulary: a few words are in nearly every entry
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(20_000)]
+    vocabulary = words[:200] * 50 + words
+
+    titles = {doc_id: random_text(rng, vocabulary, 4) for doc_id in range(1, ENTRIES + 1)}
+    contents = {doc_id: random_text(rng, vocabulary, TOKENS) for doc_id in titles}
+
+    index = SearchIndex(path="/dev/null")
+    for doc_id in titles:
+        index.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7, 1)
+
+    edited = rng.sample(list(titles), REPLACES)
+    start = time.perf_counter()
+    for doc_id in edited:
+        titles[doc_id] = random_text(rng, vocabulary, 4)
+        contents[doc_id] = random_text(rng, vocabulary, TOKENS)
+        index.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7, 1)
+    replace_ms = (time.perf_counter() - start) / REPLACES * 1000
+
+    removed = rng.sample([doc_id for doc_id in titles if doc_id not in edited], 1_000)
+    start = time.perf_counter()
+    index.remove_many(removed)
+    remove_ms = (time.perf_counter() - start) * 1000
+    for doc_id in removed:
+        del titles[doc_id], contents[doc_id]
+
+    fresh = SearchIndex(path="/dev/null")
+    for doc_id in titles:
+        fresh.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7, 1)
+
+    for _ in range(QUERIES):
+        query = " ".join(rng.choices(words, k=2))
+        assert index.search(query, k=20) == fresh.search(query, k=20), query
+
+    print(f"{ENTRIES} entries of {TOKENS} tokens")
+    print(f"search index, replace one entry: {replace_ms:8.2f} ms")
+    print(f"search index, remove 1000 entries: {remove_ms:6.1f} ms")
+
+    trigram = TrigramIndex(index_content=True)
+    for doc_id in titles:
+        trigram.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7)
+
+    start = time.perf_counter()
+    for doc_id in edited:
+        titles[doc_id] = random_text(rng, vocabulary, 4)
+        trigram.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7)
+    trigram_ms = (time.perf_counter() - start) / REPLACES * 1000
+
+    fresh_trigram = TrigramIndex(index_content=True)
+    for doc_id in titles:
+        fresh_trigram.add(doc_id, titles[doc_id], contents[doc_id], doc_id % 7)
+    for doc_id in edited[:QUERIES]:
+        query = titles[doc_id]
+        assert trigram.search(query, 20) == fresh_trigram.search(query, 20), query
+
+    print(f"trigram index (with content), replace one entry: {trigram_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
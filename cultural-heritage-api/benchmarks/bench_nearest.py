@@ -0,0 +1,74 @@
+"""
+Benchmark nearest-place queries on the in-memory geo index.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_nearest
+
+Covers dense and sparse indexes and category filters with few matches:
+when fewer than k places match, the search must stop after the last
+occupied cell instead of walking the whole grid. Results are checked
+against a brute-force scan.
+"""
+
+import random
+import time
+
+from app.core.geo_index import GeoIndex, haversine_km
+
+QUERIES = 200
+# Sparse queries must not come near a walk over all ~259k cells (over a second)
+MAX_SPARSE_MS = 50
+
+
+def brute_force(places, latitude, longitude, k, category_id=None):
+    distances = sorted(
+        (haversine_km(latitude, longitude, place_lat, place_lon), heritage_id)
+        for heritage_id, (place_lat, place_lon, place_category) in places.items()
+        if category_id is None or place_category == category_id
+    )
+    return [heritage_id for _, heritage_id in distances[:k]]
+
+
+def run(name: str, places, k: int, category_id=None, check_limit: bool = False):
+    index = GeoIndex()
+    for heritage_id, (latitude, longitude, place_category) in places.items():
+        index.add(heritage_id, f"Place {heritage_id}", place_category, latitude, longitude)
+
+    rng = random.Random(7)
+    points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(QUERIES)]
+
+    start = time.perf_counter()
+    results = [index.nearest(latitude, longitude, k, category_id) for latitude, longitude in points]
+    per_query = (time.perf_counter() - start) / QUERIES * 1000
+
+    for (latitude, longitude), result in zip(points, results):
+        expected = brute_force(places, latitude, longitude, k, category_id)
+        assert [heritage_id for heritage_id, _, _ in result] == expected, (name, latitude, longitude)
+    if check_limit:
+        assert per_query < MAX_SPARSE_MS, f"{name}: {per_query:.1f} ms per query"
+
+    print(f"{name:>28}{len(places):>9}{per_query:>12.2f}")
+
+
+def main():
+    rng = random.Random(42)
+    dense = {
+        heritage_id: (rng.uniform(3, 15), rng.uniform(33, 48), heritage_id % 5)
+        for heritage_id in range(1, 100_001)
+    }
+    sparse = {
+        heritage_id: (rng.uniform(-60, 60), rng.uniform(-180, 180), 1)
+        for heritage_id in range(1, 7)
+    }
+    # One entry of category 9 among many of others
+    dense[100_001] = (9.0, 38.7, 9)
+
+    print(f"{'case':>28}{'places':>9}{'ms/query':>12}")
+    run("empty index", {}, 10, check_limit=True)
+    run("6 places, k=10", sparse, 10, check_limit=True)
+    run("dense, k=10", dense, 10)
+    run("dense, rare category, k=10", dense, 10, category_id=9, check_limit=True)
+
+
+if __name__ == "__main__":
+    main()
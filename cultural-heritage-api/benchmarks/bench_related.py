@@ -0,0 +1,97 @@
+"""
+Benchmark computing related entries with sparse matrix products vs pure Python.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_related
+
+"python" scores one entry against every other with dict-based cosine
+similarity, which is what a per-request computation would cost; "sparse"
+is app.core.related, which scores a block of entries against the whole
+corpus in one scipy product. Needs numpy and scipy.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+_directory = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/bench.db"
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import engine, Base, SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.core.related import Corpus  # noqa: E402
+
+ENTRIES = 20_000
+WORDS_PER_ENTRY = 120
+VOCABULARY = 20_000
+SAMPLE = 50
+BLOCK_SIZE = 256
+
+
+def python_related(vectors, position: int, k: int = 10):
+    query = vectors[position]
+    scores = []
+    for other, vector in enumerate(vectors):
+        if other != position:
+            scores.append((sum(weight * vector.get(term, 0.0) for term, weight in query.items()), other))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def main():
+    random.seed(7)
+    # Zipf-like word frequencies, as in natural text
+    words = [f"w{rank}" for rank in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.User).values(
+            id=1, username="bench", email="bench@example.com", hashed_password="x", role="admin"
+        ))
+        connection.execute(insert(models.Category).values(id=1, name="Places"))
+        connection.execute(insert(models.HeritageEntry), [
+            {"id": i, "title": " ".join(random.choices(words, weights, k=4)), "category_id": 1,
+             "created_by": 1, "version": i}
+            for i in range(1, ENTRIES + 1)
+        ])
+        connection.execute(insert(models.HeritageContent), [
+            {"heritage_id": i, "content": " ".join(random.choices(words, weights, k=WORDS_PER_ENTRY))}
+            for i in range(1, ENTRIES + 1)
+        ])
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    corpus = Corpus.load(db)
+    load = time.perf_counter() - start
+    db.close()
+
+    # The same normalized vectors as dicts, for the pure Python version
+    matrix = corpus.vectors
+    vectors = [
+        dict(zip(matrix.indices[matrix.indptr[i]:matrix.indptr[i + 1]].tolist(),
+                 matrix.data[matrix.indptr[i]:matrix.indptr[i + 1]].tolist()))
+        for i in range(len(corpus))
+    ]
+
+    start = time.perf_counter()
+    for position in range(SAMPLE):
+        python_related(vectors, position)
+    python_per_entry = (time.perf_counter() - start) / SAMPLE
+
+    start = time.perf_counter()
+    for block_start in range(0, len(corpus), BLOCK_SIZE):
+        corpus.top_related(list(range(block_start, min(block_start + BLOCK_SIZE, len(corpus)))))
+    sparse_total = time.perf_counter() - start
+
+    print(f"{ENTRIES} entries of ~{WORDS_PER_ENTRY} words; vectorizing took {load:.1f} s")
+    print(f"{'':>8}{'ms/entry':>10}{'all entries (s)':>18}")
+    print(f"{'python':>8}{python_per_entry * 1e3:>10.1f}{python_per_entry * ENTRIES:>18.0f}")
+    print(f"{'sparse':>8}{sparse_total / ENTRIES * 1e3:>10.2f}{sparse_total:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark building a size=100 listing page from ORM entities vs Core rows.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_row_fetching
+
+"orm" is how the listing used to load rows (HeritageEntry entities plus
+selectinload of the content); "core" is the current _list_heritage_entries.
+Both build the same HeritageEntryResponse objects, so the difference is the
+per-row cost of identity-map registration and instance state. Memory is the
+tracemalloc peak while building one page.
+"""
+
+import importlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+_directory = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/bench.db"
+os.environ["PAGE_SNAPSHOTS"] = "false"
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.database import engine, Base, SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.schemas import HeritageEntryResponse  # noqa: E402
+
+heritage = importlib.import_module("app.routers.heritage")
+
+ENTRIES = 10_000
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def orm_page(db, page: int):
+    items = db.query(
+        models.HeritageEntry,
+        models.Category.name.label('category_name'),
+        models.User.username.label('creator_username')
+    ).join(
+        models.Category, models.HeritageEntry.category_id == models.Category.id
+    ).join(
+        models.User, models.HeritageEntry.created_by == models.User.id
+    ).options(
+        selectinload(models.HeritageEntry.body)
+    ).offset((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).all()
+
+    return [
+        HeritageEntryResponse(
+            id=entry.id,
+            title=entry.title,
+            content=entry.content,
+            category_id=entry.category_id,
+            created_by=entry.created_by,
+            created_at=entry.created_at,
+            category_name=category_name,
+            creator_username=creator_username
+        ) for entry, category_name, creator_username in items
+    ]
+
+
+def core_page(db, page: int):
+    return heritage._list_heritage_entries(db, page, PAGE_SIZE, None, None, False, False, set()).items
+
+
+def measure(build) -> (float, int):
+    # A fresh session per page, as each request gets one
+    pages = ENTRIES // PAGE_SIZE
+    start = time.process_time()
+    for round_number in range(ROUNDS):
+        db = SessionLocal()
+        build(db, round_number % pages + 1)
+        db.close()
+    cpu = time.process_time() - start
+
+    db = SessionLocal()
+    tracemalloc.start()
+    build(db, 1)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+
+    rows = ROUNDS * PAGE_SIZE
+    return cpu / rows * 1e6, peak
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(models.User).values(
+            id=1, username="bench", email="bench@example.com", hashed_password="x", role="admin"
+        ))
+        connection.execute(insert(models.Category).values(id=1, name="Places"))
+        connection.execute(insert(models.HeritageEntry), [
+            {"id": i, "title": f"Rock-hewn church {i}", "category_id": 1, "created_by": 1, "version": i}
+            for i in range(1, ENTRIES + 1)
+        ])
+        connection.execute(insert(models.HeritageContent), [
+            {"heritage_id": i, "content": "Carved from a single block of volcanic rock. " * 10}
+            for i in range(1, ENTRIES + 1)
+        ])
+
+    # Warm up connections and statement caches
+    measure(orm_page)
+    measure(core_page)
+
+    print(f"{ROUNDS} pages of {PAGE_SIZE} rows from {ENTRIES} entries")
+    print(f"{'':>6}{'us/row':>10}{'peak KiB/page':>16}")
+    for name, build in (("orm", orm_page), ("core", core_page)):
+        per_row, peak = measure(build)
+        print(f"{name:>6}{per_row:>10.1f}{peak / 1024:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark SSE fan-out with thousands of idle subscribers.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_sse [number_of_subscribers]
+"""
+
+import asyncio
+import importlib
+import sys
+import time
+import tracemalloc
+
+from app.core import events
+
+# app.routers re-exports the router objects, so fetch the module itself
+heritage_router = importlib.import_module("app.routers.heritage")
+
+
+class IdleRequest:
+    """Stand-in for a connected client that never disconnects."""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+async def consume(broadcaster: events.Broadcaster, received: list, expected: int, done: asyncio.Event):
+    subscription, replay, gap = broadcaster.subscribe()
+    stream = heritage_router._event_stream(IdleRequest(), subscription, replay, gap)
+    async for message in stream:
+        if message.startswith("id:"):
+            received[0] += 1
+            if received[0] == expected:
+                done.set()
+
+
+async def run(subscriber_count: int, event_count: int = 20):
+    broadcaster = events.Broadcaster(max_subscribers=subscriber_count)
+    heritage_router.heritage_events = broadcaster
+
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+
+    received = [0]
+    done = asyncio.Event()
+    expected = subscriber_count * event_count
+    tasks = [
+        asyncio.create_task(consume(broadcaster, received, expected, done))
+        for _ in range(subscriber_count)
+    ]
+    await asyncio.sleep(0.5)  # Let every subscriber connect and go idle
+
+    memory = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+    tracemalloc.stop()
+    print(f"{subscriber_count:,} idle subscribers: {memory / subscriber_count / 1024:.1f} KiB each")
+
+    payload = {"id": 1, "title": "Lalibela", "category_name": "Places"}
+    start = time.perf_counter()
+    for _ in range(event_count):
+        broadcaster.publish("created", payload)
+    publish_ms = (time.perf_counter() - start) * 1000 / event_count
+
+    await asyncio.wait_for(done.wait(), timeout=60)
+    delivered_ms = (time.perf_counter() - start) * 1000
+
+    print(f"publish: {publish_ms:.2f} ms per event (fan-out to all queues)")
+    print(f"delivery: {event_count} events to all subscribers in {delivered_ms:.0f} ms "
+          f"({expected / delivered_ms * 1000:,.0f} messages/s), dropped {broadcaster.dropped}")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    subscriber_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    asyncio.run(run(subscriber_count))
+
+
+if __name__ == "__main__":
+    main()
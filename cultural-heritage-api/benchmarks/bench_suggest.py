@@ -0,0 +1,52 @@
+"""
+Benchmark title suggestions from the in-memory prefix index.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_suggest [number_of_titles]
+"""
+
+import random
+import string
+import sys
+import time
+
+from app.core.prefix_index import PrefixIndex
+
+
+def random_title(rng: random.Random) -> str:
+    """Generate a title of two to five random words."""
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+        for _ in range(rng.randint(2, 5))
+    ]
+    return " ".join(words).title()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+
+    titles = {heritage_id: random_title(rng) for heritage_id in range(1, count + 1)}
+
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.load_titles(titles)
+    print(f"built index over {count:,} titles in {time.perf_counter() - start:.2f} s")
+
+    # Prefixes of one to four characters, typed as a user would
+    prefixes = [titles[rng.randint(1, count)][:rng.randint(1, 4)] for _ in range(10_000)]
+
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.suggest(prefix, limit=10)
+    elapsed = time.perf_counter() - start
+    print(f"suggest: {elapsed / len(prefixes) * 1e6:.1f} µs per query ({len(prefixes):,} queries)")
+
+    start = time.perf_counter()
+    for heritage_id in range(count + 1, count + 1001):
+        index.add(heritage_id, random_title(rng))
+    print(f"incremental add: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs per title")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark heritage insert throughput with and without group commit.
+
+Run from the cultural-heritage-api directory:
+    python -m benchmarks.bench_write_batching
+
+Uses a throwaway SQLite file in the temp directory, so commits pay a real
+fsync. "per-request" runs each writer in its own thread with its own
+commit, as concurrent requests do without coalescing.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+_directory = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_directory}/bench.db"
+
+from app.database import engine, Base, SessionLocal  # noqa: E402
+from app import models  # noqa: E402
+from app.core.write_coalescer import WriteCoalescer  # noqa: E402
+
+WRITER_COUNTS = [1, 10, 100]
+INSERTS = 1000
+
+
+def insert_entry(session) -> int:
+    entry = models.HeritageEntry(
+        title="Fasil Ghebbi", content="Royal enclosure in Gondar", category_id=1, created_by=1
+    )
+    session.add(entry)
+    session.flush()
+    return entry.id
+
+
+def per_request(writers: int) -> (float, int):
+    errors = [0]
+
+    def writer(count: int):
+        for _ in range(count):
+            db = SessionLocal()
+            try:
+                insert_entry(db)
+                db.commit()
+            except Exception:
+                errors[0] += 1  # e.g. "database is locked"
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer, args=(INSERTS // writers,)) for _ in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, errors[0]
+
+
+def group_commit(writers: int) -> (float, int, WriteCoalescer):
+    coalescer = WriteCoalescer(enabled=True)
+    errors = [0]
+
+    async def writer(count: int):
+        for _ in range(count):
+            try:
+                await coalescer.run(insert_entry, None)
+            except Exception:
+                errors[0] += 1
+
+    async def main():
+        await asyncio.gather(*(writer(INSERTS // writers) for _ in range(writers)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    coalescer.stop()
+    return elapsed, errors[0], coalescer
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(models.User(username="bench", email="bench@example.com", hashed_password="x", role="admin"))
+    db.add(models.Category(name="Places"))
+    db.commit()
+    db.close()
+
+    print(f"{INSERTS} inserts per run")
+    print(f"{'writers':>8}{'per-request/s':>15}{'errors':>8}{'group/s':>10}{'errors':>8}{'rows/batch':>12}")
+    for writers in WRITER_COUNTS:
+        plain_seconds, plain_errors = per_request(writers)
+        group_seconds, group_errors, coalescer = group_commit(writers)
+        print(
+            f"{writers:>8}{INSERTS / plain_seconds:>15.0f}{plain_errors:>8}"
+            f"{INSERTS / group_seconds:>10.0f}{group_errors:>8}"
+            f"{coalescer.committed / max(coalescer.batches, 1):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@ Provides a clean, user-friendly interface to explore cultural heritage content.
 
 import streamlit as st
 import os
-from pathlib import Path
+
+from services.pages import page_registry, PageLoadError
 
 # Configure page settings
 st.set_page_config(
@@ -68,35 +69,30 @@ def main():
     pages = {
         "🏠 Home": "1_Home.py",
         "📂 Categories": "2_Categories.py",
-        "🔍 Explore Heritage": "3_Explore.py"
+        "🔍 Explore Heritage": "3_Explore.py",
+        "🗺️ Places Map": "4_Map.py"
     }
 
     selected_page = st.sidebar.radio("Go to", list(pages.keys()))
 
     # Load and display the selected page
+    # Page modules are imported once and reused across reruns
     page_file = pages[selected_page]
-    page_path = Path(__file__).parent / "pages" / page_file
-
-    if page_path.exists():
-        # Import and run the page module
-        page_name = page_file.replace(".py", "")
-        try:
-            # Dynamic import of page modules
-            import importlib.util
-            spec = importlib.util.spec_from_file_location(page_name, page_path)
-            page_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(page_module)
 
-            # Call the main function if it exists
-            if hasattr(page_module, 'main'):
-                page_module.main()
-            else:
-                st.error(f"Page {page_file} does not have a main() function")
+    try:
+        page_registry.render(page_file)
+    except PageLoadError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading page {page_file}: {str(e)}")
 
-        except Exception as e:
-            st.error(f"Error loading page {page_file}: {str(e)}")
-    else:
-        st.error(f"Page {page_file} not found")
+    # Show rerun overhead when running in dev mode
+    timings = page_registry.timings(page_file)
+    if page_registry.dev_mode and timings:
+        st.sidebar.caption(
+            f"⏱️ load {timings['load_ms']:.1f} ms · render {timings['render_ms']:.1f} ms · "
+            f"{int(timings['loads'])} loads / {int(timings['hits'])} cache hits"
+        )
 
     # Footer
     st.sidebar.markdown("---")
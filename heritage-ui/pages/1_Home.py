@@ -83,6 +83,22 @@ def main():
             with col3:
                 st.metric("Cultures Represented", "Multiple")
 
+            # What readers are looking at
+            trending = api_client.get_trending_entries(limit=5)
+            popular = api_client.get_popular_entries(limit=5)
+            if trending or popular:
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.markdown("#### 🔥 Trending Now")
+                    for entry in trending:
+                        st.markdown(f"- {entry['title']}")
+
+                with col2:
+                    st.markdown("#### 🏆 Most Viewed")
+                    for entry in popular:
+                        st.markdown(f"- {entry['title']} ({entry['views']} views)")
+
         except Exception as e:
             st.warning("Unable to load platform statistics at this time.")
     else:
@@ -1,5 +1,44 @@
+import io
+
+import pandas as pd
 import streamlit as st
-from services.api import api_client
+from services.api import api_client, APIError
+
+# Columns of the entries snapshot needed for the category statistics
+STATS_COLUMNS = ["id", "category_id", "view_count", "latitude", "start_year", "end_year"]
+
+def load_category_stats():
+    """
+    Aggregate per-category statistics from the latest analytics snapshot.
+
+    Only the needed columns are read from the Parquet file, so this is one
+    download and no per-category API calls.
+
+    Returns:
+        DataFrame indexed by category ID, or None if there is no snapshot
+    """
+    try:
+        data = api_client.get_analytics_table("heritage_entries")
+    except APIError:
+        return None
+    if data is None:
+        return None
+
+    entries = pd.read_parquet(io.BytesIO(data), columns=STATS_COLUMNS)
+    return entries.groupby("category_id").agg(
+        entries=("id", "size"),
+        views=("view_count", "sum"),
+        located=("latitude", "count"),
+        earliest=("start_year", "min"),
+        latest=("end_year", "max")
+    )
+
+def entry_count(category_id: int, stats) -> int:
+    """Number of entries in a category, from the snapshot if there is one."""
+    if stats is not None:
+        return int(stats["entries"].get(category_id, 0))
+    heritage_data = api_client.get_heritage_entries(category_id=category_id, page=1, size=1)
+    return heritage_data.get('total', 0)
 
 def main():
     """Render the categories page content."""
@@ -24,6 +63,9 @@ def main():
             st.info("No categories available yet. Check back later!")
             return
 
+        # Aggregates from the analytics snapshot, when one has been exported
+        stats = load_category_stats()
+
         # Display categories in a grid
         st.markdown(f"### Found {len(categories)} Categories")
 
@@ -49,14 +91,7 @@ def main():
                     # Quick stats for this category
                     try:
                         # Get count of entries in this category
-                        heritage_data = api_client.get_heritage_entries(
-                            category_id=category['id'],
-                            page=1,
-                            size=1
-                        )
-                        entry_count = heritage_data.get('total', 0)
-
-                        st.metric("Heritage Entries", entry_count)
+                        st.metric("Heritage Entries", entry_count(category['id'], stats))
 
                     except Exception:
                         st.write("📚 Heritage entries available")
@@ -81,25 +116,29 @@ def main():
         category_summary = []
         for category in categories:
             try:
-                heritage_data = api_client.get_heritage_entries(
-                    category_id=category['id'],
-                    page=1,
-                    size=1
-                )
-                entry_count = heritage_data.get('total', 0)
+                count = entry_count(category['id'], stats)
             except:
-                entry_count = 0
+                count = 0
 
-            category_summary.append({
+            row = {
                 "Category": category['name'],
                 "Description": category.get('description', 'N/A')[:50] + '...' if category.get('description') and len(category.get('description', '')) > 50 else category.get('description', 'N/A'),
-                "Entries": entry_count
-            })
+                "Entries": count
+            }
+            if stats is not None and category['id'] in stats.index:
+                category_stats = stats.loc[category['id']]
+                row["Views"] = int(category_stats["views"])
+                row["Located"] = int(category_stats["located"])
+                if pd.notna(category_stats["earliest"]):
+                    row["Earliest Year"] = int(category_stats["earliest"])
+                    row["Latest Year"] = int(category_stats["latest"])
+            category_summary.append(row)
 
         if category_summary:
-            import pandas as pd
             df = pd.DataFrame(category_summary)
             st.dataframe(df, use_container_width=True)
+            if stats is not None:
+                st.caption("Statistics from the latest analytics snapshot; entries added since are not counted yet.")
 
         # Tips section
         st.markdown("---")
@@ -1,5 +1,15 @@
 import streamlit as st
-from services.api import api_client
+from services.api import api_client, APIError
+
+def format_year(year: int) -> str:
+    """Format a historical year, with BCE for negative years."""
+    return f"{-year} BCE" if year < 0 else str(year)
+
+def format_period(start_year: int, end_year) -> str:
+    """Format an entry's historical period."""
+    if end_year is None or end_year == start_year:
+        return format_year(start_year)
+    return f"{format_year(start_year)} – {format_year(end_year)}"
 
 def main():
     """Render the explore heritage page content."""
@@ -31,12 +41,14 @@ def main():
                 help="Search across heritage entry titles and content"
             )
 
-        with col2:
-            selected_category_name = st.selectbox(
-                "📂 Filter by Category",
-                options=list(category_options.keys()),
-                help="Narrow down results to a specific cultural category"
-            )
+            # Matching titles from the type-ahead index
+            if search_query:
+                try:
+                    suggestions = api_client.suggest_titles(search_query, limit=5)
+                except APIError:
+                    suggestions = []  # Suggestions are optional; the search below still runs
+                if suggestions:
+                    st.caption("💡 " + " · ".join(s['title'] for s in suggestions))
 
         with col3:
             page_size = st.selectbox(
@@ -45,6 +57,32 @@ def main():
                 help="Number of entries to display per page"
             )
 
+        search_mode = st.radio(
+            "Search mode",
+            options=["Exact", "Relevance", "Typo-tolerant"],
+            horizontal=True,
+            help="Exact matches text as typed, Relevance ranks the best matches first, "
+                 "Typo-tolerant also finds spelling variants"
+        )
+
+        # Optional historical period; negative years are BCE
+        with st.expander("🏺 Historical period"):
+            col_from, col_to = st.columns(2)
+            with col_from:
+                year_from = st.number_input("From year", value=None, step=1, help="Use negative years for BCE")
+            with col_to:
+                year_to = st.number_input("To year", value=None, step=1, help="Use negative years for BCE")
+
+        if year_from is not None and year_to is not None and year_from > year_to:
+            st.warning("From year must not be after To year.")
+            return
+
+        # The category selectbox is drawn after fetching so it can show live counts;
+        # its current value is already in session state on every rerun
+        selected_category_name = st.session_state.get("explore_category")
+        if selected_category_name not in category_options:
+            selected_category_name = next(iter(category_options))
+
         # Get selected category ID
         selected_category_id = category_options[selected_category_name]
 
@@ -65,13 +103,41 @@ def main():
         if st.button("🔍 Search", type="primary"):
             st.session_state.current_page = 1  # Reset to first page on new search
 
+        # Filters shared by the fetch and the background prefetch
+        filters = {
+            "size": page_size,
+            "search": search_query if search_query else None,
+            "category_id": selected_category_id,
+            "ranked": search_mode == "Relevance",
+            "fuzzy": search_mode == "Typo-tolerant",
+            "facets": ["category"],
+            "year_from": int(year_from) if year_from is not None else None,
+            "year_to": int(year_to) if year_to is not None else None
+        }
+
         # Fetch heritage entries
         with st.spinner("Searching cultural heritage..."):
             heritage_data = api_client.get_heritage_entries(
                 page=st.session_state.current_page,
-                size=page_size,
-                search=search_query if search_query else None,
-                category_id=selected_category_id
+                **filters
+            )
+
+        # Per-category match counts for the current search
+        facets = heritage_data.get('facets') or {}
+        category_counts = {
+            facet['name']: facet['count'] for facet in facets.get('categories') or []
+        }
+
+        with col2:
+            st.selectbox(
+                "📂 Filter by Category",
+                options=list(category_options.keys()),
+                key="explore_category",
+                format_func=lambda name: (
+                    f"{name} ({sum(category_counts.values())})" if name == "All Categories"
+                    else f"{name} ({category_counts.get(name, 0)})"
+                ),
+                help="Narrow down results to a specific cultural category"
             )
 
         # Display results
@@ -101,24 +167,59 @@ def main():
                     with col2:
                         st.markdown(f"**Category:** {item.get('category_name', 'Unknown')}")
                         st.markdown(f"**Created:** {item['created_at'][:10]}")
+                        if item.get('start_year') is not None:
+                            period = format_period(item['start_year'], item.get('end_year'))
+                            st.markdown(f"**Period:** {period}")
                         if item.get('creator_username'):
                             st.markdown(f"**By:** {item['creator_username']}")
 
-                    # Content preview (truncated for readability)
+                    # The listing only carries a preview; long entries are
+                    # loaded from the content endpoint a chunk at a time
                     content = item['content']
-                    if len(content) > 500:
-                        content = content[:500] + "..."
-                        show_full = st.button(f"Read more about '{item['title']}'", key=f"read_more_{item['id']}")
-                        if show_full:
-                            st.markdown("**Full Content:**")
-                            st.write(item['content'])
-                        else:
-                            st.write(content)
+                    truncated = item.get('content_length', 0) > len(content.encode("utf-8"))
+                    loaded_key = f"content_{item['id']}"
+                    loaded = st.session_state.get(loaded_key)
+                    if loaded is not None:
+                        data, total_bytes = loaded
+                        st.markdown("**Full Content:**")
+                        # A chunk may end mid-character; the rest arrives with the next one
+                        st.write(data.decode("utf-8", errors="ignore"))
+                        if len(data) < total_bytes:
+                            percent = len(data) * 100 // total_bytes
+                            if st.button(f"Load more ({percent}% shown)", key=f"load_more_{item['id']}"):
+                                chunk, total_bytes = api_client.get_heritage_content(item['id'], start=len(data))
+                                st.session_state[loaded_key] = (data + chunk, total_bytes)
+                                st.rerun()
+                    elif truncated:
+                        st.write(content + "...")
+                        if st.button(f"Read more about '{item['title']}'", key=f"read_more_{item['id']}"):
+                            st.session_state[loaded_key] = api_client.get_heritage_content(item['id'])
+                            st.rerun()
                     else:
                         st.write(content)
 
+                    # Precomputed similar entries, fetched on demand
+                    related_key = f"related_{item['id']}"
+                    related = st.session_state.get(related_key)
+                    if related is None:
+                        if st.button("🔗 Related entries", key=f"show_related_{item['id']}"):
+                            st.session_state[related_key] = api_client.get_related_entries(item['id'])
+                            st.rerun()
+                    elif related:
+                        st.markdown("**Related:** " + " · ".join(
+                            f"{entry['title']} ({entry['category_name']})" for entry in related
+                        ))
+                    else:
+                        st.caption("No related entries yet.")
+
                     st.markdown('</div>', unsafe_allow_html=True)
 
+            # Warm the client cache with the neighbouring pages so Previous/Next is instant
+            api_client.prefetch_heritage_pages(
+                [p for p in (current_page + 1, current_page - 1) if 1 <= p <= total_pages],
+                **filters
+            )
+
             # Pagination controls
             st.markdown("---")
 
@@ -169,6 +270,7 @@ def main():
             - Partial matches are supported
             - Case-insensitive search
             - Multiple keywords separated by spaces
+            - Typo-tolerant mode finds spelling variants
             """)
 
         with tips_col2:
@@ -0,0 +1,93 @@
+import streamlit as st
+import pandas as pd
+from services.api import api_client
+
+# Initial map region (Ethiopia and its neighbours)
+DEFAULT_REGION = (3.0, 33.0, 15.0, 48.0)
+
+# Most points drawn at once; larger regions are sampled by the API
+MAX_MAP_POINTS = 5000
+
+def main():
+    """Render the places map page content."""
+    st.markdown("## 🗺️ Heritage Places Map")
+
+    st.markdown("""
+    See where sacred sites, landmarks and other located heritage entries are,
+    and find the places nearest to any point.
+    """)
+
+    # Check API connection
+    if not api_client.check_connection():
+        st.error("🔌 Unable to connect to the backend API. Please check your connection.")
+        return
+
+    try:
+        # Get categories for filtering
+        categories = api_client.get_categories()
+        category_options = {"All Categories": None}
+        category_options.update({cat['name']: cat['id'] for cat in categories})
+
+        selected_category = st.selectbox("📂 Category", options=list(category_options.keys()))
+        category_id = category_options[selected_category]
+
+        # Region to show
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            min_lat = st.number_input("South", min_value=-90.0, max_value=90.0, value=DEFAULT_REGION[0])
+        with col2:
+            max_lat = st.number_input("North", min_value=-90.0, max_value=90.0, value=DEFAULT_REGION[2])
+        with col3:
+            min_lon = st.number_input("West", min_value=-180.0, max_value=180.0, value=DEFAULT_REGION[1])
+        with col4:
+            max_lon = st.number_input("East", min_value=-180.0, max_value=180.0, value=DEFAULT_REGION[3])
+
+        if min_lat > max_lat:
+            st.warning("South must not be north of North.")
+            return
+
+        with st.spinner("Loading places..."):
+            places = api_client.get_places_in_box(
+                min_lat, min_lon, max_lat, max_lon,
+                category_id=category_id,
+                limit=MAX_MAP_POINTS
+            )
+
+        items = places.get('items', [])
+        if not items:
+            st.info("No located heritage entries in this region.")
+        else:
+            df = pd.DataFrame(items, columns=['id', 'title', 'latitude', 'longitude'])
+            st.map(df, latitude='latitude', longitude='longitude', size=200)
+
+            if places['total'] > len(items):
+                st.caption(f"Showing an even sample of {len(items)} of {places['total']} places. Zoom into a smaller region to see all of them.")
+            else:
+                st.caption(f"{places['total']} places in this region")
+
+        # Nearest places to a point
+        st.markdown("---")
+        st.markdown("### 📍 Nearest Places")
+
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            latitude = st.number_input("Latitude", min_value=-90.0, max_value=90.0, value=9.03, format="%.4f")
+        with col2:
+            longitude = st.number_input("Longitude", min_value=-180.0, max_value=180.0, value=38.74, format="%.4f")
+        with col3:
+            k = st.selectbox("How many", options=[5, 10, 20, 50])
+
+        nearby = api_client.get_nearby_places(latitude, longitude, k=k, category_id=category_id)
+        if nearby:
+            df = pd.DataFrame(nearby, columns=['title', 'distance_km', 'latitude', 'longitude'])
+            df = df.rename(columns={'title': 'Title', 'distance_km': 'Distance (km)'})
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        else:
+            st.info("No located heritage entries yet.")
+
+    except Exception as e:
+        st.error(f"Error loading places: {str(e)}")
+        st.info("Please try refreshing the page or check your internet connection.")
+
+if __name__ == "__main__":
+    main()
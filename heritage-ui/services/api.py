@@ -1,11 +1,31 @@
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 import requests
-from typing import Dict, List, Optional, Any
 import streamlit as st
 
 # Configuration
 FASTAPI_BASE_URL = os.getenv("FASTAPI_BASE_URL", "http://localhost:8000")
 
+# Client-side cache of heritage listing pages
+CACHE_TTL_SECONDS = int(os.getenv("HERITAGE_UI_CACHE_TTL", "30"))
+CACHE_MAX_ENTRIES = 128
+
+# Upper bound on background page prefetches queued or running at once
+MAX_INFLIGHT_PREFETCHES = 4
+
+# Bytes of long entry content loaded per "Read more" step
+CONTENT_CHUNK_BYTES = 256 * 1024
+
+# Refresh the access token when it has less than this many seconds left
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+# Analytics tables that depend on who is signed in; never kept in the shared cache
+PRIVATE_ANALYTICS_TABLES = {"users"}
+
 class APIError(Exception):
     """Custom exception for API errors."""
     pass
@@ -20,6 +40,17 @@ class CulturalHeritageAPI:
         # Set a reasonable timeout for all requests
         self.timeout = 10
 
+        # LRU cache of listing responses: key -> (expires_at, data)
+        self._cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Background prefetching of adjacent result pages
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="heritage-prefetch"
+        )
+        self._prefetch_futures: Dict[int, Future] = {}
+        self._prefetch_filters: Optional[Tuple] = None
+
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
         Make HTTP request to API with error handling.
@@ -53,11 +84,67 @@ class CulturalHeritageAPI:
             raise APIError(f"Invalid JSON response: {str(e)}")
 
     def _get_auth_headers(self) -> Dict[str, str]:
-        """Get authorization headers if user is logged in."""
+        """Get authorization headers if user is logged in, refreshing the token if it is about to expire."""
+        if 'auth_token' in st.session_state and st.session_state.auth_token:
+            expires_at = st.session_state.get('token_expires_at')
+            if expires_at is not None and expires_at - time.time() < TOKEN_REFRESH_MARGIN_SECONDS:
+                self._refresh_tokens()
         if 'auth_token' in st.session_state and st.session_state.auth_token:
             return {"Authorization": f"Bearer {st.session_state.auth_token}"}
         return {}
 
+    def _store_tokens(self, tokens: Dict[str, Any]):
+        """Keep a token response in the session state."""
+        st.session_state.auth_token = tokens["access_token"]
+        st.session_state.refresh_token = tokens.get("refresh_token")
+        expires_in = tokens.get("expires_in")
+        st.session_state.token_expires_at = time.time() + expires_in if expires_in else None
+
+    def _refresh_tokens(self):
+        """Swap the refresh token for new tokens; logs out if it was rejected."""
+        refresh_token = st.session_state.get('refresh_token')
+        if not refresh_token:
+            return
+        try:
+            tokens = self._make_request("POST", "/auth/refresh", json={"refresh_token": refresh_token})
+        except APIError:
+            self._clear_tokens()
+            return
+        self._store_tokens(tokens)
+
+    def _clear_tokens(self):
+        """Forget all authentication state."""
+        for key in ('auth_token', 'refresh_token', 'token_expires_at'):
+            if key in st.session_state:
+                del st.session_state[key]
+
+    # Client cache helpers
+    def _cache_get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Get a cached response if present and not expired."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            expires_at, data = cached
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return data
+
+    def _cache_put(self, key: Tuple, data: Dict[str, Any]):
+        """Store a response in the cache, evicting the least recently used entries."""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + CACHE_TTL_SECONDS, data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        """Drop all cached responses (e.g. after content was created)."""
+        with self._cache_lock:
+            self._cache.clear()
+
     # Authentication endpoints
     def register_user(self, username: str, email: str, password: str) -> Dict[str, Any]:
         """Register a new user account."""
@@ -74,7 +161,9 @@ class CulturalHeritageAPI:
             "username": username,
             "password": password
         }
-        return self._make_request("POST", "/auth/login-json", json=data)
+        tokens = self._make_request("POST", "/auth/login-json", json=data)
+        self._store_tokens(tokens)
+        return tokens
 
     def get_current_user(self) -> Dict[str, Any]:
         """Get current authenticated user information."""
@@ -100,7 +189,13 @@ class CulturalHeritageAPI:
         page: int = 1,
         size: int = 10,
         search: Optional[str] = None,
-        category_id: Optional[int] = None
+        category_id: Optional[int] = None,
+        ranked: bool = False,
+        fuzzy: bool = False,
+        facets: Optional[List[str]] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Get paginated heritage entries with optional filtering.
@@ -110,9 +205,15 @@ class CulturalHeritageAPI:
             size: Number of items per page
             search: Search keyword for title/content
             category_id: Filter by category ID
+            ranked: Order search results by relevance
+            fuzzy: Typo-tolerant search ranked by similarity
+            facets: Facet counts to include ("category", "creator")
+            year_from: Only entries whose historical period reaches this year
+            year_to: Only entries whose historical period starts by this year
+            use_cache: Serve from (and store in) the client cache
 
         Returns:
-            Paginated response with items, total, page, size, pages
+            Paginated response with items, total, page, size, pages (and facets)
         """
         params = {
             "page": page,
@@ -122,27 +223,242 @@ class CulturalHeritageAPI:
             params["search"] = search
         if category_id:
             params["category_id"] = category_id
+        if ranked:
+            params["ranked"] = "true"
+        if fuzzy:
+            params["fuzzy"] = "true"
+        if facets:
+            params["facets"] = ",".join(sorted(facets))
+        if year_from is not None:
+            params["year_from"] = year_from
+        if year_to is not None:
+            params["year_to"] = year_to
 
-        return self._make_request("GET", "/heritage", params=params)
+        key = ("heritage",) + tuple(sorted(params.items()))
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        data = self._make_request("GET", "/heritage", params=params)
+        self._cache_put(key, data)
+        return data
+
+    def prefetch_heritage_pages(self, pages: Iterable[int], **filters: Any):
+        """
+        Fetch result pages in the background so later navigation hits the cache.
+
+        Pending prefetches for different filters are cancelled, and at most
+        MAX_INFLIGHT_PREFETCHES requests are queued or running.
+
+        Args:
+            pages: Page numbers to prefetch
+            **filters: Same keyword arguments as get_heritage_entries (size, search, ...)
+        """
+        filter_key = tuple(sorted((name, repr(value)) for name, value in filters.items()))
+
+        with self._cache_lock:
+            # Filters changed: cancel prefetches that no longer matter
+            if filter_key != self._prefetch_filters:
+                for future in self._prefetch_futures.values():
+                    future.cancel()
+                self._prefetch_futures.clear()
+                self._prefetch_filters = filter_key
+
+            # Forget finished prefetches
+            self._prefetch_futures = {
+                page: future for page, future in self._prefetch_futures.items()
+                if not future.done()
+            }
+
+            for page in pages:
+                if page in self._prefetch_futures:
+                    continue
+                if len(self._prefetch_futures) >= MAX_INFLIGHT_PREFETCHES:
+                    break
+                self._prefetch_futures[page] = self._prefetch_executor.submit(
+                    self._prefetch_page, page, filters
+                )
+
+    def _prefetch_page(self, page: int, filters: Dict[str, Any]):
+        """Worker for prefetch_heritage_pages; errors are ignored."""
+        try:
+            self.get_heritage_entries(page=page, **filters)
+        except APIError:
+            pass
+
+    def suggest_titles(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get type-ahead title suggestions for a search prefix."""
+        params = {"prefix": prefix, "limit": limit}
+        return self._make_request("GET", "/heritage/suggest", params=params)
 
     def get_heritage_entry(self, heritage_id: int) -> Dict[str, Any]:
         """Get detailed information about a specific heritage entry."""
         return self._make_request("GET", f"/heritage/{heritage_id}")
 
+    def get_trending_entries(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the entries with the most recent views."""
+        return self._make_request("GET", "/heritage/trending", params={"limit": limit})
+
+    def get_popular_entries(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get the most viewed entries of all time."""
+        return self._make_request("GET", "/heritage/popular", params={"limit": limit})
+
+    def get_related_entries(self, heritage_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the entries most similar to an entry, most similar first."""
+        params = {"limit": limit}
+        return self._make_request("GET", f"/heritage/{heritage_id}/related", params=params)
+
+    def get_heritage_content(
+        self,
+        heritage_id: int,
+        start: int = 0,
+        length: int = CONTENT_CHUNK_BYTES
+    ) -> Tuple[bytes, int]:
+        """
+        Get part of an entry's content as raw UTF-8 bytes.
+
+        Args:
+            heritage_id: Heritage entry ID
+            start: Byte offset to start at
+            length: Maximum number of bytes to fetch
+
+        Returns:
+            Tuple of (content bytes, total content size in bytes)
+
+        Raises:
+            APIError: If request fails
+        """
+        url = f"{self.base_url}/heritage/{heritage_id}/content"
+        headers = {"Range": f"bytes={start}-{start + length - 1}"}
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 416:
+                # Nothing left past the end of the content
+                return b"", int(response.headers["Content-Range"].rsplit("/", 1)[1])
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"API request failed: {str(e)}")
+
+        if response.status_code == 206:
+            total = int(response.headers["Content-Range"].rsplit("/", 1)[1])
+        else:
+            total = len(response.content)
+        return response.content, total
+
+    def get_analytics_table(self, table: str, use_cache: bool = True) -> Optional[bytes]:
+        """
+        Download a table of the latest analytics snapshot.
+
+        Args:
+            table: heritage_entries, heritage_contents, categories or users (admin only)
+            use_cache: Serve from (and store in) the client cache; the client is
+                shared by all sessions, so admin-only tables are never cached
+
+        Returns:
+            The Parquet file, or None if no snapshot has been exported yet
+
+        Raises:
+            APIError: If request fails
+        """
+        key = ("analytics", table)
+        use_cache = use_cache and table not in PRIVATE_ANALYTICS_TABLES
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        url = f"{self.base_url}/exports/analytics/{table}.parquet"
+        try:
+            response = self.session.get(url, headers=self._get_auth_headers(), timeout=self.timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise APIError(f"API request failed: {str(e)}")
+
+        if use_cache:
+            self._cache_put(key, response.content)
+        return response.content
+
+    def get_places_in_box(
+        self,
+        min_lat: float,
+        min_lon: float,
+        max_lat: float,
+        max_lon: float,
+        category_id: Optional[int] = None,
+        limit: int = 2000
+    ) -> Dict[str, Any]:
+        """
+        Get located heritage entries inside a bounding box, for maps.
+
+        Returns:
+            Dictionary with "items" (compact place summaries) and "total" matches in the box
+        """
+        params = {
+            "min_lat": min_lat,
+            "min_lon": min_lon,
+            "max_lat": max_lat,
+            "max_lon": max_lon,
+            "limit": limit
+        }
+        if category_id is not None:
+            params["category_id"] = category_id
+        return self._make_request("GET", "/heritage/places", params=params)
+
+    def get_nearby_places(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        category_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the located heritage entries nearest to a point, closest first."""
+        params = {"lat": latitude, "lon": longitude, "k": k}
+        if category_id is not None:
+            params["category_id"] = category_id
+        return self._make_request("GET", "/heritage/nearby", params=params)
+
+    def get_heritage_entries_batch(self, heritage_ids: List[int]) -> Dict[str, Any]:
+        """
+        Get several heritage entries in one round trip.
+
+        Args:
+            heritage_ids: Heritage entry IDs to fetch
+
+        Returns:
+            Response with items (in request order) and missing IDs
+        """
+        # Short lists fit in a query string; long ones go in a POST body
+        if len(heritage_ids) <= 100:
+            params = {"ids": ",".join(str(heritage_id) for heritage_id in heritage_ids)}
+            return self._make_request("GET", "/heritage/batch", params=params)
+        return self._make_request("POST", "/heritage/batch", json={"ids": list(heritage_ids)})
+
     def create_heritage_entry(
         self,
         title: str,
         content: str,
-        category_id: int
+        category_id: int,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None
     ) -> Dict[str, Any]:
-        """Create a new heritage entry (admin only)."""
+        """Create a new heritage entry (admin only), optionally with a location."""
         headers = self._get_auth_headers()
         data = {
             "title": title,
             "content": content,
             "category_id": category_id
         }
-        return self._make_request("POST", "/heritage", json=data, headers=headers)
+        if latitude is not None and longitude is not None:
+            data["latitude"] = latitude
+            data["longitude"] = longitude
+        result = self._make_request("POST", "/heritage", json=data, headers=headers)
+        # New content changes totals and page contents
+        self.clear_cache()
+        return result
 
     # Utility methods
     def check_connection(self) -> bool:
@@ -158,9 +474,14 @@ class CulturalHeritageAPI:
         return 'auth_token' in st.session_state and bool(st.session_state.auth_token)
 
     def logout(self):
-        """Clear authentication token."""
-        if 'auth_token' in st.session_state:
-            del st.session_state.auth_token
+        """Revoke the refresh token and clear authentication state."""
+        refresh_token = st.session_state.get('refresh_token')
+        if refresh_token:
+            try:
+                self._make_request("POST", "/auth/logout", json={"refresh_token": refresh_token})
+            except APIError:
+                pass  # Already expired or revoked; nothing left to do
+        self._clear_tokens()
 
 # Global API instance
 api_client = CulturalHeritageAPI()
@@ -0,0 +1,118 @@
+"""
+Page registry for the Streamlit UI.
+Loads each page module once per process and reuses it across reruns.
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# In dev mode, page files are re-imported when their mtime changes
+DEV_MODE = os.getenv("HERITAGE_UI_DEV", "false").lower() in ("1", "true", "yes")
+
+logger = logging.getLogger(__name__)
+
+
+class PageLoadError(Exception):
+    """Raised when a page module cannot be loaded."""
+    pass
+
+
+class PageRegistry:
+    """Caches compiled page modules and their main() callables."""
+
+    def __init__(self, pages_dir: Path, dev_mode: bool = DEV_MODE):
+        """Initialize registry for the given pages directory."""
+        self.pages_dir = Path(pages_dir)
+        self.dev_mode = dev_mode
+        self._lock = threading.Lock()
+        # page_file -> {"main": callable, "mtime": float}
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        # page_file -> timing counters
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def _load(self, page_file: str, page_path: Path) -> Dict[str, Any]:
+        """
+        Import a page module from disk.
+
+        Args:
+            page_file: File name of the page (e.g. "1_Home.py")
+            page_path: Full path to the page file
+
+        Returns:
+            Cache record with the page's main callable and file mtime
+
+        Raises:
+            PageLoadError: If the page has no main() function
+        """
+        page_name = page_file.replace(".py", "")
+        spec = importlib.util.spec_from_file_location(page_name, page_path)
+        page_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(page_module)
+
+        if not hasattr(page_module, 'main'):
+            raise PageLoadError(f"Page {page_file} does not have a main() function")
+
+        return {"main": page_module.main, "mtime": page_path.stat().st_mtime}
+
+    def get(self, page_file: str) -> Callable[[], None]:
+        """
+        Get the main() callable for a page, importing it on first use.
+
+        Args:
+            page_file: File name of the page inside pages_dir
+
+        Returns:
+            The page's main function
+
+        Raises:
+            PageLoadError: If the page file does not exist or has no main()
+        """
+        page_path = self.pages_dir / page_file
+        if not page_path.exists():
+            raise PageLoadError(f"Page {page_file} not found")
+
+        with self._lock:
+            cached = self._pages.get(page_file)
+            stats = self._timings.setdefault(
+                page_file, {"loads": 0, "hits": 0, "load_ms": 0.0, "render_ms": 0.0}
+            )
+
+            # Only stat the file in dev mode; production pages never change
+            if cached and self.dev_mode and page_path.stat().st_mtime != cached["mtime"]:
+                logger.info("Reloading modified page %s", page_file)
+                cached = None
+
+            if cached:
+                stats["hits"] += 1
+                return cached["main"]
+
+            start = time.perf_counter()
+            cached = self._load(page_file, page_path)
+            stats["load_ms"] = (time.perf_counter() - start) * 1000
+            stats["loads"] += 1
+            self._pages[page_file] = cached
+            logger.info("Loaded page %s in %.1f ms", page_file, stats["load_ms"])
+            return cached["main"]
+
+    def render(self, page_file: str):
+        """Load (if needed) and run a page, recording how long rendering took."""
+        page_main = self.get(page_file)
+
+        start = time.perf_counter()
+        try:
+            page_main()
+        finally:
+            self._timings[page_file]["render_ms"] = (time.perf_counter() - start) * 1000
+
+    def timings(self, page_file: str) -> Optional[Dict[str, float]]:
+        """Get load/render timing counters for a page."""
+        return self._timings.get(page_file)
+
+
+# Global registry instance (module state survives Streamlit reruns)
+page_registry = PageRegistry(Path(__file__).parent.parent / "pages")